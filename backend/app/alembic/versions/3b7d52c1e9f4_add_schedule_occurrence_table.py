@@ -0,0 +1,50 @@
+"""Add schedule occurrence table
+
+Revision ID: 3b7d52c1e9f4
+Revises: 0fef0d2b5a2a
+Create Date: 2026-10-18 09:12:41.518204
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b7d52c1e9f4"
+down_revision = "0fef0d2b5a2a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows are filled in by the application the next time the schedule is read
+    op.create_table(
+        "schedule_occurrence",
+        sa.Column("sequence", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("due_date", sa.Date(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("inquiry_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("sequence"),
+    )
+    op.create_index(
+        op.f("ix_schedule_occurrence_due_date"),
+        "schedule_occurrence",
+        ["due_date"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_schedule_occurrence_inquiry_id"),
+        "schedule_occurrence",
+        ["inquiry_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_schedule_occurrence_inquiry_id"), table_name="schedule_occurrence"
+    )
+    op.drop_index(
+        op.f("ix_schedule_occurrence_due_date"), table_name="schedule_occurrence"
+    )
+    op.drop_table("schedule_occurrence")
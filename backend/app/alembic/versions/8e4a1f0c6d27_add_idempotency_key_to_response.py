@@ -0,0 +1,35 @@
+"""Add idempotency key to response
+
+Revision ID: 8e4a1f0c6d27
+Revises: 3b7d52c1e9f4
+Create Date: 2026-10-18 11:02:17.640318
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8e4a1f0c6d27"
+down_revision = "3b7d52c1e9f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "response",
+        sa.Column("idempotency_key", sa.String(length=255), nullable=True),
+    )
+    op.create_unique_constraint(
+        "uq_response_user_id_idempotency_key",
+        "response",
+        ["user_id", "idempotency_key"],
+    )
+
+
+def downgrade():
+    op.drop_constraint(
+        "uq_response_user_id_idempotency_key", "response", type_="unique"
+    )
+    op.drop_column("response", "idempotency_key")
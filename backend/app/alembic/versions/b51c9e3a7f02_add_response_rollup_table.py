@@ -0,0 +1,42 @@
+"""Add response rollup table
+
+Revision ID: b51c9e3a7f02
+Revises: 8e4a1f0c6d27
+Create Date: 2026-10-18 13:40:55.204187
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b51c9e3a7f02"
+down_revision = "8e4a1f0c6d27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "response_rollup",
+        sa.Column("inquiry_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("rating", sa.Integer(), nullable=False),
+        sa.Column("response_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["inquiry_id"], ["inquiry.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("inquiry_id", "day", "rating"),
+    )
+    # Count the responses written before the rollup existed
+    op.execute(
+        """
+        INSERT INTO response_rollup (inquiry_id, day, rating, response_count)
+        SELECT inquiry_id, CAST(responded_at AS DATE), rating, COUNT(*)
+        FROM response
+        WHERE responded_at IS NOT NULL
+        GROUP BY inquiry_id, CAST(responded_at AS DATE), rating
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("response_rollup")
@@ -0,0 +1,35 @@
+"""Add inquiry history time indexes
+
+Revision ID: c7e2d05a9b13
+Revises: b51c9e3a7f02
+Create Date: 2026-10-18 14:22:08.913542
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c7e2d05a9b13"
+down_revision = "b51c9e3a7f02"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_inquiryhistory_inquiry_id_created_at",
+        "inquiryhistory",
+        ["inquiry_id", "created_at"],
+    )
+    op.create_index(
+        "ix_inquiryhistory_user_id_created_at",
+        "inquiryhistory",
+        ["user_id", "created_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_inquiryhistory_user_id_created_at", table_name="inquiryhistory")
+    op.drop_index(
+        "ix_inquiryhistory_inquiry_id_created_at", table_name="inquiryhistory"
+    )
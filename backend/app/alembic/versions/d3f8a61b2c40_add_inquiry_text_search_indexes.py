@@ -0,0 +1,40 @@
+"""Add inquiry text search indexes
+
+Revision ID: d3f8a61b2c40
+Revises: c7e2d05a9b13
+Create Date: 2026-10-18 15:07:41.118204
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d3f8a61b2c40"
+down_revision = "c7e2d05a9b13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Full-text search, the expression must match the one the queries use
+    op.create_index(
+        "ix_inquiry_text_tsv",
+        "inquiry",
+        [sa.text("to_tsvector('english', text)")],
+        postgresql_using="gin",
+    )
+    # Trigram similarity for misspellings, partial words and near-duplicates
+    op.create_index(
+        "ix_inquiry_text_trgm",
+        "inquiry",
+        ["text"],
+        postgresql_using="gin",
+        postgresql_ops={"text": "gin_trgm_ops"},
+    )
+
+
+def downgrade():
+    op.drop_index("ix_inquiry_text_trgm", table_name="inquiry")
+    op.drop_index("ix_inquiry_text_tsv", table_name="inquiry")
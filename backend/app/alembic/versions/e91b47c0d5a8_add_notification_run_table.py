@@ -0,0 +1,33 @@
+"""Add notification run table
+
+Revision ID: e91b47c0d5a8
+Revises: d3f8a61b2c40
+Create Date: 2026-10-18 16:31:52.407719
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e91b47c0d5a8"
+down_revision = "d3f8a61b2c40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "notification_run",
+        sa.Column("scheduled_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("inquiry_id", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("recipient_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["inquiry_id"], ["inquiry.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("scheduled_at"),
+    )
+
+
+def downgrade():
+    op.drop_table("notification_run")
@@ -1,16 +1,20 @@
 import logging
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from typing import Annotated
 
+import httpx
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security.utils import get_authorization_scheme_param
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 import app.services.users as users_service
 from app.core.config import settings
-from app.core.db import engine
-from app.core.security import algorithms, jwks, oidc_auth
+from app.core.db import async_engine, engine
+from app.core.security import oidc_auth, oidc_discovery
+from app.core.token_cache import attach_user, token_cache
 from app.models import User
 
 logging.basicConfig(level=logging.INFO)
@@ -22,11 +26,37 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    # Lazy loads cannot run implicitly on an AsyncSession, so keep attributes
+    # loaded after commit instead of expiring them
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
 AuthorizationDep = Annotated[str, Depends(oidc_auth)]
 
 
-def get_current_user(session: SessionDep, authorization: AuthorizationDep) -> User:
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    client: httpx.AsyncClient = request.app.state.http_client
+    return client
+
+
+HttpClientDep = Annotated[httpx.AsyncClient, Depends(get_http_client)]
+
+
+async def _get_signing_key(token: str) -> jwt.PyJWK | None:
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+    except jwt.InvalidTokenError:
+        return None
+    return await oidc_discovery.get_signing_key(kid)
+
+
+async def get_current_user(
+    session: SessionDep, authorization: AuthorizationDep
+) -> User:
     scheme, token = get_authorization_scheme_param(authorization)
     if not authorization or scheme.lower() != "bearer":
         raise HTTPException(
@@ -34,29 +64,30 @@ def get_current_user(session: SessionDep, authorization: AuthorizationDep) -> Us
             detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    attempt = 0
+    cached = token_cache.get(token)
+    if cached:
+        return attach_user(session, cached)
+    signing_key = await _get_signing_key(token)
     payload = None
-    while payload is None and attempt < len(jwks["keys"]):
+    if signing_key is not None:
         try:
             payload = jwt.decode(
                 jwt=token,
-                key=jwt.PyJWK(jwk_data=jwks["keys"][attempt]),
-                algorithms=algorithms,
+                key=signing_key,
+                algorithms=oidc_discovery.algorithms,
                 audience=[settings.OIDC_CLIENT_ID, settings.OIDC_CLIENT_ID_DESKTOP],
                 options={"verify_signature": True},
             )
-            if payload is not None:
-                attempt += 1
-                logger.info(f"Attempt #{attempt} to decode JWT token was successful.")
-        except Exception as e:
-            attempt += 1
-            logger.error(f"Failed attempt #{attempt} to decode JWT token: {e}")
+        except jwt.InvalidTokenError as e:
+            logger.debug(f"Failed to decode JWT token: {e}")
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = users_service.get_user_by_email(session=session, email=payload.get("email"))
+    user = await run_in_threadpool(
+        users_service.get_user_by_email, session=session, email=payload.get("email")
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="User not found"
@@ -65,6 +96,7 @@ def get_current_user(session: SessionDep, authorization: AuthorizationDep) -> Us
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user"
         )
+    token_cache.put(token, payload, user)
     return user
 
 
@@ -1,7 +1,19 @@
 from fastapi import APIRouter, Depends
 
 from app.api.deps import get_current_user
-from app.api.routes import auth, health, inquiries, schedule, themes, users, utils
+from app.api.routes import (
+    auth,
+    exports,
+    health,
+    history,
+    inquiries,
+    responses,
+    schedule,
+    stats,
+    themes,
+    users,
+    utils,
+)
 
 PROTECTED = Depends(get_current_user)
 api_router = APIRouter()
@@ -17,4 +29,12 @@ api_router.include_router(utils.router, prefix="/utils", tags=["utils"])
 api_router.include_router(
     schedule.router, prefix="/schedule", tags=["schedule"], dependencies=[PROTECTED]
 )
+api_router.include_router(
+    responses.router, prefix="/responses", tags=["responses"], dependencies=[PROTECTED]
+)
+api_router.include_router(
+    stats.router, prefix="/stats", tags=["stats"], dependencies=[PROTECTED]
+)
+api_router.include_router(exports.router, prefix="/exports", tags=["exports"])
+api_router.include_router(history.router, prefix="/history", tags=["history"])
 api_router.include_router(health.router, prefix="/health", tags=["health"])
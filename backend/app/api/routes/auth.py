@@ -1,18 +1,21 @@
+import base64
 import hashlib
-import os
+import hmac
+import secrets
+import time
 import urllib.parse
 from html import escape
 from urllib.parse import urlparse, urlunparse
 
-import httpx
 import tldextract
 from dotenv import load_dotenv
 from fastapi import APIRouter, Form, HTTPException, Request, status
 from fastapi.responses import JSONResponse, RedirectResponse
 from typing_extensions import Annotated
 
+from app.api.deps import HttpClientDep
 from app.core.config import settings
-from app.core.security import authorization_endpoint, token_endpoint
+from app.core.security import oidc_discovery
 
 load_dotenv()
 
@@ -45,36 +48,77 @@ def check_return_url(url: str | None) -> str | None:
     return return_url
 
 
-def _scrub_state_part(part: str) -> str:
-    return (
-        urllib.parse.quote(part, safe="")
-        .replace("-", "%2D")
-        .replace(".", "%2E")
-        .replace("_", "%5F")
-        .replace("~", "%7E")
-    )
+STATE_NONCE_COOKIE = "auth_state_nonce"
+
+
+def _state_signature(payload: str) -> str:
+    digest = hmac.new(
+        settings.OIDC_CLIENT_SECRET.encode(), payload.encode(), hashlib.sha256
+    ).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def create_state() -> tuple[str, str]:
+    """
+    Return a signed ``nonce.issued_at.signature`` state for the IdP, and its
+    nonce to be kept in a cookie. Every part is URL safe, so the state needs
+    no escaping.
+    """
+    nonce = secrets.token_urlsafe(16)
+    payload = f"{nonce}.{int(time.time())}"
+    return f"{payload}.{_state_signature(payload)}", nonce
+
+
+def verify_state(state: str, nonce: str | None) -> bool:
+    """
+    Whether ``state`` was signed by us less than OIDC_STATE_MAX_AGE_SECONDS
+    ago for the browser holding ``nonce``. The nonce cookie is cleared once
+    used, so a state cannot be replayed.
+    """
+    parts = state.split(".")
+    if len(parts) != 3 or not nonce:
+        return False
+    state_nonce, issued_at, signature = parts
+    if not hmac.compare_digest(
+        signature, _state_signature(f"{state_nonce}.{issued_at}")
+    ):
+        return False
+    if not hmac.compare_digest(state_nonce, nonce):
+        return False
+    try:
+        age = time.time() - int(issued_at)
+    except ValueError:
+        return False
+    return 0 <= age <= settings.OIDC_STATE_MAX_AGE_SECONDS
 
 
 @router.get("/login")
 async def login(request: Request, return_url: str) -> RedirectResponse:
-    random = str(os.urandom(1024))
-    signature = hashlib.sha256(
-        (random + settings.OIDC_CLIENT_SECRET).encode()
-    ).hexdigest()
+    state, nonce = create_state()
     query = urllib.parse.urlencode(
         [
             ("response_type", "code"),
             ("redirect_uri", settings.OIDC_REDIRECT_URI),
             ("client_id", settings.OIDC_CLIENT_ID),
             ("scope", "openid email profile"),
-            ("state", _scrub_state_part(random) + "." + _scrub_state_part(signature)),
+            ("state", state),
         ],
         safe="*",
     )
-    response = RedirectResponse(f"{authorization_endpoint}?{query}")
+    well_known = await oidc_discovery.get_well_known()
+    response = RedirectResponse(f"{well_known['authorization_endpoint']}?{query}")
     auth_return_url = check_return_url(return_url)
     oidc_redirect_uri_parsed = urlparse(settings.OIDC_REDIRECT_URI)
     callback_path = oidc_redirect_uri_parsed.path
+    response.set_cookie(
+        STATE_NONCE_COOKIE,
+        nonce,
+        max_age=settings.OIDC_STATE_MAX_AGE_SECONDS,
+        httponly=True,
+        secure=COOKIE_SECURE,
+        domain=COOKIE_DOMAIN,
+        path=callback_path,
+    )
     if auth_return_url:
         response.set_cookie(
             "auth_return_url",
@@ -88,28 +132,26 @@ async def login(request: Request, return_url: str) -> RedirectResponse:
 
 
 @router.get("/callback")
-async def callback(request: Request, code: str, state: str) -> RedirectResponse:
-    state_parts = state.split(".")
-    verify_state = hashlib.sha256(
-        (urllib.parse.unquote(state_parts[0]) + settings.OIDC_CLIENT_SECRET).encode()
-    ).hexdigest()
-    if verify_state != urllib.parse.unquote(state_parts[1]):
+async def callback(
+    request: Request, client: HttpClientDep, code: str, state: str
+) -> RedirectResponse:
+    if not verify_state(state, request.cookies.get(STATE_NONCE_COOKIE)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid state"
         )
 
-    async with httpx.AsyncClient() as client:
-        token_response = await client.post(
-            token_endpoint,
-            data={
-                "grant_type": "authorization_code",
-                "code": code,
-                "redirect_uri": settings.OIDC_REDIRECT_URI,
-                "client_id": settings.OIDC_CLIENT_ID,
-                "client_secret": settings.OIDC_CLIENT_SECRET,
-            },
-        )
-        response_data = token_response.json()
+    well_known = await oidc_discovery.get_well_known()
+    token_response = await client.post(
+        well_known["token_endpoint"],
+        data={
+            "grant_type": "authorization_code",
+            "code": code,
+            "redirect_uri": settings.OIDC_REDIRECT_URI,
+            "client_id": settings.OIDC_CLIENT_ID,
+            "client_secret": settings.OIDC_CLIENT_SECRET,
+        },
+    )
+    response_data = token_response.json()
     if token_response.status_code != 200:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token request"
@@ -118,6 +160,12 @@ async def callback(request: Request, code: str, state: str) -> RedirectResponse:
     if not return_url:
         return_url = "/"
     response = RedirectResponse(return_url)
+    response.delete_cookie(
+        STATE_NONCE_COOKIE,
+        secure=COOKIE_SECURE,
+        domain=COOKIE_DOMAIN,
+        path=urlparse(settings.OIDC_REDIRECT_URI).path,
+    )
     id_token = response_data.get("id_token")
     response.set_cookie(
         key="access_token_cookie",
@@ -132,6 +180,7 @@ async def callback(request: Request, code: str, state: str) -> RedirectResponse:
 
 @router.post("/token/desktop")
 async def token_desktop(
+    client: HttpClientDep,
     code: Annotated[str | None, Form()] = None,
     refresh_token: Annotated[str | None, Form()] = None,
     grant_type: Annotated[str | None, Form()] = None,
@@ -153,12 +202,12 @@ async def token_desktop(
         data["scope"] = scope
     if code_verifier:
         data["code_verifier"] = code_verifier
-    async with httpx.AsyncClient() as client:
-        token_response = await client.post(
-            token_endpoint,
-            data=data,
-        )
-        response_data = token_response.json()
+    well_known = await oidc_discovery.get_well_known()
+    token_response = await client.post(
+        well_known["token_endpoint"],
+        data=data,
+    )
+    response_data = token_response.json()
     if token_response.status_code != 200:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token request"
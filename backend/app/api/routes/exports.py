@@ -0,0 +1,64 @@
+from datetime import date
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+import app.services.exports as exports_service
+from app.api.deps import SessionDep, get_current_active_superuser
+from app.services.exports import ExportFormat
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
+
+
+def _streaming_response(
+    session: SessionDep, statement: Select[Any], name: str, format: ExportFormat
+) -> StreamingResponse:
+    return StreamingResponse(
+        exports_service.stream_export(
+            bind=session.get_bind(), statement=statement, export_format=format
+        ),
+        media_type=exports_service.MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{format.value}"'
+        },
+    )
+
+
+@router.get("/responses")
+def export_responses(
+    session: SessionDep,
+    format: ExportFormat = ExportFormat.CSV,
+    start: date | None = None,
+    end: date | None = None,
+    theme_id: int | None = None,
+    inquiry_id: int | None = None,
+) -> StreamingResponse:
+    """
+    Stream responses as CSV or NDJSON, optionally limited to those given from
+    ``start`` to ``end``, to one theme or to one inquiry.
+    """
+    statement = exports_service.responses_statement(
+        start=start, end=end, theme_id=theme_id, inquiry_id=inquiry_id
+    )
+    return _streaming_response(session, statement, "responses", format)
+
+
+@router.get("/inquiry-history")
+def export_inquiry_history(
+    session: SessionDep,
+    format: ExportFormat = ExportFormat.CSV,
+    start: date | None = None,
+    end: date | None = None,
+    theme_id: int | None = None,
+    inquiry_id: int | None = None,
+) -> StreamingResponse:
+    """
+    Stream inquiry history entries as CSV or NDJSON, optionally limited to
+    those recorded from ``start`` to ``end``, to one theme or to one inquiry.
+    """
+    statement = exports_service.inquiry_history_statement(
+        start=start, end=end, theme_id=theme_id, inquiry_id=inquiry_id
+    )
+    return _streaming_response(session, statement, "inquiry-history", format)
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+
+import app.services.history as history_service
+from app.api.deps import SessionDep, get_current_active_superuser
+from app.models import InquiryHistoryEntriesPublic
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
+
+
+def _history(
+    session: SessionDep,
+    inquiry_id: int | None,
+    user_id: int | None,
+    start: datetime | None,
+    end: datetime | None,
+    limit: int,
+    cursor: str | None,
+    include_data: bool,
+) -> InquiryHistoryEntriesPublic:
+    try:
+        return history_service.get_history(
+            session=session,
+            inquiry_id=inquiry_id,
+            user_id=user_id,
+            start=start,
+            end=end,
+            limit=limit,
+            cursor=cursor,
+            include_data=include_data,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/inquiries/{inquiry_id}", response_model=InquiryHistoryEntriesPublic)
+def get_inquiry_history(
+    session: SessionDep,
+    inquiry_id: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    limit: int = 100,
+    cursor: str | None = None,
+    include_data: bool = False,
+) -> InquiryHistoryEntriesPublic:
+    """
+    Changes made to an inquiry, newest first.
+
+    Pass the previous page's next_cursor as cursor for the next page, and
+    include_data to get each entry's snapshot of the inquiry.
+    """
+    return _history(session, inquiry_id, None, start, end, limit, cursor, include_data)
+
+
+@router.get("/users/{user_id}", response_model=InquiryHistoryEntriesPublic)
+def get_user_history(
+    session: SessionDep,
+    user_id: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    limit: int = 100,
+    cursor: str | None = None,
+    include_data: bool = False,
+) -> InquiryHistoryEntriesPublic:
+    """
+    Changes made to inquiries by a user, newest first.
+
+    Pass the previous page's next_cursor as cursor for the next page, and
+    include_data to get each entry's snapshot of the inquiry.
+    """
+    return _history(session, None, user_id, start, end, limit, cursor, include_data)
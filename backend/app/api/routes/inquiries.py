@@ -1,21 +1,45 @@
+import csv
+import io
 from datetime import datetime
+from typing import Annotated, Any
 
 import pytz
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pytz.tzinfo import BaseTzInfo
 
 import app.services.inquiries as inquiries_service
 import app.services.schedule as schedule_service
-from app.api.deps import SessionDep
-from app.models import Inquiry, InquiryCreate, InquiryPublic, InquriesPublic, Message
+from app.api.deps import AsyncSessionDep, CurrentUser, SessionDep
+from app.core.current_inquiry_cache import (
+    CachedInquiry,
+    CurrentInquiryKey,
+    current_inquiry_cache,
+)
+from app.models import (
+    InquiriesImportPublic,
+    Inquiry,
+    InquiryCreate,
+    InquiryCreatedPublic,
+    InquiryPublic,
+    InquriesPublic,
+    Message,
+    SimilarInquiry,
+)
 from app.models.inquiry import InquiryUpdate
 
 router = APIRouter()
 
 
-@router.post("/", response_model=InquiryPublic)
-def create_inquiry(*, session: SessionDep, inquiry_in: InquiryCreate) -> Inquiry:
+@router.post("/", response_model=InquiryCreatedPublic)
+def create_inquiry(
+    *, session: SessionDep, current_user: CurrentUser, inquiry_in: InquiryCreate
+) -> InquiryCreatedPublic:
     """
     Create new inquiry.
+
+    Existing inquiries too similar to the new one are returned in similar.
+    They do not stop it being created.
     """
     inquiry = inquiries_service.get_inquiry_by_text(
         session=session, text=inquiry_in.text
@@ -25,38 +49,121 @@ def create_inquiry(*, session: SessionDep, inquiry_in: InquiryCreate) -> Inquiry
             status_code=400,
             detail="This inquiry already exists.",
         )
+    similar = inquiries_service.find_similar_inquiries(
+        session=session, text=inquiry_in.text
+    )
+    inquiry = inquiries_service.create_inquiry(
+        session=session, inquiry_in=inquiry_in, user_id=current_user.id
+    )
+    return InquiryCreatedPublic.model_validate(inquiry, update={"similar": similar})
+
+
+async def _read_import_rows(request: Request) -> list[dict[str, Any]]:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == "text/csv":
+        try:
+            text = (await request.body()).decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=422, detail="CSV must be UTF-8 encoded")
+        reader = csv.DictReader(io.StringIO(text))
+        if not reader.fieldnames or "text" not in reader.fieldnames:
+            raise HTTPException(
+                status_code=422, detail="CSV must have a header with a 'text' column"
+            )
+        # Empty cells mean "not set", like a missing key in JSON
+        return [
+            {key: value for key, value in row.items() if key and value}
+            for row in reader
+        ]
+    try:
+        rows = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Body must be valid JSON")
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise HTTPException(
+            status_code=422, detail="Body must be a JSON array of inquiries"
+        )
+    return rows
+
 
-    return inquiries_service.create_inquiry(session=session, inquiry_in=inquiry_in)
+@router.post(
+    "/bulk",
+    response_model=InquiriesImportPublic,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/InquiryCreate"},
+                    }
+                },
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_inquiries(
+    *, session: SessionDep, current_user: CurrentUser, request: Request
+) -> InquiriesImportPublic:
+    """
+    Create many inquiries at once from a JSON array or a CSV file with a
+    header row. Rows that cannot be created are skipped and reported.
+    """
+    rows = await _read_import_rows(request)
+    try:
+        return await run_in_threadpool(
+            inquiries_service.import_inquiries,
+            session=session,
+            rows=rows,
+            user_id=current_user.id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.patch("/", response_model=InquiryPublic)
-def update_inquiry(*, session: SessionDep, inquiry_in: InquiryUpdate) -> Inquiry:
+def update_inquiry(
+    *, session: SessionDep, current_user: CurrentUser, inquiry_in: InquiryUpdate
+) -> Inquiry:
     """
     Update inquiry.
     """
     try:
-        return inquiries_service.update_inquiry(session=session, inquiry_in=inquiry_in)
+        return inquiries_service.update_inquiry(
+            session=session, inquiry_in=inquiry_in, user_id=current_user.id
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/{inquiry_id}", response_model=Message)
-def delete_inquiry(*, session: SessionDep, inquiry_id: int) -> Message:
+def delete_inquiry(
+    *, session: SessionDep, current_user: CurrentUser, inquiry_id: int
+) -> Message:
     """
-    Delete inquiry.
+    Delete inquiry. An inquiry that has responses is refused with 409.
     """
     try:
-        return inquiries_service.delete_inquiry(session=session, inquiry_id=inquiry_id)
+        return inquiries_service.delete_inquiry(
+            session=session, inquiry_id=inquiry_id, user_id=current_user.id
+        )
+    except inquiries_service.InquiryHasResponsesError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/", response_model=InquriesPublic)
 def get_inquries(
-    session: SessionDep, skip: int = 0, limit: int = 100
+    session: SessionDep, skip: int = 0, limit: int = 100, cursor: str | None = None
 ) -> InquriesPublic:
     """
     Retrieve inquries.
+
+    Pass the previous page's next_cursor as cursor to page by keyset
+    instead of skip.
     """
     if skip < 0:
         raise HTTPException(
@@ -68,27 +175,72 @@ def get_inquries(
             detail="Invalid value for 'limit': it must be non-negative",
         )
 
-    count = inquiries_service.count_inquiries(session=session)
-    inquiries = inquiries_service.get_inquiries(session=session, skip=skip, limit=limit)
-    return InquriesPublic(data=inquiries, count=count)
+    try:
+        page = inquiries_service.get_inquiries_page(
+            session=session, skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return InquriesPublic(
+        data=page.items, count=page.count, next_cursor=page.next_cursor
+    )
 
 
-@router.get("/current", response_model=InquiryPublic)
-def current_inquiry(session: SessionDep, tz: str) -> Inquiry:
-    schedule = schedule_service.get_schedule(session)
+@router.get("/search", response_model=InquriesPublic)
+def search_inquiries(
+    session: SessionDep,
+    q: str,
+    theme_id: int | None = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> InquriesPublic:
+    """
+    Search inquiries by text, best match first, optionally within a theme.
+    """
+    try:
+        page = inquiries_service.search_inquiries(
+            session=session, q=q, theme_id=theme_id, skip=skip, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return InquriesPublic(data=page.items, count=page.count)
+
+
+@router.get("/similar", response_model=list[SimilarInquiry])
+def get_similar_inquiries(
+    session: SessionDep, text: str, limit: int = 5
+) -> list[SimilarInquiry]:
+    """
+    Existing inquiries likely to ask the same thing as text, most similar
+    first.
+    """
+    try:
+        return inquiries_service.find_similar_inquiries(
+            session=session, text=text, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _resolve_current_inquiry(
+    session: AsyncSessionDep,
+    key: CurrentInquiryKey,
+    timezone: BaseTzInfo,
+    now: datetime,
+) -> CachedInquiry:
+    generation = current_inquiry_cache.generation
+    schedule = await schedule_service.get_schedule_async(session)
     if not schedule:
         raise HTTPException(
             status_code=400, detail="Schedule does not exist to get current inquiry"
         )
     try:
-        timezone = pytz.timezone(tz)
         today = timezone.localize(
             datetime.strptime(
-                f"{datetime.now(timezone).strftime('%Y-%m-%d')} {schedule.schedule.timesOfDay[0]}",
+                f"{now.strftime('%Y-%m-%d')} {schedule.schedule.timesOfDay[0]}",
                 "%Y-%m-%d %H:%M",
             )
         )
-        now = datetime.now(timezone)
         inquiry_id = (
             schedule.scheduled_inquiries_and_dates.inquiries.pop(0)
             if now >= today
@@ -96,12 +248,42 @@ def current_inquiry(session: SessionDep, tz: str) -> Inquiry:
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
-    inquiry = inquiries_service.get_inquiry_by_id(
+    inquiry = await inquiries_service.get_inquiry_by_id_async(
         session=session, inquiry_id=inquiry_id
     )
     if not inquiry:
         raise HTTPException(status_code=404, detail="Current inquiry not found")
-    return inquiry
+    body = InquiryPublic.model_validate(inquiry).model_dump_json().encode()
+    return current_inquiry_cache.put(key, generation, today, now >= today, body)
+
+
+@router.get("/current", response_model=InquiryPublic)
+async def current_inquiry(
+    session: AsyncSessionDep,
+    tz: str,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """
+    Get the inquiry to answer now in time zone ``tz``.
+
+    Answers are cached until the schedule or the inquiries change and carry
+    an ETag, so clients can revalidate with If-None-Match and get a 304.
+    """
+    try:
+        timezone = pytz.timezone(tz)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    now = datetime.now(timezone)
+    key = (tz, now.date(), datetime.now().date())
+    answer = current_inquiry_cache.get(key, now)
+    if answer is None:
+        answer = await _resolve_current_inquiry(session, key, timezone, now)
+    headers = {"ETag": answer.etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and answer.etag in [
+        etag.strip() for etag in if_none_match.split(",")
+    ]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=answer.body, media_type="application/json", headers=headers)
 
 
 @router.get("/{inquiry_id}", response_model=InquiryPublic)
@@ -0,0 +1,36 @@
+import math
+from typing import Annotated
+
+from fastapi import APIRouter, Header, HTTPException
+
+from app.api.deps import CurrentUser
+from app.models import Message, ResponseSubmit
+from app.services.responses import PendingResponse, response_buffer
+
+router = APIRouter()
+
+
+@router.post("/", response_model=Message, status_code=202)
+async def submit_response(
+    current_user: CurrentUser,
+    response_in: ResponseSubmit,
+    idempotency_key: Annotated[str | None, Header(max_length=255)] = None,
+) -> Message:
+    """
+    Submit a response to an inquiry.
+
+    The response is queued and saved shortly after. Send the same
+    Idempotency-Key header when retrying so it is only saved once.
+    """
+    pending = PendingResponse(
+        user_id=current_user.id,
+        submission=response_in,
+        idempotency_key=idempotency_key,
+    )
+    if not response_buffer.submit(pending):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many responses waiting to be saved, try again shortly.",
+            headers={"Retry-After": str(math.ceil(response_buffer.flush_interval))},
+        )
+    return Message(message="Response accepted")
@@ -1,5 +1,6 @@
 from datetime import datetime
 
+import holidays
 from fastapi import APIRouter, HTTPException
 
 import app.services.schedule as schedule_service
@@ -18,6 +19,8 @@ def _verify_schedule(schedule: ScheduleInfo) -> None:
             datetime.strptime(
                 f"{schedule.endDate} {schedule.timesOfDay[0]}", "%Y-%m-%d %H:%M"
             )
+        if schedule.holidayCountry not in holidays.list_supported_countries():
+            raise ValueError(f"Unsupported country {schedule.holidayCountry}")
     except ValueError:
         raise HTTPException(
             status_code=422,
@@ -0,0 +1,47 @@
+from datetime import date
+
+from fastapi import APIRouter, HTTPException
+
+import app.services.inquiries as inquiries_service
+import app.services.stats as stats_service
+import app.services.themes as themes_service
+from app.api.deps import SessionDep
+from app.models import RatingStatsPublic
+
+router = APIRouter()
+
+
+@router.get("/inquiries/{inquiry_id}", response_model=RatingStatsPublic)
+def get_inquiry_stats(
+    session: SessionDep,
+    inquiry_id: int,
+    start: date | None = None,
+    end: date | None = None,
+) -> RatingStatsPublic:
+    """
+    Rating count, average and histogram of an inquiry, overall and per day,
+    optionally limited to the days from ``start`` to ``end``.
+    """
+    if not inquiries_service.get_inquiry_by_id(session=session, inquiry_id=inquiry_id):
+        raise HTTPException(status_code=404, detail="Inquiry not found")
+    return stats_service.get_inquiry_stats(
+        session=session, inquiry_id=inquiry_id, start=start, end=end
+    )
+
+
+@router.get("/themes/{theme_id}", response_model=RatingStatsPublic)
+def get_theme_stats(
+    session: SessionDep,
+    theme_id: int,
+    start: date | None = None,
+    end: date | None = None,
+) -> RatingStatsPublic:
+    """
+    Rating count, average and histogram of all inquiries in a theme, overall
+    and per day, optionally limited to the days from ``start`` to ``end``.
+    """
+    if not themes_service.get_theme_by_id(session=session, theme_id=theme_id):
+        raise HTTPException(status_code=404, detail="Theme not found")
+    return stats_service.get_theme_stats(
+        session=session, theme_id=theme_id, start=start, end=end
+    )
@@ -22,13 +22,22 @@ def create_theme(*, session: SessionDep, theme_in: ThemeCreate) -> Theme:
 
 
 @router.get("/", response_model=ThemesPublic)
-def get_themes(session: SessionDep, skip: int = 0, limit: int = 100) -> ThemesPublic:
+def get_themes(
+    session: SessionDep, skip: int = 0, limit: int = 100, cursor: str | None = None
+) -> ThemesPublic:
     """
     Retrieve themes.
+
+    Pass the previous page's next_cursor as cursor to page by keyset
+    instead of skip.
     """
-    count = themes_service.count_themes(session=session)
-    themes = themes_service.get_themes(session=session, skip=skip, limit=limit)
-    return ThemesPublic(data=themes, count=count)
+    try:
+        page = themes_service.get_themes_page(
+            session=session, skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ThemesPublic(data=page.items, count=page.count, next_cursor=page.next_cursor)
 
 
 @router.get("/{theme_id}", response_model=ThemePublic)
@@ -1,7 +1,6 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import func, select
 
 import app.services.users as users_service
 from app.api.deps import (
@@ -9,6 +8,7 @@ from app.api.deps import (
     SessionDep,
     get_current_active_superuser,
 )
+from app.core.token_cache import token_cache
 from app.models import (
     Message,
     User,
@@ -25,18 +25,22 @@ router = APIRouter()
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+def read_users(
+    session: SessionDep, skip: int = 0, limit: int = 100, cursor: str | None = None
+) -> Any:
     """
     Retrieve users.
-    """
-
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
 
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
-
-    return UsersPublic(data=users, count=count)
+    Pass the previous page's next_cursor as cursor to page by keyset
+    instead of skip.
+    """
+    try:
+        page = users_service.get_users_page(
+            session=session, skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return UsersPublic(data=page.items, count=page.count, next_cursor=page.next_cursor)
 
 
 @router.post(
@@ -74,8 +78,10 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
+    user_id = current_user.id
     session.delete(current_user)
     session.commit()
+    token_cache.invalidate_user(user_id)
     return Message(message="User deleted successfully")
 
 
@@ -113,4 +119,5 @@ def delete_user(
         )
     session.delete(user)
     session.commit()
+    token_cache.invalidate_user(user_id)
     return Message(message="User deleted successfully")
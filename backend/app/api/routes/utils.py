@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends
+import math
+
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
-from app.models import Message
+from app.core.db import async_engine, engine, get_pool_stats
+from app.models import Message, PoolsStats
+from app.services.mail import mail_dispatcher
 from app.utils import generate_test_email, send_email
 
 router = APIRouter()
@@ -15,12 +19,34 @@ router = APIRouter()
 )
 def test_email(email_to: EmailStr) -> Message:
     """
-    Test emails.
+    Test emails. The email is queued and sent shortly after.
     """
     email_data = generate_test_email(email_to=email_to)
-    send_email(
+    if not send_email(
         email_to=email_to,
         subject=email_data.subject,
         html_content=email_data.html_content,
-    )
+    ):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many emails waiting to be sent, try again shortly.",
+            headers={"Retry-After": str(math.ceil(mail_dispatcher.flush_interval))},
+        )
     return Message(message="Test email sent")
+
+
+@router.get(
+    "/db-pool/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=PoolsStats,
+)
+def db_pool_stats() -> PoolsStats:
+    """
+    Connection pool gauges for this worker process.
+    """
+    return PoolsStats(
+        data=[
+            get_pool_stats("sync", engine),
+            get_pool_stats("async", async_engine),
+        ]
+    )
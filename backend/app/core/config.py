@@ -50,6 +50,15 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
+    # Connection pool, per worker process. Keep
+    # workers * (POOL_SIZE + MAX_OVERFLOW) below the server's max_connections.
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    # 0 disables the server-side statement timeout
+    POSTGRES_STATEMENT_TIMEOUT_MS: int = 0
     OPENID_CONNECT_URL: str = ""
     OIDC_CLIENT_ID: str = ""
     OIDC_CLIENT_SECRET: str = ""
@@ -58,6 +67,48 @@ class Settings(BaseSettings):
     OIDC_CLIENT_ID_DESKTOP: str = ""
     OIDC_CLIENT_SECRET_DESKTOP: str = ""
     OIDC_REDIRECT_URI_DESKTOP: str = ""
+    # A login must come back from the IdP within this many seconds
+    OIDC_STATE_MAX_AGE_SECONDS: int = 600
+    # The IdP's discovery document and JWKS are refreshed in the background.
+    # An unknown key id triggers an early refresh, rate limited to one per
+    # OIDC_DISCOVERY_MIN_REFRESH_SECONDS. A snapshot path lets a new process
+    # warm-start from the last fetched documents.
+    OIDC_DISCOVERY_REFRESH_SECONDS: int = 3600
+    OIDC_DISCOVERY_MIN_REFRESH_SECONDS: int = 30
+    OIDC_DISCOVERY_TIMEOUT_SECONDS: float = 10
+    OIDC_DISCOVERY_SNAPSHOT_PATH: str | None = None
+    # Calls to the IdP and webhooks share one pooled HTTP client, so logins
+    # reuse open connections instead of a new TLS handshake each time. HTTP/2
+    # is used with servers that offer it, multiplexing requests over one
+    # connection, and HTTP/1.1 otherwise.
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 60
+    HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS: float = 5
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 10
+    HTTP_CLIENT_HTTP2: bool = True
+    # Verified bearer tokens are cached in-process until they expire, but for
+    # no longer than AUTH_TOKEN_CACHE_TTL_SECONDS. Set the size to 0 to disable.
+    AUTH_TOKEN_CACHE_SIZE: int = 1024
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = 300
+    # Occurrences of the schedule materialized beyond one full rotation of the
+    # scheduled inquiries. Reads refill the table once they run past it.
+    SCHEDULE_OCCURRENCE_LOOKAHEAD: int = 90
+    # Answers to GET /inquiries/current are cached per time zone and day until
+    # the schedule or the inquiries change. The TTL bounds how long other
+    # worker processes keep serving an answer after such a change.
+    CURRENT_INQUIRY_CACHE_SIZE: int = 1024
+    CURRENT_INQUIRY_CACHE_TTL_SECONDS: int = 60
+    # Submitted responses are buffered in-process and written in batches of up
+    # to RESPONSE_BUFFER_FLUSH_SIZE, at least every RESPONSE_BUFFER_FLUSH_SECONDS.
+    # Submissions are refused with 503 once RESPONSE_BUFFER_MAX_SIZE are waiting.
+    RESPONSE_BUFFER_MAX_SIZE: int = 10000
+    RESPONSE_BUFFER_FLUSH_SIZE: int = 500
+    RESPONSE_BUFFER_FLUSH_SECONDS: float = 1.0
+    # Existing inquiries whose trigram similarity to a new text reaches this
+    # threshold are reported as similar to it, on creation and by
+    # GET /inquiries/similar.
+    INQUIRY_SIMILARITY_THRESHOLD: float = 0.6
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -88,6 +139,33 @@ class Settings(BaseSettings):
         return self
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
+    # Emails are queued in-process and sent in batches of MAIL_BATCH_SIZE by
+    # MAIL_CONNECTIONS workers, each over its own reused SMTP connection. A
+    # connection sends one email at a time, so MAIL_CONNECTIONS bounds the
+    # throughput. Failed sends are retried MAIL_MAX_RETRIES times, waiting
+    # MAIL_RETRY_BACKOFF_SECONDS and doubling each time.
+    # Emails are refused once MAIL_QUEUE_MAX_SIZE are waiting.
+    MAIL_QUEUE_MAX_SIZE: int = 10000
+    MAIL_BATCH_SIZE: int = 100
+    MAIL_MAX_RETRIES: int = 5
+    MAIL_RETRY_BACKOFF_SECONDS: float = 2.0
+    MAIL_FLUSH_SECONDS: float = 1.0
+    MAIL_CONNECTIONS: int = 8
+    # Active users are notified at each of the schedule's timesOfDay, read in
+    # NOTIFICATION_TIMEZONE, on days an inquiry is held. They are read in
+    # chunks of NOTIFICATION_CHUNK_SIZE, with at most NOTIFICATION_CONCURRENCY
+    # chunks being delivered at once. A time missed by more than
+    # NOTIFICATION_GRACE_SECONDS, e.g. during a deploy, is skipped.
+    NOTIFICATIONS_ENABLED: bool = False
+    NOTIFICATION_TIMEZONE: str = "UTC"
+    NOTIFICATION_WEBHOOK_URL: str | None = None
+    NOTIFICATION_CHUNK_SIZE: int = 1000
+    NOTIFICATION_CONCURRENCY: int = 4
+    NOTIFICATION_POLL_SECONDS: float = 30.0
+    NOTIFICATION_GRACE_SECONDS: int = 600
+    # Compiled email templates are cached here across restarts and workers.
+    # Defaults to the system temporary directory.
+    EMAIL_TEMPLATES_BYTECODE_CACHE_DIR: str | None = None
 
     @computed_field  # type: ignore[prop-decorator]
     @property
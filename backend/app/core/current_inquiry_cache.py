@@ -0,0 +1,99 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from app.core.config import settings
+
+# (time zone, local date, server date). The server date picks the schedule's
+# current occurrence, the local date and time pick the inquiry within it.
+CurrentInquiryKey = tuple[str, date, date]
+
+
+@dataclass
+class CachedInquiry:
+    body: bytes
+    etag: str
+
+
+@dataclass
+class _Entry:
+    switch_at: datetime
+    expires_at: float
+    answers: dict[bool, CachedInquiry] = field(default_factory=dict)
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+class CurrentInquiryCache:
+    """
+    Bounded LRU cache of serialized answers to ``GET /inquiries/current``.
+
+    Each time zone and day has one entry holding the local time the schedule
+    switches to the day's inquiry, and the answers before and after it.
+    ``invalidate()`` drops everything and bumps ``generation``, so an answer
+    computed from data read before the invalidation is not stored. Entries
+    also expire after ``ttl_seconds`` to bound staleness across processes.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self._entries: OrderedDict[CurrentInquiryKey, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CurrentInquiryKey, now: datetime) -> CachedInquiry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry.answers.get(now >= entry.switch_at)
+
+    def put(
+        self,
+        key: CurrentInquiryKey,
+        generation: int,
+        switch_at: datetime,
+        after: bool,
+        body: bytes,
+    ) -> CachedInquiry:
+        answer = CachedInquiry(body=body, etag=_etag(body))
+        if self.maxsize <= 0:
+            return answer
+        with self._lock:
+            if generation != self.generation:
+                return answer
+            entry = self._entries.get(key)
+            if entry is None or entry.switch_at != switch_at:
+                entry = _Entry(
+                    switch_at=switch_at, expires_at=time.time() + self.ttl_seconds
+                )
+                self._entries[key] = entry
+            entry.answers[after] = answer
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return answer
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+current_inquiry_cache = CurrentInquiryCache(
+    maxsize=settings.CURRENT_INQUIRY_CACHE_SIZE,
+    ttl_seconds=settings.CURRENT_INQUIRY_CACHE_TTL_SECONDS,
+)
@@ -1,15 +1,103 @@
 import logging
+import threading
+import time
+from typing import Any
 
-from sqlmodel import Session, create_engine, select
+from sqlalchemy import Engine, exc
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+from sqlmodel import Session, SQLModel, create_engine, select
 
 from app.core.config import settings
-from app.models import User, UserCreate
+from app.models import PoolStats, User, UserCreate
 from app.services import users
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+class _PoolMetricsMixin:
+    """
+    Times every checkout, including any wait for a free connection.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            connection: PoolProxiedConnection = super().connect()  # type: ignore[misc]
+            return connection
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            with self._metrics_lock:
+                self.checkouts += 1
+                self.checkout_timeouts += timed_out
+                self.checkout_wait_total += wait
+                self.checkout_wait_max = max(self.checkout_wait_max, wait)
+
+
+class InstrumentedQueuePool(_PoolMetricsMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_PoolMetricsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _engine_options() -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "pool_size": settings.POSTGRES_POOL_SIZE,
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+        "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+    }
+    if settings.POSTGRES_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings.POSTGRES_STATEMENT_TIMEOUT_MS}"
+        }
+    return options
+
+
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    **_engine_options(),
+)
+# psycopg 3 serves both engines; SQLAlchemy picks its async dialect here
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedAsyncQueuePool,
+    **_engine_options(),
+)
+
+
+def get_pool_stats(name: str, db_engine: Engine | AsyncEngine) -> PoolStats:
+    pool = db_engine.pool
+    assert isinstance(pool, QueuePool)
+    return PoolStats(
+        name=name,
+        size=pool.size(),
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+        checkouts=getattr(pool, "checkouts", 0),
+        checkout_timeouts=getattr(pool, "checkout_timeouts", 0),
+        checkout_wait_seconds_total=getattr(pool, "checkout_wait_total", 0.0),
+        checkout_wait_seconds_max=getattr(pool, "checkout_wait_max", 0.0),
+    )
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -63,3 +151,17 @@ def whitelist_email(session: Session, email: str, is_superuser: bool = False) ->
             logger.info(f"{email} whitelisted.")
         else:
             logger.info(f"{email} already whitelisted.")
+
+
+def dialect_insert(
+    session: Session, model: type[SQLModel]
+) -> postgresql.Insert | sqlite.Insert:
+    """
+    INSERT for ``model`` that supports ``ON CONFLICT`` on the session's database.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise ValueError(f"ON CONFLICT is not supported on {dialect}")
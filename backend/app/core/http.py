@@ -0,0 +1,29 @@
+import httpx
+
+from app.core.config import settings
+
+
+def create_http_client(
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """
+    Create the application's shared HTTP client, with pooled keep-alive
+    connections.
+
+    It is opened once by the app's lifespan and handed to routes through
+    ``HttpClientDep``. Tests can pass an ``httpx.MockTransport`` as
+    ``transport``, which replaces the pooled one.
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            settings.HTTP_CLIENT_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        http2=settings.HTTP_CLIENT_HTTP2,
+        transport=transport,
+    )
@@ -1,35 +1,216 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import suppress
+from pathlib import Path
 from typing import Any
 
-import requests
+import httpx
+import jwt
 from fastapi.security import OpenIdConnect
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 oidc_auth = OpenIdConnect(openIdConnectUrl=settings.OPENID_CONNECT_URL)
 
 
-def _fetch_well_known() -> dict[str, Any]:
-    url = f"{settings.OIDC_ISSUER}/.well-known/openid-configuration"
-    with requests.get(url, timeout=30) as response:
-        if response.status_code != 200:
-            raise RuntimeError("fail to fetch well-known")
-        well_known: dict[str, Any] = response.json()
-        return well_known
+def _parse_jwks(jwks: dict[str, Any]) -> dict[str, jwt.PyJWK]:
+    keys: dict[str, jwt.PyJWK] = {}
+    for jwk_data in jwks["keys"]:
+        try:
+            key = jwt.PyJWK(jwk_data=jwk_data)
+        except jwt.PyJWKError:
+            # Skip keys we cannot use for signature verification
+            continue
+        keys[key.key_id or ""] = key
+    return keys
+
+
+class OIDCDiscovery:
+    """
+    Holds the IdP's discovery document and signing keys.
 
+    Nothing is fetched at import time. The documents are loaded on first use
+    or by ``run()``, which refreshes them in the background. An unknown
+    ``kid`` triggers an early refresh, at most once per
+    ``min_refresh_interval`` seconds. When ``snapshot_path`` is set, every
+    successful fetch is written to disk and used to warm-start the next
+    process.
 
-_well_known_doc = _fetch_well_known()
-authorization_endpoint: str = _well_known_doc["authorization_endpoint"]
-token_endpoint: str = _well_known_doc["token_endpoint"]
-algorithms: list[str] = _well_known_doc["id_token_signing_alg_values_supported"]
+    Fetches go through ``client`` once the app has set it to its shared
+    client, and through a short-lived client of their own until then. Tests
+    can point ``transport`` at an ``httpx.MockTransport`` to stand in for the
+    IdP.
+    """
 
+    def __init__(
+        self,
+        issuer: str,
+        *,
+        refresh_interval: float = 3600,
+        min_refresh_interval: float = 30,
+        timeout: float = 10,
+        snapshot_path: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.issuer = issuer
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.transport = transport
+        self.client: httpx.AsyncClient | None = None
+        self.well_known: dict[str, Any] | None = None
+        self.jwks: dict[str, Any] = {"keys": []}
+        self.signing_keys: dict[str, jwt.PyJWK] = {}
+        self._last_attempt: float | None = None
+        self._lock = asyncio.Lock()
 
-def _fetch_jwks() -> dict[str, Any]:
-    url = _well_known_doc["jwks_uri"]
-    with requests.get(url, timeout=30) as response:
+    @property
+    def loaded(self) -> bool:
+        return self.well_known is not None
+
+    @property
+    def algorithms(self) -> list[str]:
+        if self.well_known is None:
+            return []
+        algorithms: list[str] = self.well_known["id_token_signing_alg_values_supported"]
+        return algorithms
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> dict[str, Any]:
+        response = await client.get(url, timeout=self.timeout)
         if response.status_code != 200:
-            raise RuntimeError("fail to fetch jwks")
-        _jwks: dict[str, Any] = response.json()
-        return _jwks
+            raise RuntimeError(f"fail to fetch {url}")
+        document: dict[str, Any] = response.json()
+        return document
+
+    def _apply(self, well_known: dict[str, Any], jwks: dict[str, Any]) -> None:
+        signing_keys = _parse_jwks(jwks)
+        self.well_known = well_known
+        self.jwks = jwks
+        self.signing_keys = signing_keys
+
+    async def _fetch_documents(
+        self, client: httpx.AsyncClient
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        well_known = await self._fetch(
+            client, f"{self.issuer}/.well-known/openid-configuration"
+        )
+        jwks = await self._fetch(client, well_known["jwks_uri"])
+        return well_known, jwks
+
+    async def refresh(self, *, force: bool = True) -> None:
+        """
+        Fetch the discovery document and JWKS from the IdP.
+
+        When ``force`` is False the fetch is skipped if another one happened
+        less than ``min_refresh_interval`` seconds ago. Concurrent callers
+        share a single fetch.
+        """
+        attempt = self._last_attempt
+        async with self._lock:
+            if self._last_attempt != attempt:
+                # Someone else refreshed while we were waiting for the lock
+                return
+            now = time.monotonic()
+            if (
+                not force
+                and self._last_attempt is not None
+                and now - self._last_attempt < self.min_refresh_interval
+            ):
+                return
+            self._last_attempt = now
+            if self.client is not None:
+                well_known, jwks = await self._fetch_documents(self.client)
+            else:
+                async with httpx.AsyncClient(transport=self.transport) as client:
+                    well_known, jwks = await self._fetch_documents(client)
+            self._apply(well_known, jwks)
+            self._save_snapshot()
+
+    async def get_well_known(self) -> dict[str, Any]:
+        if self.well_known is None:
+            await self.refresh(force=False)
+        if self.well_known is None:
+            raise RuntimeError("OIDC discovery document is not available")
+        return self.well_known
+
+    async def get_signing_key(self, kid: str | None) -> jwt.PyJWK | None:
+        key = self._lookup(kid)
+        if key is None:
+            try:
+                await self.refresh(force=False)
+            except (httpx.HTTPError, RuntimeError) as e:
+                logger.error(f"Failed to refresh OIDC signing keys: {e}")
+                return None
+            key = self._lookup(kid)
+        return key
+
+    def _lookup(self, kid: str | None) -> jwt.PyJWK | None:
+        if kid is None and len(self.signing_keys) == 1:
+            return next(iter(self.signing_keys.values()))
+        return self.signing_keys.get(kid or "")
+
+    def load_snapshot(self) -> bool:
+        if self.snapshot_path is None or not self.snapshot_path.exists():
+            return False
+        try:
+            snapshot = json.loads(self.snapshot_path.read_text())
+            self._apply(snapshot["well_known"], snapshot["jwks"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable OIDC snapshot: {e}")
+            return False
+        logger.info(f"Loaded OIDC discovery snapshot from {self.snapshot_path}")
+        return True
+
+    def _save_snapshot(self) -> None:
+        if self.snapshot_path is None:
+            return
+        tmp_path: str | None = None
+        try:
+            # Every worker writes its own temporary file, so a concurrent
+            # refresh can never leave a half-written snapshot behind
+            with tempfile.NamedTemporaryFile(
+                "w",
+                dir=self.snapshot_path.parent,
+                prefix=f".{self.snapshot_path.name}.",
+                suffix=".tmp",
+                delete=False,
+            ) as tmp_file:
+                tmp_path = tmp_file.name
+                json.dump({"well_known": self.well_known, "jwks": self.jwks}, tmp_file)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Failed to write OIDC snapshot: {e}")
+            if tmp_path is not None:
+                with suppress(OSError):
+                    os.unlink(tmp_path)
+
+    async def run(self) -> None:
+        """
+        Keep the documents fresh until cancelled.
+        """
+        if not self.loaded:
+            self.load_snapshot()
+        while True:
+            try:
+                await self.refresh()
+                delay = self.refresh_interval
+            except (httpx.HTTPError, RuntimeError) as e:
+                logger.error(f"Failed to refresh OIDC discovery: {e}")
+                delay = self.min_refresh_interval
+            await asyncio.sleep(delay)
 
 
-jwks = _fetch_jwks()
+oidc_discovery = OIDCDiscovery(
+    settings.OIDC_ISSUER,
+    refresh_interval=settings.OIDC_DISCOVERY_REFRESH_SECONDS,
+    min_refresh_interval=settings.OIDC_DISCOVERY_MIN_REFRESH_SECONDS,
+    timeout=settings.OIDC_DISCOVERY_TIMEOUT_SECONDS,
+    snapshot_path=settings.OIDC_DISCOVERY_SNAPSHOT_PATH,
+)
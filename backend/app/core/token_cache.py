@@ -0,0 +1,103 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models import User
+
+
+@dataclass
+class CachedToken:
+    claims: dict[str, Any]
+    user: User
+    expires_at: float
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _detached_copy(user: User) -> User:
+    # Keep a snapshot that is not bound to the session that loaded it, so it
+    # can be merged into later request sessions without another SELECT.
+    snapshot = User.model_validate(user)
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified bearer tokens.
+
+    Entries are keyed by a SHA-256 hash of the raw token, hold the decoded
+    claims and the resolved user, and expire at the token's ``exp`` claim
+    (capped by ``ttl_seconds``).
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, CachedToken] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> CachedToken | None:
+        key = _token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, token: str, claims: dict[str, Any], user: User) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        exp = claims.get("exp")
+        if isinstance(exp, int | float):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= time.time():
+            return
+        entry = CachedToken(
+            claims=claims, user=_detached_copy(user), expires_at=expires_at
+        )
+        key = _token_key(token)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int | None) -> None:
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items() if entry.user.id == user_id
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def attach_user(session: Session, entry: CachedToken) -> User:
+    return session.merge(entry.user, load=False)
+
+
+token_cache = TokenCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_SIZE,
+    ttl_seconds=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+)
@@ -1,4 +1,7 @@
+import asyncio
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
 
 import sentry_sdk
 from fastapi import FastAPI
@@ -7,6 +10,11 @@ from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.core.http import create_http_client
+from app.core.security import oidc_discovery
+from app.services.mail import mail_dispatcher
+from app.services.notifications import run_notifications
+from app.services.responses import response_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +26,35 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
+    async with create_http_client() as http_client:
+        application.state.http_client = http_client
+        oidc_discovery.client = http_client
+        # Load the IdP documents in the background so startup never waits on them
+        discovery_refresher = asyncio.create_task(oidc_discovery.run())
+        response_flusher = asyncio.create_task(response_buffer.run())
+        mail_sender = asyncio.create_task(mail_dispatcher.run())
+        tasks = [discovery_refresher, response_flusher, mail_sender]
+        if settings.NOTIFICATIONS_ENABLED:
+            tasks.append(asyncio.create_task(run_notifications(http_client)))
+        yield
+        for task in tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        oidc_discovery.client = None
+    # Save responses accepted since the last flush
+    await response_buffer.close()
+    await mail_dispatcher.close()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -49,4 +82,4 @@ if settings.BACKEND_CORS_ORIGINS:
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-logger.info("FastAPI application fully started")
\ No newline at end of file
+logger.info("FastAPI application fully started")
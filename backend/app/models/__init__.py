@@ -13,18 +13,42 @@ Important:
 """
 
 from .inquiry import (
+    InquiriesImportPublic,
     Inquiry,
     InquiryCreate,
+    InquiryCreatedPublic,
     InquiryDelete,
+    InquiryImportRow,
     InquiryPublic,
     InquiryUpdate,
     InquriesPublic,
+    SimilarInquiry,
+)
+from .inquiry_history import (
+    InquiryHistory,
+    InquiryHistoryCreate,
+    InquiryHistoryEntriesPublic,
+    InquiryHistoryEntryPublic,
+    InquiryHistoryPublic,
 )
-
-from .inquiry_history import InquiryHistory, InquiryHistoryCreate, InquiryHistoryPublic
 from .message import Message
-from .response import Response, ResponseCreate, ResponsePublic, ResponsesPublic
-from .schedule import Schedule, ScheduleCreate, ScheduleInfo, SchedulePublic
+from .notification import NotificationRun
+from .pool import PoolsStats, PoolStats
+from .response import (
+    Response,
+    ResponseCreate,
+    ResponsePublic,
+    ResponsesPublic,
+    ResponseSubmit,
+)
+from .schedule import (
+    Schedule,
+    ScheduleCreate,
+    ScheduleInfo,
+    ScheduleOccurrence,
+    SchedulePublic,
+)
+from .stats import DailyRatingStats, RatingStats, RatingStatsPublic, ResponseRollup
 from .theme import Theme, ThemeCreate, ThemePublic, ThemesPublic
 from .user import (
     User,
@@ -37,13 +61,20 @@ from .user import (
 __all__ = [
     # message model
     "Message",
+    # pool stats model
+    "PoolStats",
+    "PoolsStats",
     # inquiry model
     "Inquiry",
     "InquiryCreate",
+    "InquiryCreatedPublic",
     "InquiryPublic",
     "InquriesPublic",
     "InquiryUpdate",
     "InquiryDelete",
+    "InquiryImportRow",
+    "InquiriesImportPublic",
+    "SimilarInquiry",
     # theme model
     "Theme",
     "ThemeCreate",
@@ -57,6 +88,7 @@ __all__ = [
     # response model
     "Response",
     "ResponseCreate",
+    "ResponseSubmit",
     "ResponsePublic",
     "ResponsesPublic",
     # schedule model
@@ -64,8 +96,18 @@ __all__ = [
     "ScheduleCreate",
     "SchedulePublic",
     "ScheduleInfo",
+    "ScheduleOccurrence",
+    # notification model
+    "NotificationRun",
+    # stats model
+    "ResponseRollup",
+    "RatingStats",
+    "DailyRatingStats",
+    "RatingStatsPublic",
     # inquiry history model
     "InquiryHistory",
     "InquiryHistoryCreate",
+    "InquiryHistoryEntriesPublic",
+    "InquiryHistoryEntryPublic",
     "InquiryHistoryPublic",
 ]
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.models.response import Response
@@ -42,6 +43,22 @@ class InquiryDelete(InquiryBase):
 
 # Database model, database table inferred from class name
 class Inquiry(InquiryBase, IdMixin, table=True):
+    # Text search indexes, Postgres only. The full-text expression must match
+    # the one the search queries use.
+    __table_args__ = (
+        Index(
+            "ix_inquiry_text_tsv",
+            text("to_tsvector('english', text)"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_inquiry_text_trgm",
+            "text",
+            postgresql_using="gin",
+            postgresql_ops={"text": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
     text: str = Field(min_length=MIN_LENGTH, max_length=MAX_LENGTH, unique=True)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     responses: list["Response"] = Relationship(back_populates="inquiry")
@@ -61,3 +78,32 @@ class InquiryPublic(InquiryBase):
 class InquriesPublic(SQLModel):
     data: list[InquiryPublic]
     count: int
+    next_cursor: str | None = None
+
+
+# One row of a bulk import. Created rows carry the new id, skipped rows the
+# reason they were not imported. ``row`` is 1-based.
+class InquiryImportRow(SQLModel):
+    row: int
+    text: str
+    id: int | None = None
+    reason: str | None = None
+
+
+class InquiriesImportPublic(SQLModel):
+    created: list[InquiryImportRow]
+    skipped: list[InquiryImportRow]
+
+
+# An existing inquiry similar enough to a new text to likely ask the same
+# thing. ``similarity`` is the trigram similarity, from 0 to 1.
+class SimilarInquiry(SQLModel):
+    id: int
+    text: str
+    similarity: float
+
+
+# A newly created inquiry, with the existing inquiries that likely ask the
+# same thing so the client can warn about them.
+class InquiryCreatedPublic(InquiryPublic):
+    similar: list[SimilarInquiry] = []
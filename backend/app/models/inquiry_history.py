@@ -1,8 +1,8 @@
 from datetime import datetime, timezone
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, Index
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.models.inquiry import InquiryPublic
@@ -24,7 +24,9 @@ class ActionType(str, Enum):
 
 # Shared properties
 class InquiryHistoryBase(SQLModel):
-    user_id: int = Field(foreign_key="user.id", ondelete="SET NULL", nullable=True)
+    user_id: int | None = Field(
+        default=None, foreign_key="user.id", ondelete="SET NULL", nullable=True
+    )
     inquiry_id: int = Field(
         foreign_key="inquiry.id", ondelete="SET NULL", nullable=True
     )
@@ -46,6 +48,12 @@ class InquiryHistoryCreate(InquiryHistoryBase):
 
 # Database model, database table inferred from class name
 class InquiryHistory(InquiryHistoryBase, IdMixin, table=True):
+    # Keyset scans of one inquiry's or one user's entries by time
+    __table_args__ = (
+        Index("ix_inquiryhistory_inquiry_id_created_at", "inquiry_id", "created_at"),
+        Index("ix_inquiryhistory_user_id_created_at", "user_id", "created_at"),
+    )
+
     user: "User" = Relationship(back_populates="inquiries_histories")
     inquiry: "Inquiry" = Relationship(back_populates="inquiries_histories")
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -67,3 +75,18 @@ class InquiryHistoryPublic(InquiryHistoryBase):
 class InquiriesHistoryPublic(SQLModel):
     data: list[InquiryHistoryPublic]
     count: int
+
+
+# Properties to return via API for history listings, new_data only on request
+class InquiryHistoryEntryPublic(SQLModel):
+    id: int
+    inquiry_id: int | None
+    user_id: int | None
+    action: ActionType
+    created_at: datetime
+    new_data: dict[str, Any] | None = None
+
+
+class InquiryHistoryEntriesPublic(SQLModel):
+    data: list[InquiryHistoryEntryPublic]
+    next_cursor: str | None = None
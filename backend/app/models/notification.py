@@ -0,0 +1,23 @@
+import datetime
+
+from sqlalchemy import Column, DateTime
+from sqlmodel import Field, SQLModel
+
+
+# One notification fan-out, keyed by the scheduled time it was sent for.
+# Inserting the row claims the run, so only one worker process sends it.
+class NotificationRun(SQLModel, table=True):
+    __tablename__ = "notification_run"
+
+    # Times are in UTC and stored with their time zone
+    scheduled_at: datetime.datetime = Field(
+        sa_column=Column(DateTime(timezone=True), primary_key=True)
+    )
+    inquiry_id: int = Field(foreign_key="inquiry.id", ondelete="CASCADE")
+    started_at: datetime.datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    finished_at: datetime.datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    recipient_count: int = Field(default=0)
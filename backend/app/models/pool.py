@@ -0,0 +1,18 @@
+from sqlmodel import SQLModel
+
+
+# Connection pool state of one engine, as reported by /utils/db-pool/
+class PoolStats(SQLModel):
+    name: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    checkout_timeouts: int
+    checkout_wait_seconds_total: float
+    checkout_wait_seconds_max: float
+
+
+class PoolsStats(SQLModel):
+    data: list[PoolStats]
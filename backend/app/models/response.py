@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 from .mixins import IdMixin
@@ -26,8 +27,26 @@ class ResponseCreate(ResponseBase):
     pass
 
 
+# Properties an employee submits, the rest is filled in by the server
+class ResponseSubmit(SQLModel):
+    inquiry_id: int
+    rating: int = Field(ge=1, le=5)
+    comment: str | None = Field(default=None, max_length=1024)
+    responded_at: datetime | None = Field(default=None)
+
+
 # Database model
 class Response(ResponseBase, IdMixin, table=True):
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "idempotency_key",
+            name="uq_response_user_id_idempotency_key",
+        ),
+    )
+
+    # Client-chosen key that makes retried submissions insert only once
+    idempotency_key: str | None = Field(default=None, max_length=255)
     # Relationships
     user: "User" = Relationship(back_populates="responses")
     inquiry: "Inquiry" = Relationship(back_populates="responses")
@@ -1,7 +1,9 @@
 # The Schedule is stored in the database as a string.
 # However, it is created with a JSON object and returns a JSON object
+import datetime
+
 from pydantic import BaseModel
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
 
 from .mixins import IdMixin
 
@@ -13,6 +15,8 @@ class ScheduleInfo(BaseModel):
     skipWeekends: bool
     skipHolidays: bool
     timesOfDay: list[str]
+    # ISO 3166-1 alpha-2 code of the country whose holidays are skipped
+    holidayCountry: str = "US"
 
 
 class ScheduleInquiriesAndDates(BaseModel):
@@ -31,6 +35,20 @@ class Schedule(SQLModel, IdMixin, table=True):
     scheduled_inquiries: str
 
 
+# Upcoming occurrences of the schedule, materialized whenever the schedule or
+# scheduled_inquiries change. Occurrence ``sequence`` is due on ``due_date``,
+# held on ``date`` after skipping weekends and holidays, and asks
+# scheduled_inquiries[sequence % len(scheduled_inquiries)]. inquiry_id is not
+# a foreign key because scheduled_inquiries is not one either.
+class ScheduleOccurrence(SQLModel, table=True):
+    __tablename__ = "schedule_occurrence"
+
+    sequence: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    due_date: datetime.date = Field(index=True)
+    date: datetime.date
+    inquiry_id: int = Field(index=True)
+
+
 # Properties to return via API for a single Schedule
 class SchedulePublic(BaseModel):
     schedule: ScheduleInfo
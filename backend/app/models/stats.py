@@ -0,0 +1,33 @@
+import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+# Number of responses per inquiry, day and rating, kept up to date as
+# responses are written. Theme figures are summed over the theme's inquiries
+# when read, so moving an inquiry to another theme needs no rewrite.
+class ResponseRollup(SQLModel, table=True):
+    __tablename__ = "response_rollup"
+
+    inquiry_id: int = Field(
+        foreign_key="inquiry.id", ondelete="CASCADE", primary_key=True
+    )
+    day: datetime.date = Field(primary_key=True)
+    rating: int = Field(primary_key=True, ge=1, le=5)
+    response_count: int = Field(default=0)
+
+
+# Properties to return via API
+class RatingStats(SQLModel):
+    count: int
+    average: float | None
+    # Number of responses with rating 1, 2, 3, 4 and 5
+    histogram: list[int]
+
+
+class DailyRatingStats(RatingStats):
+    day: datetime.date
+
+
+class RatingStatsPublic(RatingStats):
+    daily: list[DailyRatingStats]
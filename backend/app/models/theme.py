@@ -41,3 +41,4 @@ class ThemePublic(ThemeBase):
 class ThemesPublic(SQLModel):
     data: list[ThemePublic]
     count: int
+    next_cursor: str | None = None
@@ -0,0 +1,161 @@
+import csv
+import io
+import json
+from collections.abc import Iterator, Sequence
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import Connection, Engine, Select, select
+from sqlmodel import Session, col
+
+from app.models import Inquiry, InquiryHistory, Response
+
+# Rows fetched from the server-side cursor, and written out, at a time
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+RESPONSE_COLUMNS = (
+    col(Response.id),
+    col(Response.user_id),
+    col(Response.inquiry_id),
+    col(Response.inquiry_history_id),
+    col(Response.rating),
+    col(Response.comment),
+    col(Response.responded_at),
+)
+
+INQUIRY_HISTORY_COLUMNS = (
+    col(InquiryHistory.id),
+    col(InquiryHistory.inquiry_id),
+    col(InquiryHistory.user_id),
+    col(InquiryHistory.action),
+    col(InquiryHistory.created_at),
+    col(InquiryHistory.new_data),
+)
+
+
+def _filter(
+    statement: Select[Any],
+    *,
+    timestamp: Any,
+    inquiry: Any,
+    start: date | None,
+    end: date | None,
+    theme_id: int | None,
+    inquiry_id: int | None,
+) -> Select[Any]:
+    if start is not None:
+        statement = statement.where(timestamp >= datetime.combine(start, time.min))
+    if end is not None:
+        statement = statement.where(
+            timestamp < datetime.combine(end + timedelta(days=1), time.min)
+        )
+    if inquiry_id is not None:
+        statement = statement.where(inquiry == inquiry_id)
+    if theme_id is not None:
+        statement = statement.join(Inquiry, col(Inquiry.id) == inquiry).where(
+            col(Inquiry.theme_id) == theme_id
+        )
+    return statement
+
+
+def responses_statement(
+    *,
+    start: date | None = None,
+    end: date | None = None,
+    theme_id: int | None = None,
+    inquiry_id: int | None = None,
+) -> Select[Any]:
+    statement = select(*RESPONSE_COLUMNS).order_by(col(Response.id))
+    return _filter(
+        statement,
+        timestamp=col(Response.responded_at),
+        inquiry=col(Response.inquiry_id),
+        start=start,
+        end=end,
+        theme_id=theme_id,
+        inquiry_id=inquiry_id,
+    )
+
+
+def inquiry_history_statement(
+    *,
+    start: date | None = None,
+    end: date | None = None,
+    theme_id: int | None = None,
+    inquiry_id: int | None = None,
+) -> Select[Any]:
+    statement = select(*INQUIRY_HISTORY_COLUMNS).order_by(col(InquiryHistory.id))
+    return _filter(
+        statement,
+        timestamp=col(InquiryHistory.created_at),
+        inquiry=col(InquiryHistory.inquiry_id),
+        start=start,
+        end=end,
+        theme_id=theme_id,
+        inquiry_id=inquiry_id,
+    )
+
+
+def _value(value: Any) -> Any:
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _csv_chunk(rows: Sequence[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            json.dumps(value) if isinstance(value, dict | list) else _value(value)
+            for value in row
+        )
+    return buffer.getvalue()
+
+
+def _ndjson_chunk(keys: Sequence[str], rows: Sequence[Sequence[Any]]) -> str:
+    return "".join(
+        json.dumps({key: _value(value) for key, value in zip(keys, row, strict=True)})
+        + "\n"
+        for row in rows
+    )
+
+
+def stream_export(
+    *, bind: Engine | Connection, statement: Select[Any], export_format: ExportFormat
+) -> Iterator[str]:
+    """
+    Yield ``statement``'s rows as CSV (with a header line) or NDJSON, one
+    chunk per batch.
+
+    Rows are read through a server-side cursor ``EXPORT_BATCH_SIZE`` at a time
+    and never loaded as models, so memory stays flat however many rows match.
+    The generator opens its own session, because the request's session is
+    closed once the route returns, before the body is streamed.
+    """
+    with Session(bind) as session:
+        result = session.execute(
+            statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        keys = list(result.keys())
+        if export_format == ExportFormat.CSV:
+            yield _csv_chunk([keys])
+        for rows in result.partitions():
+            if export_format == ExportFormat.CSV:
+                yield _csv_chunk(rows)
+            else:
+                yield _ndjson_chunk(keys, rows)
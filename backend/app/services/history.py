@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import literal, select, tuple_
+from sqlmodel import Session, col
+
+from app.models import (
+    InquiryHistory,
+    InquiryHistoryEntriesPublic,
+    InquiryHistoryEntryPublic,
+)
+from app.services.pagination import decode_time_cursor, encode_time_cursor
+
+_ENTRY_COLUMNS = (
+    col(InquiryHistory.id),
+    col(InquiryHistory.inquiry_id),
+    col(InquiryHistory.user_id),
+    col(InquiryHistory.action),
+    col(InquiryHistory.created_at),
+)
+
+
+def get_history(
+    *,
+    session: Session,
+    inquiry_id: int | None = None,
+    user_id: int | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    limit: int = 100,
+    cursor: str | None = None,
+    include_data: bool = False,
+) -> InquiryHistoryEntriesPublic:
+    """
+    Return one page of history entries, newest first, for an inquiry and/or
+    a user, optionally limited to those created from ``start`` up to ``end``.
+
+    Pages are keyset paginated on ``(created_at, id)``, so with an inquiry or
+    a user each page is a range scan of the matching composite index. There
+    is no total count, which would scan every matching entry. ``new_data``
+    is only read when ``include_data`` is set.
+    """
+    if limit < 0:
+        raise ValueError("Invalid value for 'limit': it must be non-negative")
+    columns: list[Any] = [*_ENTRY_COLUMNS]
+    if include_data:
+        columns.append(col(InquiryHistory.new_data))
+    statement = select(*columns).order_by(
+        col(InquiryHistory.created_at).desc(), col(InquiryHistory.id).desc()
+    )
+    if inquiry_id is not None:
+        statement = statement.where(col(InquiryHistory.inquiry_id) == inquiry_id)
+    if user_id is not None:
+        statement = statement.where(col(InquiryHistory.user_id) == user_id)
+    if start is not None:
+        statement = statement.where(col(InquiryHistory.created_at) >= start)
+    if end is not None:
+        statement = statement.where(col(InquiryHistory.created_at) < end)
+    if cursor is not None:
+        created_at, last_id = decode_time_cursor(cursor)
+        statement = statement.where(
+            tuple_(col(InquiryHistory.created_at), col(InquiryHistory.id))
+            < tuple_(literal(created_at), literal(last_id))
+        )
+    rows = session.execute(statement.limit(limit)).mappings().all()
+    entries = [InquiryHistoryEntryPublic.model_validate(row) for row in rows]
+    next_cursor = None
+    if entries and len(entries) == limit:
+        next_cursor = encode_time_cursor(entries[-1].created_at, entries[-1].id)
+    return InquiryHistoryEntriesPublic(data=entries, next_cursor=next_cursor)
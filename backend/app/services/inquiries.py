@@ -1,34 +1,126 @@
-from sqlmodel import Session, func, select
+import re
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Any
 
-from app.models import Inquiry, InquiryCreate, InquiryUpdate, Message
+from pydantic import ValidationError
+from sqlalchemy import ColumnElement, Insert, and_, insert, literal_column, or_
+from sqlalchemy.orm import joinedload
+from sqlmodel import Session, col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
+from app.core.config import settings
+from app.core.current_inquiry_cache import current_inquiry_cache
+from app.core.db import dialect_insert
+from app.models import (
+    InquiriesImportPublic,
+    Inquiry,
+    InquiryCreate,
+    InquiryHistory,
+    InquiryImportRow,
+    InquiryUpdate,
+    Message,
+    Response,
+    SimilarInquiry,
+    Theme,
+)
+from app.models.inquiry_history import ActionType
+from app.services.pagination import Page, paginate
 
-def create_inquiry(*, session: Session, inquiry_in: InquiryCreate) -> Inquiry:
+# InquiryPublic serializes the theme, so load it with the inquiry rather than
+# lazily once per row
+_load_theme = joinedload(Inquiry.theme)  # type: ignore[arg-type]
+
+# Rows per INSERT statement in import_inquiries
+IMPORT_BATCH_SIZE = 500
+
+
+def _history_statement(
+    action: ActionType, user_id: int | None, snapshots: Sequence[dict[str, Any]]
+) -> Insert:
+    """
+    One multi-row INSERT of audit entries for the inquiries in ``snapshots``,
+    to run in the transaction that changes them.
+    """
+    created_at = datetime.now(timezone.utc)
+    return insert(InquiryHistory).values(
+        [
+            {
+                "inquiry_id": snapshot["id"],
+                "user_id": user_id,
+                "action": action,
+                "created_at": created_at,
+                "new_data": snapshot,
+            }
+            for snapshot in snapshots
+        ]
+    )
+
+
+def _snapshot(inquiry: Inquiry) -> dict[str, Any]:
+    return inquiry.model_dump(mode="json")
+
+
+def create_inquiry(
+    *, session: Session, inquiry_in: InquiryCreate, user_id: int | None = None
+) -> Inquiry:
     db_inquiry = Inquiry.model_validate(inquiry_in)
     session.add(db_inquiry)
+    session.flush()
+    session.execute(
+        _history_statement(ActionType.CREATE, user_id, [_snapshot(db_inquiry)])
+    )
     session.commit()
+    current_inquiry_cache.invalidate()
     session.refresh(db_inquiry)
     return db_inquiry
 
 
-def update_inquiry(*, session: Session, inquiry_in: InquiryUpdate) -> Inquiry:
+def update_inquiry(
+    *, session: Session, inquiry_in: InquiryUpdate, user_id: int | None = None
+) -> Inquiry:
     Inquiry.model_validate(inquiry_in)
     inquiry = get_inquiry_by_id(session=session, inquiry_id=inquiry_in.id)
     if not inquiry:
         raise ValueError("Invalid inquiry id for update")
     inquiry_data = inquiry_in.model_dump(exclude_unset=True)
     inquiry.sqlmodel_update(inquiry_data)
+    session.execute(
+        _history_statement(ActionType.UPDATE, user_id, [_snapshot(inquiry)])
+    )
     session.commit()
+    current_inquiry_cache.invalidate()
     session.refresh(inquiry)
     return inquiry
 
 
-def delete_inquiry(*, session: Session, inquiry_id: int) -> Message:
+class InquiryHasResponsesError(ValueError):
+    """
+    Raised on deleting an inquiry that has responses, which would be lost.
+    """
+
+
+def _has_responses_statement(inquiry_id: int) -> SelectOfScalar[int | None]:
+    return select(col(Response.id)).where(Response.inquiry_id == inquiry_id).limit(1)
+
+
+def delete_inquiry(
+    *, session: Session, inquiry_id: int, user_id: int | None = None
+) -> Message:
     inquiry = get_inquiry_by_id(session=session, inquiry_id=inquiry_id)
     if not inquiry:
         raise ValueError("Invalid inquiry id for delete")
+    if session.exec(_has_responses_statement(inquiry_id)).first() is not None:
+        raise InquiryHasResponsesError("Inquiry has responses and cannot be deleted")
+    # Recorded before the delete, which sets the entry's inquiry_id to NULL
+    # like the inquiry's earlier entries; new_data keeps the id
+    session.execute(
+        _history_statement(ActionType.DELETE, user_id, [_snapshot(inquiry)])
+    )
     session.delete(inquiry)
     session.commit()
+    current_inquiry_cache.invalidate()
     return Message(message="Inquiry deleted")
 
 
@@ -39,19 +131,23 @@ def get_inquiry_by_text(*, session: Session, text: str) -> Inquiry | None:
 
 
 def get_inquiry_by_id(*, session: Session, inquiry_id: int) -> Inquiry | None:
-    statement = select(Inquiry).where(Inquiry.id == inquiry_id)
+    statement = select(Inquiry).where(Inquiry.id == inquiry_id).options(_load_theme)
     session_text = session.exec(statement).first()
     return session_text
 
 
-def get_inquiries(
-    *, session: Session, skip: int = 0, limit: int = 100
-) -> list[Inquiry]:
+def _inquiries_statement(skip: int, limit: int) -> SelectOfScalar[Inquiry]:
     if skip < 0:
         raise ValueError("Invalid value for 'skip': it must be non-negative")
     if limit < 0:
         raise ValueError("Invalid value for 'limit': it must be non-negative")
-    statement = select(Inquiry).offset(skip).limit(limit)
+    return select(Inquiry).options(_load_theme).offset(skip).limit(limit)
+
+
+def get_inquiries(
+    *, session: Session, skip: int = 0, limit: int = 100
+) -> list[Inquiry]:
+    statement = _inquiries_statement(skip, limit)
     result = session.exec(statement).all()
     return list(result)
 
@@ -59,3 +155,353 @@ def get_inquiries(
 def count_inquiries(*, session: Session) -> int:
     statement = select(func.count()).select_from(Inquiry)
     return session.exec(statement).one()
+
+
+def get_inquiries_page(
+    *,
+    session: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    estimate_count: bool = False,
+) -> Page[Inquiry]:
+    return paginate(
+        session=session,
+        statement=select(Inquiry).options(_load_theme),
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        estimate_count=estimate_count,
+    )
+
+
+def _text_search_vector() -> ColumnElement[Any]:
+    # Must match the expression of the ix_inquiry_text_tsv index
+    return func.to_tsvector(literal_column("'english'"), col(Inquiry.text))
+
+
+def _search_filter_and_rank(
+    session: Session, q: str
+) -> tuple[ColumnElement[bool], ColumnElement[Any]]:
+    """
+    Condition matching inquiries for the search ``q`` and the rank to order
+    them by, highest first.
+
+    On Postgres an inquiry matches on full text (stemmed words, through the
+    GIN index on its tsvector) or on trigram similarity (misspellings and
+    partial words, through the pg_trgm GIN index), ranked by the better of
+    the two. Elsewhere every word of ``q`` must appear in the text, and
+    shorter texts rank higher.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        query = func.websearch_to_tsquery(literal_column("'english'"), q)
+        vector = _text_search_vector()
+        return (
+            or_(vector.op("@@")(query), col(Inquiry.text).op("%")(q)),
+            func.greatest(
+                func.ts_rank(vector, query), func.similarity(col(Inquiry.text), q)
+            ),
+        )
+    return (
+        and_(
+            *(col(Inquiry.text).icontains(word, autoescape=True) for word in q.split())
+        ),
+        -func.length(col(Inquiry.text)),
+    )
+
+
+def search_inquiries(
+    *,
+    session: Session,
+    q: str,
+    theme_id: int | None = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Page[Inquiry]:
+    """
+    Return one page of the inquiries matching ``q``, best match first,
+    optionally only those in a theme, with the number of matches.
+    """
+    if not q.strip():
+        raise ValueError("Invalid value for 'q': it must not be empty")
+    if skip < 0:
+        raise ValueError("Invalid value for 'skip': it must be non-negative")
+    if limit < 0:
+        raise ValueError("Invalid value for 'limit': it must be non-negative")
+    condition, rank = _search_filter_and_rank(session, q)
+    if theme_id is not None:
+        condition = and_(condition, col(Inquiry.theme_id) == theme_id)
+    statement = (
+        select(Inquiry, func.count().over())
+        .options(_load_theme)
+        .where(condition)
+        .order_by(rank.desc(), col(Inquiry.id))
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = session.execute(statement).tuples().all()
+    if rows:
+        return Page(items=[inquiry for inquiry, _ in rows], count=rows[0][1])
+    if skip == 0:
+        return Page(items=[], count=0)
+    # Past the last page there is no row to carry the total
+    count_statement = select(func.count()).select_from(Inquiry).where(condition)
+    return Page(items=[], count=session.exec(count_statement).one())
+
+
+def _trigrams(text: str) -> set[str]:
+    # Same trigrams as pg_trgm: lower-cased words padded with two spaces in
+    # front and one behind
+    trigrams: set[str] = set()
+    for word in re.findall(r"[^\W_]+", text.lower()):
+        padded = f"  {word} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+def _similarity(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def find_similar_inquiries(
+    *,
+    session: Session,
+    text: str,
+    threshold: float | None = None,
+    limit: int = 5,
+) -> list[SimilarInquiry]:
+    """
+    Return up to ``limit`` existing inquiries whose trigram similarity to
+    ``text`` is at least ``threshold``, most similar first.
+
+    On Postgres the candidates come from the pg_trgm GIN index on the text,
+    so the cost depends on the number of candidates rather than the number
+    of inquiries. Other databases compare against every inquiry.
+    """
+    if limit < 0:
+        raise ValueError("Invalid value for 'limit': it must be non-negative")
+    if threshold is None:
+        threshold = settings.INQUIRY_SIMILARITY_THRESHOLD
+    if session.get_bind().dialect.name == "postgresql":
+        # The % operator, and so the index, filters on this threshold
+        session.execute(
+            select(
+                func.set_config("pg_trgm.similarity_threshold", str(threshold), True)
+            )
+        )
+        similarity = func.similarity(col(Inquiry.text), text)
+        statement = (
+            select(col(Inquiry.id), col(Inquiry.text), similarity)
+            .where(col(Inquiry.text).op("%")(text))
+            .order_by(similarity.desc(), col(Inquiry.id))
+            .limit(limit)
+        )
+        return [
+            SimilarInquiry(id=inquiry_id, text=inquiry_text, similarity=score)
+            for inquiry_id, inquiry_text, score in session.execute(statement).tuples()
+        ]
+    trigrams = _trigrams(text)
+    matches = []
+    for inquiry_id, inquiry_text in session.execute(
+        select(col(Inquiry.id), col(Inquiry.text))
+    ).tuples():
+        score = _similarity(trigrams, _trigrams(inquiry_text))
+        if score >= threshold:
+            matches.append(
+                SimilarInquiry(id=inquiry_id, text=inquiry_text, similarity=score)
+            )
+    matches.sort(key=lambda match: (-match.similarity, match.id))
+    return matches[:limit]
+
+
+def _import_batch(
+    session: Session, batch: list[tuple[int, InquiryCreate]], user_id: int | None
+) -> tuple[list[InquiryImportRow], list[InquiryImportRow]]:
+    theme_ids = {inquiry.theme_id for _, inquiry in batch if inquiry.theme_id}
+    known_theme_ids = (
+        set(session.exec(select(Theme.id).where(col(Theme.id).in_(theme_ids))).all())
+        if theme_ids
+        else set()
+    )
+    skipped: list[InquiryImportRow] = []
+    rows: dict[str, int] = {}
+    values: list[dict[str, Any]] = []
+    snapshots: dict[str, dict[str, Any]] = {}
+    for row, inquiry_in in batch:
+        if inquiry_in.theme_id and inquiry_in.theme_id not in known_theme_ids:
+            skipped.append(
+                InquiryImportRow(row=row, text=inquiry_in.text, reason="Unknown theme")
+            )
+            continue
+        rows[inquiry_in.text] = row
+        inquiry = Inquiry.model_validate(inquiry_in)
+        values.append(inquiry.model_dump(exclude={"id"}))
+        snapshots[inquiry.text] = _snapshot(inquiry)
+    if not values:
+        return [], skipped
+    created: list[InquiryImportRow] = []
+    statement = (
+        dialect_insert(session, Inquiry)
+        .on_conflict_do_nothing(index_elements=["text"])
+        .values(values)
+        .returning(col(Inquiry.id), col(Inquiry.text))
+    )
+    for inquiry_id, text in session.execute(statement).all():
+        created.append(InquiryImportRow(row=rows.pop(text), text=text, id=inquiry_id))
+    if created:
+        session.execute(
+            _history_statement(
+                ActionType.CREATE,
+                user_id,
+                [{**snapshots[row.text], "id": row.id} for row in created],
+            )
+        )
+    skipped.extend(
+        InquiryImportRow(row=row, text=text, reason="This inquiry already exists.")
+        for text, row in rows.items()
+    )
+    return created, skipped
+
+
+def import_inquiries(
+    *, session: Session, rows: Sequence[dict[str, Any]], user_id: int | None = None
+) -> InquiriesImportPublic:
+    """
+    Create inquiries from ``rows`` in batched multi-row INSERTs.
+
+    Rows that fail validation, repeat an earlier row, refer to a theme that
+    does not exist, or collide with an existing inquiry's text are skipped
+    and reported with the reason. Everything else is committed together,
+    with a Create history entry per inquiry.
+    """
+    created: list[InquiryImportRow] = []
+    skipped: list[InquiryImportRow] = []
+    seen: set[str] = set()
+    batch: list[tuple[int, InquiryCreate]] = []
+    for row, data in enumerate(rows, start=1):
+        try:
+            # Imported rows may leave out the optional columns entirely
+            inquiry_in = InquiryCreate.model_validate(
+                {"theme_id": None, "first_scheduled": None, **data}
+            )
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(part) for part in error["loc"])
+            skipped.append(
+                InquiryImportRow(
+                    row=row,
+                    text=str(data.get("text", "")),
+                    reason=f"{field}: {error['msg']}" if field else error["msg"],
+                )
+            )
+            continue
+        if inquiry_in.text in seen:
+            skipped.append(
+                InquiryImportRow(
+                    row=row, text=inquiry_in.text, reason="Duplicate of an earlier row"
+                )
+            )
+            continue
+        seen.add(inquiry_in.text)
+        batch.append((row, inquiry_in))
+        if len(batch) == IMPORT_BATCH_SIZE:
+            batch_created, batch_skipped = _import_batch(session, batch, user_id)
+            created.extend(batch_created)
+            skipped.extend(batch_skipped)
+            batch = []
+    if batch:
+        batch_created, batch_skipped = _import_batch(session, batch, user_id)
+        created.extend(batch_created)
+        skipped.extend(batch_skipped)
+    session.commit()
+    if created:
+        current_inquiry_cache.invalidate()
+    return InquiriesImportPublic(
+        created=sorted(created, key=lambda r: r.row),
+        skipped=sorted(skipped, key=lambda r: r.row),
+    )
+
+
+# Async variants for routes running on the event loop. An AsyncSession cannot
+# lazy load during serialization at all, so the eager theme load is required.
+
+
+async def create_inquiry_async(
+    *, session: AsyncSession, inquiry_in: InquiryCreate, user_id: int | None = None
+) -> Inquiry:
+    db_inquiry = Inquiry.model_validate(inquiry_in)
+    session.add(db_inquiry)
+    await session.flush()
+    await session.execute(
+        _history_statement(ActionType.CREATE, user_id, [_snapshot(db_inquiry)])
+    )
+    await session.commit()
+    current_inquiry_cache.invalidate()
+    await session.refresh(db_inquiry, attribute_names=["theme"])
+    return db_inquiry
+
+
+async def update_inquiry_async(
+    *, session: AsyncSession, inquiry_in: InquiryUpdate, user_id: int | None = None
+) -> Inquiry:
+    Inquiry.model_validate(inquiry_in)
+    inquiry = await get_inquiry_by_id_async(session=session, inquiry_id=inquiry_in.id)
+    if not inquiry:
+        raise ValueError("Invalid inquiry id for update")
+    inquiry_data = inquiry_in.model_dump(exclude_unset=True)
+    inquiry.sqlmodel_update(inquiry_data)
+    await session.execute(
+        _history_statement(ActionType.UPDATE, user_id, [_snapshot(inquiry)])
+    )
+    await session.commit()
+    current_inquiry_cache.invalidate()
+    await session.refresh(inquiry, attribute_names=["theme"])
+    return inquiry
+
+
+async def delete_inquiry_async(
+    *, session: AsyncSession, inquiry_id: int, user_id: int | None = None
+) -> Message:
+    inquiry = await get_inquiry_by_id_async(session=session, inquiry_id=inquiry_id)
+    if not inquiry:
+        raise ValueError("Invalid inquiry id for delete")
+    result = await session.exec(_has_responses_statement(inquiry_id))
+    if result.first() is not None:
+        raise InquiryHasResponsesError("Inquiry has responses and cannot be deleted")
+    await session.execute(
+        _history_statement(ActionType.DELETE, user_id, [_snapshot(inquiry)])
+    )
+    await session.delete(inquiry)
+    await session.commit()
+    current_inquiry_cache.invalidate()
+    return Message(message="Inquiry deleted")
+
+
+async def get_inquiry_by_text_async(
+    *, session: AsyncSession, text: str
+) -> Inquiry | None:
+    statement = select(Inquiry).where(Inquiry.text == text).options(_load_theme)
+    result = await session.exec(statement)
+    return result.first()
+
+
+async def get_inquiry_by_id_async(
+    *, session: AsyncSession, inquiry_id: int | None
+) -> Inquiry | None:
+    statement = select(Inquiry).where(Inquiry.id == inquiry_id).options(_load_theme)
+    result = await session.exec(statement)
+    return result.first()
+
+
+async def get_inquiries_async(
+    *, session: AsyncSession, skip: int = 0, limit: int = 100
+) -> list[Inquiry]:
+    statement = _inquiries_statement(skip, limit)
+    result = await session.exec(statement)
+    return list(result.all())
+
+
+async def count_inquiries_async(*, session: AsyncSession) -> int:
+    statement = select(func.count()).select_from(Inquiry)
+    result = await session.exec(statement)
+    return result.one()
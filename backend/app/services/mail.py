@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import smtplib
+import threading
+import time
+from collections.abc import Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from email.message import EmailMessage
+from email.utils import formataddr
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutgoingEmail:
+    email_to: str
+    subject: str
+    html_content: str
+    attempts: int = 0
+    # time.monotonic() before which a failed email is not retried
+    not_before: float = 0.0
+
+
+def _build_message(email: OutgoingEmail) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = formataddr(
+        (settings.EMAILS_FROM_NAME or "", settings.EMAILS_FROM_EMAIL or "")
+    )
+    message["To"] = email.email_to
+    message["Subject"] = email.subject
+    message.set_content(email.html_content, subtype="html")
+    return message
+
+
+def connect_smtp() -> smtplib.SMTP:
+    """
+    Open an authenticated connection to the configured SMTP server.
+    """
+    assert settings.SMTP_HOST, "no provided configuration for email variables"
+    smtp: smtplib.SMTP
+    if settings.SMTP_SSL:
+        smtp = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=30)
+    else:
+        smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=30)
+        if settings.SMTP_TLS:
+            smtp.starttls()
+    if settings.SMTP_USER and settings.SMTP_PASSWORD:
+        smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+    return smtp
+
+
+def _is_permanent(error: Exception) -> bool:
+    # 5xx replies and refused recipients will fail the same way again
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+class _Connection:
+    """
+    One SMTP connection, opened on first use and kept open between batches.
+    """
+
+    def __init__(self, smtp_factory: Callable[[], smtplib.SMTP]) -> None:
+        self.smtp_factory = smtp_factory
+        self.smtp: smtplib.SMTP | None = None
+
+    def send(self, message: EmailMessage) -> None:
+        if self.smtp is None:
+            self.smtp = self.smtp_factory()
+        try:
+            self.smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # Servers close idle connections, reconnect once
+            self.smtp = self.smtp_factory()
+            self.smtp.send_message(message)
+
+    def close(self) -> None:
+        if self.smtp is not None:
+            with suppress(smtplib.SMTPException, OSError):
+                self.smtp.quit()
+            self.smtp = None
+
+
+class MailDispatcher:
+    """
+    In-process queue of outgoing emails, sent by background workers over a
+    pool of ``connections`` SMTP connections that are kept open between
+    batches.
+
+    ``enqueue`` only appends, so the API never waits on the SMTP server, and
+    refuses emails once ``max_size`` are waiting. ``run`` starts one worker
+    per connection, each sending up to ``batch_size`` emails at a time
+    whenever some are queued, and at least every ``flush_interval`` seconds.
+    An SMTP connection sends one email at a time, so throughput grows with
+    ``connections``. A dropped connection is reopened once and the email
+    resent. Other temporary failures are retried after ``retry_backoff``
+    seconds, doubling each time, at most ``max_retries`` times. Permanent
+    failures are logged and dropped.
+    """
+
+    def __init__(
+        self,
+        *,
+        smtp_factory: Callable[[], smtplib.SMTP],
+        max_size: int,
+        batch_size: int,
+        max_retries: int,
+        retry_backoff: float,
+        flush_interval: float,
+        connections: int,
+    ) -> None:
+        self.smtp_factory = smtp_factory
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.flush_interval = flush_interval
+        self.connections = connections
+        self._pending: list[OutgoingEmail] = []
+        self._lock = threading.Lock()
+        # Each sender holds a slot and takes an idle connection from the pool
+        self._slots = threading.Semaphore(connections)
+        self._idle = [_Connection(smtp_factory) for _ in range(connections)]
+        self._wakeup = asyncio.Event()
+        # The loop run() is waiting on, set when it starts
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _wake(self) -> None:
+        # asyncio.Event is not thread-safe, and sync routes enqueue from the
+        # threadpool, so set it through the loop when called from elsewhere
+        loop = self._loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is None or loop is running:
+            self._wakeup.set()
+            return
+        with suppress(RuntimeError):
+            # The loop is closed after shutdown
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    def enqueue(self, email: OutgoingEmail) -> bool:
+        """
+        Queue ``email``. Returns False if the queue is full.
+        """
+        with self._lock:
+            if len(self._pending) >= self.max_size:
+                return False
+            self._pending.append(email)
+        self._wake()
+        return True
+
+    def _take(self) -> list[OutgoingEmail]:
+        now = time.monotonic()
+        with self._lock:
+            batch: list[OutgoingEmail] = []
+            waiting: list[OutgoingEmail] = []
+            for email in self._pending:
+                if len(batch) < self.batch_size and email.not_before <= now:
+                    batch.append(email)
+                else:
+                    waiting.append(email)
+            self._pending = waiting
+            return batch
+
+    def _retry(self, email: OutgoingEmail, error: Exception) -> None:
+        email.attempts += 1
+        if _is_permanent(error) or email.attempts > self.max_retries:
+            logger.error(f"Dropping email to {email.email_to}: {error}")
+            return
+        email.not_before = time.monotonic() + self.retry_backoff * 2 ** (
+            email.attempts - 1
+        )
+        with self._lock:
+            # Retries may exceed max_size, they were already accepted
+            self._pending.append(email)
+
+    def _disconnect(self) -> None:
+        # Waits for every sender to hand its connection back
+        for _ in range(self.connections):
+            self._slots.acquire()
+        try:
+            for connection in self._idle:
+                connection.close()
+        finally:
+            for _ in range(self.connections):
+                self._slots.release()
+
+    def send_pending(self) -> int:
+        """
+        Send every email that is due, one batch at a time over one pooled
+        connection, and return how many were sent. Concurrent calls share
+        the queue, each over its own connection.
+        """
+        sent = 0
+        with self._slots:
+            with self._lock:
+                connection = self._idle.pop()
+            try:
+                while batch := self._take():
+                    for email in batch:
+                        try:
+                            connection.send(_build_message(email))
+                        except (smtplib.SMTPException, OSError) as e:
+                            if not isinstance(e, smtplib.SMTPResponseException):
+                                connection.close()
+                            self._retry(email, e)
+                        else:
+                            sent += 1
+            finally:
+                with self._lock:
+                    self._idle.append(connection)
+        return sent
+
+    async def _send_when_woken(self) -> None:
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+            try:
+                await run_in_threadpool(self.send_pending)
+            except Exception as e:
+                logger.error(f"Failed to send emails: {e}")
+                await asyncio.sleep(self.flush_interval)
+
+    async def run(self) -> None:
+        """
+        Send queued emails with one worker per connection until cancelled.
+        """
+        self._loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(self._send_when_woken() for _ in range(self.connections))
+        )
+
+    async def close(self) -> None:
+        """
+        Send whatever is due and close the connections, for use on shutdown.
+        """
+        try:
+            await run_in_threadpool(self.send_pending)
+        except Exception as e:
+            logger.error(f"Failed to send emails on shutdown: {e}")
+        self._disconnect()
+        if self._pending:
+            logger.warning(f"Dropping {len(self._pending)} unsent emails on shutdown")
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+mail_dispatcher = MailDispatcher(
+    smtp_factory=connect_smtp,
+    max_size=settings.MAIL_QUEUE_MAX_SIZE,
+    batch_size=settings.MAIL_BATCH_SIZE,
+    max_retries=settings.MAIL_MAX_RETRIES,
+    retry_backoff=settings.MAIL_RETRY_BACKOFF_SECONDS,
+    flush_interval=settings.MAIL_FLUSH_SECONDS,
+    connections=settings.MAIL_CONNECTIONS,
+)
@@ -0,0 +1,301 @@
+import asyncio
+import logging
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Protocol
+
+import httpx
+import pytz
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session, col, select
+
+import app.services.schedule as schedule_service
+from app.core.config import settings
+from app.core.db import dialect_insert, engine
+from app.models import Inquiry, NotificationRun, Schedule, ScheduleInfo, User
+from app.services.mail import MailDispatcher, OutgoingEmail, mail_dispatcher
+from app.utils import render_email_templates
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Notification:
+    inquiry_id: int
+    inquiry_text: str
+    link: str
+
+
+@dataclass
+class Recipient:
+    id: int
+    email: str
+    full_name: str | None
+
+
+class NotificationChannel(Protocol):
+    async def send(
+        self, notification: Notification, recipients: Sequence[Recipient]
+    ) -> None: ...
+
+
+class EmailChannel:
+    """
+    Renders one email per recipient from a single template lookup and hands
+    them to the mail dispatcher, waiting while its queue is full.
+    """
+
+    def __init__(self, dispatcher: MailDispatcher) -> None:
+        self.dispatcher = dispatcher
+
+    def _render(
+        self, notification: Notification, recipients: Sequence[Recipient]
+    ) -> list[str]:
+        return list(
+            render_email_templates(
+                template_name="inquiry_notification.html",
+                contexts=[
+                    {"name": recipient.full_name or recipient.email}
+                    for recipient in recipients
+                ],
+                common_context={
+                    "project_name": settings.PROJECT_NAME,
+                    "inquiry_text": notification.inquiry_text,
+                    "link": notification.link,
+                },
+            )
+        )
+
+    async def send(
+        self, notification: Notification, recipients: Sequence[Recipient]
+    ) -> None:
+        html_contents = await run_in_threadpool(self._render, notification, recipients)
+        subject = f"{settings.PROJECT_NAME} - New question"
+        for i, recipient in enumerate(recipients):
+            email = OutgoingEmail(
+                email_to=recipient.email,
+                subject=subject,
+                html_content=html_contents[i],
+            )
+            while not self.dispatcher.enqueue(email):
+                await asyncio.sleep(self.dispatcher.flush_interval)
+
+
+class WebhookChannel:
+    """
+    Posts each chunk of recipients to a webhook as one JSON request.
+    """
+
+    def __init__(self, url: str, client: httpx.AsyncClient) -> None:
+        self.url = url
+        self.client = client
+
+    async def send(
+        self, notification: Notification, recipients: Sequence[Recipient]
+    ) -> None:
+        response = await self.client.post(
+            self.url,
+            json={
+                "inquiry": {
+                    "id": notification.inquiry_id,
+                    "text": notification.inquiry_text,
+                    "link": notification.link,
+                },
+                "recipients": [
+                    {"id": recipient.id, "email": recipient.email}
+                    for recipient in recipients
+                ],
+            },
+        )
+        response.raise_for_status()
+
+
+def _next_recipients(session: Session, after_id: int, limit: int) -> list[Recipient]:
+    statement = (
+        select(col(User.id), col(User.email), col(User.full_name))
+        .where(col(User.is_active), col(User.id) > after_id)
+        .order_by(col(User.id))
+        .limit(limit)
+    )
+    return [
+        Recipient(id=user_id, email=email, full_name=full_name)
+        for user_id, email, full_name in session.execute(statement).tuples()
+    ]
+
+
+async def _deliver(
+    channels: Sequence[NotificationChannel],
+    notification: Notification,
+    recipients: Sequence[Recipient],
+) -> None:
+    for channel in channels:
+        try:
+            await channel.send(notification, recipients)
+        except Exception as e:
+            logger.error(
+                f"Failed to notify users {recipients[0].id} to {recipients[-1].id} "
+                f"through {type(channel).__name__}: {e}"
+            )
+
+
+async def fan_out(
+    *,
+    notification: Notification,
+    channels: Sequence[NotificationChannel],
+    session_factory: Callable[[], Session],
+    chunk_size: int,
+    concurrency: int,
+) -> int:
+    """
+    Send ``notification`` to every active user and return how many there
+    were.
+
+    Users are read by keyset ``chunk_size`` at a time while earlier chunks
+    are delivered, with at most ``concurrency`` chunks in flight, so memory
+    stays bounded however many users there are. A chunk that fails on one
+    channel is logged and the rest carry on.
+    """
+
+    def next_recipients(after_id: int) -> list[Recipient]:
+        # A session per chunk, so no connection or transaction is held while
+        # chunks are delivered
+        with session_factory() as session:
+            return _next_recipients(session, after_id, chunk_size)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    in_flight: set[asyncio.Task[None]] = set()
+    recipient_count = 0
+    last_id = 0
+    while recipients := await run_in_threadpool(next_recipients, last_id):
+        last_id = recipients[-1].id
+        recipient_count += len(recipients)
+        await semaphore.acquire()
+        task = asyncio.create_task(_deliver(channels, notification, recipients))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        task.add_done_callback(lambda _: semaphore.release())
+    await asyncio.gather(*in_flight)
+    return recipient_count
+
+
+def _claim_due_runs(
+    session: Session, now: datetime
+) -> list[tuple[datetime, Notification]]:
+    """
+    Claim the runs for today's times of day that are due and that no worker
+    has claimed yet.
+    """
+    db_schedule = session.exec(select(Schedule)).first()
+    if db_schedule is None:
+        return []
+    tz = pytz.timezone(settings.NOTIFICATION_TIMEZONE)
+    local_now = now.astimezone(tz)
+    inquiry_id = schedule_service.get_inquiry_held_on(
+        session=session, day=local_now.date()
+    )
+    inquiry = session.get(Inquiry, inquiry_id) if inquiry_id is not None else None
+    if inquiry is None or inquiry.id is None:
+        return []
+    notification = Notification(
+        inquiry_id=inquiry.id, inquiry_text=inquiry.text, link=settings.server_host
+    )
+    grace = timedelta(seconds=settings.NOTIFICATION_GRACE_SECONDS)
+    claimed = []
+    schedule = ScheduleInfo.model_validate_json(db_schedule.schedule)
+    for time_of_day in schedule.timesOfDay:
+        local_time = datetime.strptime(time_of_day, "%H:%M").time()
+        scheduled_at = tz.localize(
+            datetime.combine(local_now.date(), local_time)
+        ).astimezone(timezone.utc)
+        if not now - grace <= scheduled_at <= now:
+            continue
+        statement = (
+            dialect_insert(session, NotificationRun)
+            .values(
+                scheduled_at=scheduled_at,
+                inquiry_id=inquiry.id,
+                started_at=now,
+            )
+            .on_conflict_do_nothing(index_elements=["scheduled_at"])
+            .returning(col(NotificationRun.scheduled_at))
+        )
+        if session.execute(statement).first() is not None:
+            claimed.append((scheduled_at, notification))
+    session.commit()
+    return claimed
+
+
+def _finish_run(session: Session, scheduled_at: datetime, recipient_count: int) -> None:
+    run = session.get(NotificationRun, scheduled_at)
+    if run is not None:
+        run.finished_at = datetime.now(timezone.utc)
+        run.recipient_count = recipient_count
+        session.add(run)
+        session.commit()
+
+
+async def send_due_notifications(
+    *,
+    now: datetime,
+    channels: Sequence[NotificationChannel],
+    session_factory: Callable[[], Session],
+) -> int:
+    """
+    Notify active users of the inquiry held today, once for each of the
+    schedule's times of day that has come in the last
+    ``NOTIFICATION_GRACE_SECONDS``, and return how many runs were sent.
+
+    Each run is claimed by inserting its ``NotificationRun`` row first, so
+    when several workers poll at once only one of them sends it, and a
+    restart never sends it again.
+    """
+
+    def claim() -> list[tuple[datetime, Notification]]:
+        with session_factory() as session:
+            return _claim_due_runs(session, now)
+
+    def finish(scheduled_at: datetime, recipient_count: int) -> None:
+        with session_factory() as session:
+            _finish_run(session, scheduled_at, recipient_count)
+
+    runs = await run_in_threadpool(claim)
+    for scheduled_at, notification in runs:
+        recipient_count = await fan_out(
+            notification=notification,
+            channels=channels,
+            session_factory=session_factory,
+            chunk_size=settings.NOTIFICATION_CHUNK_SIZE,
+            concurrency=settings.NOTIFICATION_CONCURRENCY,
+        )
+        await run_in_threadpool(finish, scheduled_at, recipient_count)
+        logger.info(
+            f"Notified {recipient_count} users of inquiry {notification.inquiry_id}"
+        )
+    return len(runs)
+
+
+def _new_session() -> Session:
+    return Session(engine)
+
+
+async def run_notifications(client: httpx.AsyncClient) -> None:
+    """
+    Poll for due notifications every ``NOTIFICATION_POLL_SECONDS`` until
+    cancelled. Webhooks are posted through ``client``.
+    """
+    channels: list[NotificationChannel] = []
+    if settings.emails_enabled:
+        channels.append(EmailChannel(mail_dispatcher))
+    if settings.NOTIFICATION_WEBHOOK_URL:
+        channels.append(WebhookChannel(settings.NOTIFICATION_WEBHOOK_URL, client))
+    while True:
+        try:
+            await send_due_notifications(
+                now=datetime.now(timezone.utc),
+                channels=channels,
+                session_factory=_new_session,
+            )
+        except Exception as e:
+            logger.error(f"Failed to send notifications: {e}")
+        await asyncio.sleep(settings.NOTIFICATION_POLL_SECONDS)
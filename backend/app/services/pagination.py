@@ -0,0 +1,150 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import BigInteger, cast, column, table
+from sqlmodel import Session, func, select
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.models.mixins import IdMixin
+
+T = TypeVar("T", bound=IdMixin)
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    count: int
+    next_cursor: str | None = None
+
+
+def _encode(payload: dict[str, Any]) -> str:
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _decode(cursor: str) -> dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Invalid value for 'cursor'")
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid value for 'cursor'")
+    return payload
+
+
+def encode_cursor(last_id: int) -> str:
+    return _encode({"id": last_id})
+
+
+def decode_cursor(cursor: str) -> int:
+    last_id = _decode(cursor).get("id")
+    if not isinstance(last_id, int):
+        raise ValueError("Invalid value for 'cursor'")
+    return last_id
+
+
+def encode_time_cursor(created_at: datetime, last_id: int) -> str:
+    """
+    Cursor for lists ordered by ``(created_at, id)``.
+    """
+    return _encode({"at": created_at.isoformat(), "id": last_id})
+
+
+def decode_time_cursor(cursor: str) -> tuple[datetime, int]:
+    payload = _decode(cursor)
+    last_id = payload.get("id")
+    if not isinstance(last_id, int) or not isinstance(payload.get("at"), str):
+        raise ValueError("Invalid value for 'cursor'")
+    try:
+        return datetime.fromisoformat(payload["at"]), last_id
+    except ValueError:
+        raise ValueError("Invalid value for 'cursor'")
+
+
+def _count(session: Session, statement: SelectOfScalar[Any]) -> int:
+    count_statement = select(func.count()).select_from(
+        statement.order_by(None).subquery()
+    )
+    return session.exec(count_statement).one()
+
+
+def _count_column(statement: SelectOfScalar[Any]) -> Any:
+    return (
+        select(func.count())
+        .select_from(statement.order_by(None).subquery())
+        .scalar_subquery()
+    )
+
+
+def _estimated_count_column(statement: SelectOfScalar[Any]) -> Any:
+    entity = statement.column_descriptions[0]["entity"]
+    pg_class = table("pg_class", column("relname"), column("reltuples"))
+    return (
+        select(cast(pg_class.c.reltuples, BigInteger))
+        .where(pg_class.c.relname == entity.__tablename__)
+        .scalar_subquery()
+    )
+
+
+def paginate(
+    *,
+    session: Session,
+    statement: SelectOfScalar[T],
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    estimate_count: bool = False,
+) -> Page[T]:
+    """
+    Return one page of ``statement`` together with the total row count.
+
+    Rows are ordered by ``id``. When ``cursor`` is given, the page starts
+    after the row it points to and ``skip`` is ignored, so deep pages cost
+    the same as the first one. A full page carries a ``next_cursor``.
+
+    The total comes back with the page as ``count(*) OVER ()``, so a list
+    endpoint needs a single round trip. With ``estimate_count`` on Postgres
+    the total is the planner's ``pg_class.reltuples`` estimate for the whole
+    table instead, which avoids counting large tables. Only use it for
+    unfiltered statements.
+    """
+    if skip < 0:
+        raise ValueError("Invalid value for 'skip': it must be non-negative")
+    if limit < 0:
+        raise ValueError("Invalid value for 'limit': it must be non-negative")
+    entity = statement.column_descriptions[0]["entity"]
+    estimate = estimate_count and session.get_bind().dialect.name == "postgresql"
+    if estimate:
+        total_column = _estimated_count_column(statement)
+    elif cursor is not None:
+        # A window over the rows after the cursor would only count those
+        total_column = _count_column(statement)
+    else:
+        total_column = func.count().over()
+    page_statement = statement.add_columns(total_column.label("total")).order_by(
+        entity.id
+    )
+    if cursor is not None:
+        page_statement = page_statement.where(entity.id > decode_cursor(cursor))
+    else:
+        page_statement = page_statement.offset(skip)
+    # exec() would unwrap the entity column only; execute() keeps (item, total)
+    rows = session.execute(page_statement.limit(limit)).all()
+    if not rows and skip == 0 and cursor is None:
+        return Page(items=[], count=0)
+    items: list[T] = [row[0] for row in rows]
+    total = rows[0][1] if rows else None
+    if total is None or total < 0:
+        # Past the last page there is no row to carry the total, and
+        # reltuples is -1 until the table has been analyzed
+        total = _count(session, statement)
+    next_cursor = None
+    last_id = items[-1].id if items else None
+    if last_id is not None and len(items) == limit:
+        next_cursor = encode_cursor(last_id)
+    return Page(items=items, count=total, next_cursor=next_cursor)
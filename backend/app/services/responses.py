@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import threading
+from collections.abc import Sequence
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlmodel import Session, col, func, select
+
+import app.services.stats as stats_service
+from app.core.config import settings
+from app.core.db import dialect_insert, engine
+from app.models import Inquiry, InquiryHistory, Response, ResponseSubmit, User
+from app.models.inquiry_history import ActionType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingResponse:
+    user_id: int | None
+    submission: ResponseSubmit
+    idempotency_key: str | None = None
+    received_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+def _latest_history_ids(session: Session, inquiries: list[Inquiry]) -> dict[int, int]:
+    statement = (
+        select(InquiryHistory.inquiry_id, func.max(InquiryHistory.id))
+        .where(col(InquiryHistory.inquiry_id).in_([i.id for i in inquiries]))
+        .group_by(col(InquiryHistory.inquiry_id))
+    )
+    history_ids: dict[int, int] = dict(session.execute(statement).tuples().all())
+    # Inquiries created before their history was recorded get a snapshot of
+    # their current version for the responses to point at
+    snapshots = [
+        InquiryHistory(
+            inquiry_id=inquiry.id,
+            action=ActionType.CREATE,
+            new_data=inquiry.model_dump(mode="json"),
+        )
+        for inquiry in inquiries
+        if inquiry.id not in history_ids
+    ]
+    if snapshots:
+        session.add_all(snapshots)
+        session.flush()
+        for snapshot in snapshots:
+            if snapshot.id is not None:
+                history_ids[snapshot.inquiry_id] = snapshot.id
+    return history_ids
+
+
+def insert_responses(*, session: Session, pending: Sequence[PendingResponse]) -> int:
+    """
+    Write ``pending`` with a single multi-row INSERT and return how many rows
+    were inserted.
+
+    Each response points at the latest history entry of its inquiry, and
+    inserted responses are added to the rating rollup in the same transaction.
+    Responses repeating an idempotency key the same user already used are
+    skipped, and so are responses to inquiries or from users that no longer
+    exist.
+    """
+    user_ids = {response.user_id for response in pending}
+    known_user_ids = set(
+        session.exec(select(User.id).where(col(User.id).in_(user_ids))).all()
+    )
+    inquiry_ids = {response.submission.inquiry_id for response in pending}
+    inquiries = session.exec(
+        select(Inquiry).where(col(Inquiry.id).in_(inquiry_ids))
+    ).all()
+    history_ids = _latest_history_ids(session, list(inquiries))
+    values = []
+    for response in pending:
+        submission = response.submission
+        if response.user_id not in known_user_ids:
+            logger.warning(f"Dropping response from unknown user {response.user_id}")
+            continue
+        if submission.inquiry_id not in history_ids:
+            logger.warning(
+                f"Dropping response to unknown inquiry {submission.inquiry_id}"
+            )
+            continue
+        values.append(
+            {
+                "user_id": response.user_id,
+                "inquiry_id": submission.inquiry_id,
+                "inquiry_history_id": history_ids[submission.inquiry_id],
+                "rating": submission.rating,
+                "comment": submission.comment,
+                "responded_at": submission.responded_at or response.received_at,
+                "idempotency_key": response.idempotency_key,
+            }
+        )
+    inserted = 0
+    if values:
+        statement = (
+            dialect_insert(session, Response)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=["user_id", "idempotency_key"])
+            .returning(
+                col(Response.inquiry_id),
+                col(Response.responded_at),
+                col(Response.rating),
+            )
+        )
+        rows = session.execute(statement).tuples().all()
+        stats_service.record_ratings(
+            session=session,
+            ratings=[
+                (inquiry_id, responded_at.date(), rating)
+                for inquiry_id, responded_at, rating in rows
+                if responded_at is not None
+            ],
+        )
+        inserted = len(rows)
+    session.commit()
+    return inserted
+
+
+class ResponseBuffer:
+    """
+    In-process queue of submitted responses, written to the database in
+    batches.
+
+    ``submit`` only appends, so accepting a response never waits on the
+    database. ``run`` flushes whenever ``flush_size`` responses are waiting,
+    and at least every ``flush_interval`` seconds. A batch that fails to
+    write is put back. Once ``max_size`` responses are waiting ``submit``
+    refuses new ones, so the API can ask clients to back off.
+    """
+
+    def __init__(
+        self, *, max_size: int, flush_size: int, flush_interval: float
+    ) -> None:
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._pending: list[PendingResponse] = []
+        self._keys: set[tuple[int | None, str]] = set()
+        self._lock = threading.Lock()
+        self._wakeup = asyncio.Event()
+
+    @staticmethod
+    def _key(response: PendingResponse) -> tuple[int | None, str] | None:
+        if response.idempotency_key is None:
+            return None
+        return (response.user_id, response.idempotency_key)
+
+    def submit(self, response: PendingResponse) -> bool:
+        """
+        Queue ``response``. Returns False if the buffer is full. A response
+        whose idempotency key is already waiting is accepted and dropped.
+        """
+        key = self._key(response)
+        with self._lock:
+            if key is not None and key in self._keys:
+                return True
+            if len(self._pending) >= self.max_size:
+                return False
+            self._pending.append(response)
+            if key is not None:
+                self._keys.add(key)
+            ready = len(self._pending) >= self.flush_size
+        if ready:
+            self._wakeup.set()
+        return True
+
+    def _take(self) -> list[PendingResponse]:
+        with self._lock:
+            batch = self._pending[: self.flush_size]
+            del self._pending[: self.flush_size]
+            for response in batch:
+                key = self._key(response)
+                if key is not None:
+                    self._keys.discard(key)
+            return batch
+
+    def _put_back(self, batch: list[PendingResponse]) -> None:
+        with self._lock:
+            self._pending[:0] = batch
+            for response in batch:
+                key = self._key(response)
+                if key is not None:
+                    self._keys.add(key)
+
+    def flush(self, session: Session) -> int:
+        """
+        Write everything waiting, one batch at a time, and return how many
+        responses were inserted.
+
+        A batch rejected by the database for its data is split in halves
+        until the responses that cannot be written are found, and only those
+        are dropped. Other failures put back whatever was not written yet.
+        """
+        inserted = 0
+        while batch := self._take():
+            remaining = [batch]
+            try:
+                while remaining:
+                    chunk = remaining.pop()
+                    try:
+                        inserted += insert_responses(session=session, pending=chunk)
+                    except (IntegrityError, DataError) as e:
+                        session.rollback()
+                        if len(chunk) > 1:
+                            middle = len(chunk) // 2
+                            remaining += [chunk[middle:], chunk[:middle]]
+                            continue
+                        logger.error(
+                            f"Dropping response to inquiry "
+                            f"{chunk[0].submission.inquiry_id} from user "
+                            f"{chunk[0].user_id}: {e}"
+                        )
+            except Exception:
+                session.rollback()
+                self._put_back(
+                    [
+                        response
+                        for part in [chunk, *reversed(remaining)]
+                        for response in part
+                    ]
+                )
+                raise
+        return inserted
+
+    def _flush_in_new_session(self) -> int:
+        with Session(engine) as session:
+            return self.flush(session)
+
+    async def run(self) -> None:
+        """
+        Flush on size or time until cancelled.
+        """
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+            try:
+                await run_in_threadpool(self._flush_in_new_session)
+            except Exception as e:
+                logger.error(f"Failed to flush responses: {e}")
+                await asyncio.sleep(self.flush_interval)
+
+    async def close(self) -> None:
+        """
+        Write whatever is still waiting, for use on shutdown.
+        """
+        try:
+            await run_in_threadpool(self._flush_in_new_session)
+        except Exception as e:
+            logger.error(f"Failed to flush responses on shutdown: {e}")
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+response_buffer = ResponseBuffer(
+    max_size=settings.RESPONSE_BUFFER_MAX_SIZE,
+    flush_size=settings.RESPONSE_BUFFER_FLUSH_SIZE,
+    flush_interval=settings.RESPONSE_BUFFER_FLUSH_SECONDS,
+)
@@ -1,79 +1,161 @@
 import json
-from datetime import datetime, timedelta
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+from typing import Any
 
-import holidays
-from sqlmodel import select
+from sqlalchemy import Executable, Select
+from sqlalchemy import delete as sa_delete
+from sqlalchemy import select as sa_select
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
 from app.api.deps import SessionDep
-from app.models import Schedule, ScheduleCreate, ScheduleInfo, SchedulePublic
+from app.core.config import settings
+from app.core.current_inquiry_cache import current_inquiry_cache
+from app.core.db import dialect_insert
+from app.models import (
+    Schedule,
+    ScheduleCreate,
+    ScheduleInfo,
+    ScheduleOccurrence,
+    SchedulePublic,
+)
 from app.models.schedule import ScheduleInquiriesAndDates
+from app.services.schedule_projection import get_projection
 
+# (sequence, due_date, date, inquiry_id)
+OccurrenceRow = tuple[int, date, date, int]
+_OCCURRENCE_COLUMNS = ("sequence", "due_date", "date", "inquiry_id")
 
-def _skip_days(schedule: ScheduleInfo, current_date: datetime) -> datetime:
-    if schedule.skipWeekends:
-        while current_date.weekday() in [5, 6]:  # 5: Saturday, 6: Sunday
-            current_date += timedelta(days=1)
-    if schedule.skipHolidays:
-        while current_date in holidays.country_holidays("US"):
-            current_date += timedelta(days=1)
-    return current_date
 
-
-def _get_scheduled_inquiries_and_dates(
-    schedule: ScheduleInfo, scheduled_inquiries: list[int]
-) -> ScheduleInquiriesAndDates:
+def _occurrence_changes(
+    db_schedule: Schedule, existing: Sequence[OccurrenceRow]
+) -> tuple[list[int], list[dict[str, Any]]]:
+    """
+    Return the sequences of the occurrence rows to delete and the rows to add
+    or update so the table holds the next rotation of scheduled inquiries plus
+    the lookahead, starting with the first occurrence due today or later.
+    Rows that are already correct are left alone.
+    """
+    scheduled_inquiries = json.loads(db_schedule.scheduled_inquiries)
     scheduled_inquiries_count = len(scheduled_inquiries)
+    stale = {row[0]: row for row in existing}
     if scheduled_inquiries_count == 0:
-        return ScheduleInquiriesAndDates(inquiries=[], dates=[])
-    today = datetime.strptime(
-        f"{datetime.now().strftime('%Y-%m-%d')} {schedule.timesOfDay[0]}",
-        "%Y-%m-%d %H:%M",
-    )
-    start = datetime.strptime(
-        f"{schedule.startDate} {schedule.timesOfDay[0]}", "%Y-%m-%d %H:%M"
-    )
-    end = (
-        None
-        if schedule.endDate is None
-        else datetime.strptime(
-            f"{schedule.endDate} {schedule.timesOfDay[0]}", "%Y-%m-%d %H:%M"
+        return list(stale), []
+    projection = get_projection(db_schedule.schedule)
+    first = projection.first_due_on_or_after(datetime.now().date())
+    last = first + scheduled_inquiries_count + settings.SCHEDULE_OCCURRENCE_LOOKAHEAD
+    changed: list[dict[str, Any]] = []
+    for sequence in range(first, last):
+        row = (
+            sequence,
+            date.fromordinal(projection.due(sequence)),
+            projection.occurrence(sequence),
+            scheduled_inquiries[sequence % scheduled_inquiries_count],
         )
+        if stale.pop(sequence, None) == row:
+            continue
+        changed.append(dict(zip(_OCCURRENCE_COLUMNS, row, strict=True)))
+    return list(stale), changed
+
+
+def _existing_occurrences_statement() -> Select[OccurrenceRow]:
+    return sa_select(
+        col(ScheduleOccurrence.sequence),
+        col(ScheduleOccurrence.due_date),
+        col(ScheduleOccurrence.date),
+        col(ScheduleOccurrence.inquiry_id),
     )
-    current_date = start
-    past_scheduled_count = 0
-    while current_date < today:
-        current_date = _skip_days(schedule, current_date)
-        current_date += timedelta(days=schedule.daysBetween)
-        past_scheduled_count += 1
-    scheduled_dates: list[str] = []
-    for _index in scheduled_inquiries:
-        current_date = _skip_days(schedule, current_date)
-        if end is None or current_date <= end:
-            scheduled_dates.append(current_date.isoformat())
-        current_date += timedelta(days=schedule.daysBetween)
-    active_index = 0
-    if past_scheduled_count > 0:
-        active_index = past_scheduled_count % scheduled_inquiries_count
-    return ScheduleInquiriesAndDates(
-        inquiries=scheduled_inquiries[active_index:]
-        + scheduled_inquiries[:active_index],
-        dates=scheduled_dates,
+
+
+def _occurrence_writes(
+    session: Session, stale: list[int], changed: list[dict[str, Any]]
+) -> list[Executable]:
+    """
+    Statements applying ``_occurrence_changes``. Several workers may refill
+    the table at once, so rows are upserted and deleted by sequence rather
+    than through the ORM, and a row another worker already wrote or removed
+    is not an error.
+    """
+    writes: list[Executable] = []
+    if stale:
+        writes.append(
+            sa_delete(ScheduleOccurrence).where(
+                col(ScheduleOccurrence.sequence).in_(stale)
+            )
+        )
+    if changed:
+        insert = dialect_insert(session, ScheduleOccurrence).values(changed)
+        writes.append(
+            insert.on_conflict_do_update(
+                index_elements=["sequence"],
+                set_={name: insert.excluded[name] for name in _OCCURRENCE_COLUMNS[1:]},
+            )
+        )
+    return writes
+
+
+def _upcoming_occurrences_statement(
+    db_schedule: Schedule,
+) -> SelectOfScalar[ScheduleOccurrence]:
+    scheduled_inquiries_count = len(json.loads(db_schedule.scheduled_inquiries))
+    return (
+        select(ScheduleOccurrence)
+        .where(ScheduleOccurrence.due_date >= datetime.now().date())
+        .order_by(ScheduleOccurrence.sequence)  # type: ignore[arg-type]
+        .limit(scheduled_inquiries_count)
+        # Rows may have been rewritten by a bulk upsert since they were loaded
+        .execution_options(populate_existing=True)
     )
 
 
-def _get_schedule_public(db_schedule: Schedule) -> SchedulePublic:
+def _get_schedule_public(
+    db_schedule: Schedule, occurrences: Sequence[ScheduleOccurrence]
+) -> SchedulePublic:
     schedule = ScheduleInfo.model_validate_json(db_schedule.schedule)
     scheduled_inquiries = json.loads(db_schedule.scheduled_inquiries)
+    time_of_day = datetime.strptime(schedule.timesOfDay[0], "%H:%M").time()
+    end = (
+        None
+        if schedule.endDate is None
+        else datetime.strptime(schedule.endDate, "%Y-%m-%d").date()
+    )
     return SchedulePublic(
         id=db_schedule.id,
         schedule=schedule,
         scheduled_inquiries=scheduled_inquiries,
-        scheduled_inquiries_and_dates=_get_scheduled_inquiries_and_dates(
-            schedule, scheduled_inquiries
+        scheduled_inquiries_and_dates=ScheduleInquiriesAndDates(
+            inquiries=[occurrence.inquiry_id for occurrence in occurrences],
+            dates=[
+                datetime.combine(occurrence.date, time_of_day).isoformat()
+                for occurrence in occurrences
+                if end is None or occurrence.date <= end
+            ],
         ),
     )
 
 
+def _sync_occurrences(session: Session, db_schedule: Schedule) -> None:
+    existing = session.execute(_existing_occurrences_statement()).tuples().all()
+    stale, changed = _occurrence_changes(db_schedule, existing)
+    for statement in _occurrence_writes(session, stale, changed):
+        session.execute(statement)
+
+
+def _get_upcoming_occurrences(
+    session: Session, db_schedule: Schedule
+) -> list[ScheduleOccurrence]:
+    statement = _upcoming_occurrences_statement(db_schedule)
+    occurrences = session.exec(statement).all()
+    if len(occurrences) < len(json.loads(db_schedule.scheduled_inquiries)):
+        # Time has moved past the materialized occurrences
+        _sync_occurrences(session, db_schedule)
+        session.commit()
+        occurrences = session.exec(statement).all()
+    return list(occurrences)
+
+
 def create_schedule(
     *, session: SessionDep, schedule_in: ScheduleCreate
 ) -> SchedulePublic:
@@ -87,9 +169,13 @@ def create_schedule(
     else:
         db_schedule = Schedule(schedule=schedule_as_string, scheduled_inquiries="[]")
     session.add(db_schedule)
+    _sync_occurrences(session, db_schedule)
     session.commit()
+    current_inquiry_cache.invalidate()
     session.refresh(db_schedule)
-    return _get_schedule_public(db_schedule)
+    return _get_schedule_public(
+        db_schedule, _get_upcoming_occurrences(session, db_schedule)
+    )
 
 
 def update_scheduled_inquiries(
@@ -102,9 +188,13 @@ def update_scheduled_inquiries(
     db_schedule = session.exec(select(Schedule)).one()
     db_schedule.scheduled_inquiries = scheduled_inquiries_as_string
     session.add(db_schedule)
+    _sync_occurrences(session, db_schedule)
     session.commit()
+    current_inquiry_cache.invalidate()
     session.refresh(db_schedule)
-    return _get_schedule_public(db_schedule)
+    return _get_schedule_public(
+        db_schedule, _get_upcoming_occurrences(session, db_schedule)
+    )
 
 
 def get_schedule(session: SessionDep) -> SchedulePublic | None:
@@ -113,5 +203,105 @@ def get_schedule(session: SessionDep) -> SchedulePublic | None:
     """
     db_schedule = session.exec(select(Schedule)).first()
     if db_schedule:
-        return _get_schedule_public(db_schedule)
+        return _get_schedule_public(
+            db_schedule, _get_upcoming_occurrences(session, db_schedule)
+        )
+    return None
+
+
+def get_inquiry_held_on(*, session: Session, day: date) -> int | None:
+    """
+    Id of the inquiry whose occurrence is held on ``day``, if any.
+
+    Skipped weekends and holidays hold an occurrence after the day it is
+    due, so occurrences due in the two weeks before ``day`` are checked too.
+    When several land on ``day`` the latest one is held.
+    """
+    db_schedule = session.exec(select(Schedule)).first()
+    if not db_schedule:
+        return None
+    scheduled_inquiries = json.loads(db_schedule.scheduled_inquiries)
+    if not scheduled_inquiries:
+        return None
+    schedule = ScheduleInfo.model_validate_json(db_schedule.schedule)
+    if schedule.endDate is not None and day > date.fromisoformat(schedule.endDate):
+        return None
+    projection = get_projection(db_schedule.schedule)
+    first = projection.first_due_on_or_after(day - timedelta(days=14))
+    last = projection.first_due_on_or_after(day + timedelta(days=1))
+    for sequence in reversed(range(first, last)):
+        if projection.occurrence(sequence) == day:
+            return int(scheduled_inquiries[sequence % len(scheduled_inquiries)])
+    return None
+
+
+async def _sync_occurrences_async(session: AsyncSession, db_schedule: Schedule) -> None:
+    result = await session.execute(_existing_occurrences_statement())
+    stale, changed = _occurrence_changes(db_schedule, result.tuples().all())
+    for statement in _occurrence_writes(session.sync_session, stale, changed):
+        await session.execute(statement)
+
+
+async def _get_upcoming_occurrences_async(
+    session: AsyncSession, db_schedule: Schedule
+) -> list[ScheduleOccurrence]:
+    statement = _upcoming_occurrences_statement(db_schedule)
+    occurrences = (await session.exec(statement)).all()
+    if len(occurrences) < len(json.loads(db_schedule.scheduled_inquiries)):
+        await _sync_occurrences_async(session, db_schedule)
+        await session.commit()
+        occurrences = (await session.exec(statement)).all()
+    return list(occurrences)
+
+
+async def create_schedule_async(
+    *, session: AsyncSession, schedule_in: ScheduleCreate
+) -> SchedulePublic:
+    """
+    Create new schedule.
+    """
+    schedule_as_string = schedule_in.schedule.model_dump_json()
+    db_schedule = (await session.exec(select(Schedule))).first()
+    if db_schedule:
+        db_schedule.schedule = schedule_as_string
+    else:
+        db_schedule = Schedule(schedule=schedule_as_string, scheduled_inquiries="[]")
+    session.add(db_schedule)
+    await _sync_occurrences_async(session, db_schedule)
+    await session.commit()
+    current_inquiry_cache.invalidate()
+    await session.refresh(db_schedule)
+    return _get_schedule_public(
+        db_schedule, await _get_upcoming_occurrences_async(session, db_schedule)
+    )
+
+
+async def update_scheduled_inquiries_async(
+    *, session: AsyncSession, scheduled_inquiries: list[int]
+) -> SchedulePublic:
+    """
+    Update scheduled_inquiries.
+    """
+    scheduled_inquiries_as_string = json.dumps(scheduled_inquiries)
+    db_schedule = (await session.exec(select(Schedule))).one()
+    db_schedule.scheduled_inquiries = scheduled_inquiries_as_string
+    session.add(db_schedule)
+    await _sync_occurrences_async(session, db_schedule)
+    await session.commit()
+    current_inquiry_cache.invalidate()
+    await session.refresh(db_schedule)
+    return _get_schedule_public(
+        db_schedule, await _get_upcoming_occurrences_async(session, db_schedule)
+    )
+
+
+async def get_schedule_async(session: AsyncSession) -> SchedulePublic | None:
+    """
+    Retrieve schedule.
+    """
+    db_schedule = (await session.exec(select(Schedule))).first()
+    if db_schedule:
+        return _get_schedule_public(
+            db_schedule, await _get_upcoming_occurrences_async(session, db_schedule)
+        )
     return None
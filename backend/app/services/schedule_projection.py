@@ -0,0 +1,125 @@
+import threading
+from bisect import bisect_left
+from datetime import date, datetime
+from functools import lru_cache
+
+import holidays
+
+from app.models import ScheduleInfo
+
+
+class HolidayCalendar:
+    """
+    Holidays of one country as a set of day ordinals.
+
+    Years are loaded from the ``holidays`` package the first time a day in
+    them is looked up, so membership is a set lookup after that.
+    """
+
+    def __init__(self, country: str) -> None:
+        self.country = country
+        self._years: set[int] = set()
+        self._days: set[int] = set()
+        self._lock = threading.Lock()
+
+    def _load_year(self, year: int) -> None:
+        with self._lock:
+            if year in self._years:
+                return
+            country_holidays = holidays.country_holidays(self.country, years=year)
+            self._days.update(day.toordinal() for day in country_holidays)
+            self._years.add(year)
+
+    def is_holiday(self, day: int) -> bool:
+        year = date.fromordinal(day).year
+        if year not in self._years:
+            self._load_year(year)
+        return day in self._days
+
+
+@lru_cache
+def get_holiday_calendar(country: str) -> HolidayCalendar:
+    return HolidayCalendar(country)
+
+
+class ScheduleProjection:
+    """
+    Occurrence dates of a schedule, indexed by occurrence number.
+
+    Occurrence ``k + 1`` is due ``daysBetween`` days after occurrence ``k``
+    was held, and each occurrence is held on its due date moved past any
+    skipped weekend or holiday. Without skips the due dates are an arithmetic
+    sequence and are computed directly. With skips every moved occurrence
+    shifts the ones after it, so the due dates are kept in a sorted table of
+    day ordinals that is extended on demand and searched with ``bisect``.
+    """
+
+    def __init__(self, schedule: ScheduleInfo) -> None:
+        self.start = datetime.strptime(schedule.startDate, "%Y-%m-%d").toordinal()
+        # A schedule that never advances would never get past a skipped day
+        self.step = max(schedule.daysBetween, 1)
+        self.skip_weekends = schedule.skipWeekends
+        self.skip_holidays = schedule.skipHolidays
+        self._holidays = get_holiday_calendar(schedule.holidayCountry)
+        self._due = [self.start]
+        self._lock = threading.Lock()
+
+    @property
+    def _closed_form(self) -> bool:
+        return not (self.skip_weekends or self.skip_holidays)
+
+    def _held_on(self, due: int) -> int:
+        day = due
+        if self.skip_weekends:
+            weekday = date.fromordinal(day).weekday()
+            if weekday >= 5:  # 5: Saturday, 6: Sunday
+                day += 7 - weekday
+        if self.skip_holidays:
+            while self._holidays.is_holiday(day):
+                day += 1
+        return day
+
+    def _extend_to(self, sequence: int) -> None:
+        # Caller holds the lock
+        while len(self._due) <= sequence:
+            self._due.append(self._held_on(self._due[-1]) + self.step)
+
+    def due(self, sequence: int) -> int:
+        """
+        Day ordinal occurrence ``sequence`` is due on, before any skip.
+        """
+        if self._closed_form:
+            return self.start + sequence * self.step
+        with self._lock:
+            self._extend_to(sequence)
+            return self._due[sequence]
+
+    def occurrence(self, sequence: int) -> date:
+        """
+        Date occurrence ``sequence`` is held on.
+        """
+        return date.fromordinal(self._held_on(self.due(sequence)))
+
+    def first_due_on_or_after(self, day: date) -> int:
+        """
+        Number of the first occurrence due on or after ``day``, which is
+        also the number of occurrences due before it.
+        """
+        ordinal = day.toordinal()
+        if ordinal <= self.start:
+            return 0
+        if self._closed_form:
+            return -(-(ordinal - self.start) // self.step)
+        with self._lock:
+            while self._due[-1] < ordinal:
+                self._extend_to(len(self._due))
+            return bisect_left(self._due, ordinal)
+
+
+@lru_cache(maxsize=32)
+def get_projection(schedule: str) -> ScheduleProjection:
+    """
+    Return the projection for a schedule serialized as it is stored on the
+    ``Schedule`` row, so an edited schedule gets a fresh projection.
+    """
+    return ScheduleProjection(ScheduleInfo.model_validate_json(schedule))
@@ -0,0 +1,119 @@
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from datetime import date
+
+from sqlmodel import Session, col, func, select
+from sqlmodel.sql.expression import Select
+
+from app.core.db import dialect_insert
+from app.models import (
+    DailyRatingStats,
+    Inquiry,
+    RatingStatsPublic,
+    ResponseRollup,
+)
+
+RATINGS = range(1, 6)
+
+
+def record_ratings(
+    *, session: Session, ratings: Iterable[tuple[int, date, int]]
+) -> None:
+    """
+    Add ``(inquiry_id, day, rating)`` triples of newly written responses to
+    the rollup. The caller commits.
+    """
+    counts = Counter(ratings)
+    if not counts:
+        return
+    statement = dialect_insert(session, ResponseRollup).values(
+        [
+            {
+                "inquiry_id": inquiry_id,
+                "day": day,
+                "rating": rating,
+                "response_count": count,
+            }
+            for (inquiry_id, day, rating), count in counts.items()
+        ]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["inquiry_id", "day", "rating"],
+        set_={
+            "response_count": col(ResponseRollup.response_count)
+            + statement.excluded.response_count
+        },
+    )
+    session.execute(statement)
+
+
+def _histogram(counts: dict[int, int]) -> tuple[int, float | None, list[int]]:
+    histogram = [counts.get(rating, 0) for rating in RATINGS]
+    total = sum(histogram)
+    average = (
+        sum(rating * counts.get(rating, 0) for rating in RATINGS) / total
+        if total
+        else None
+    )
+    return total, average, histogram
+
+
+def _rollup_statement() -> Select[tuple[date, int, int]]:
+    return select(
+        col(ResponseRollup.day),
+        col(ResponseRollup.rating),
+        func.sum(col(ResponseRollup.response_count)),
+    ).group_by(col(ResponseRollup.day), col(ResponseRollup.rating))
+
+
+def _rating_stats(
+    session: Session,
+    statement: Select[tuple[date, int, int]],
+    start: date | None,
+    end: date | None,
+) -> RatingStatsPublic:
+    if start is not None:
+        statement = statement.where(col(ResponseRollup.day) >= start)
+    if end is not None:
+        statement = statement.where(col(ResponseRollup.day) <= end)
+    by_day: dict[date, dict[int, int]] = defaultdict(dict)
+    overall: Counter[int] = Counter()
+    for day, rating, count in session.execute(statement).tuples():
+        by_day[day][rating] = count
+        overall[rating] += count
+    daily = []
+    for day in sorted(by_day):
+        count, average, histogram = _histogram(by_day[day])
+        daily.append(
+            DailyRatingStats(day=day, count=count, average=average, histogram=histogram)
+        )
+    count, average, histogram = _histogram(overall)
+    return RatingStatsPublic(
+        count=count, average=average, histogram=histogram, daily=daily
+    )
+
+
+def get_inquiry_stats(
+    *,
+    session: Session,
+    inquiry_id: int,
+    start: date | None = None,
+    end: date | None = None,
+) -> RatingStatsPublic:
+    statement = _rollup_statement().where(col(ResponseRollup.inquiry_id) == inquiry_id)
+    return _rating_stats(session, statement, start, end)
+
+
+def get_theme_stats(
+    *,
+    session: Session,
+    theme_id: int,
+    start: date | None = None,
+    end: date | None = None,
+) -> RatingStatsPublic:
+    statement = (
+        _rollup_statement()
+        .join(Inquiry, col(Inquiry.id) == col(ResponseRollup.inquiry_id))
+        .where(col(Inquiry.theme_id) == theme_id)
+    )
+    return _rating_stats(session, statement, start, end)
@@ -1,6 +1,8 @@
 from sqlmodel import Session, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import Theme, ThemeCreate
+from app.services.pagination import Page, paginate
 
 
 def create_theme(*, session: Session, theme_in: ThemeCreate) -> Theme:
@@ -31,3 +33,55 @@ def get_themes(*, session: Session, skip: int = 0, limit: int = 100) -> list[The
 def count_themes(*, session: Session) -> int:
     statement = select(func.count()).select_from(Theme)
     return session.exec(statement).one()
+
+
+def get_themes_page(
+    *,
+    session: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    estimate_count: bool = False,
+) -> Page[Theme]:
+    return paginate(
+        session=session,
+        statement=select(Theme),
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        estimate_count=estimate_count,
+    )
+
+
+async def create_theme_async(*, session: AsyncSession, theme_in: ThemeCreate) -> Theme:
+    db_theme = Theme.model_validate(theme_in)
+    session.add(db_theme)
+    await session.commit()
+    await session.refresh(db_theme)
+    return db_theme
+
+
+async def get_theme_by_name_async(*, session: AsyncSession, name: str) -> Theme | None:
+    statement = select(Theme).where(Theme.name == name)
+    result = await session.exec(statement)
+    return result.first()
+
+
+async def get_theme_by_id_async(
+    *, session: AsyncSession, theme_id: int
+) -> Theme | None:
+    return await session.get(Theme, theme_id)
+
+
+async def get_themes_async(
+    *, session: AsyncSession, skip: int = 0, limit: int = 100
+) -> list[Theme]:
+    statement = select(Theme).offset(skip).limit(limit)
+    result = await session.exec(statement)
+    return list(result.all())
+
+
+async def count_themes_async(*, session: AsyncSession) -> int:
+    statement = select(func.count()).select_from(Theme)
+    result = await session.exec(statement)
+    return result.one()
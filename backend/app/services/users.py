@@ -1,10 +1,13 @@
+from anyio import to_thread
 from passlib.context import CryptContext
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import (
     User,
     UserCreate,
 )
+from app.services.pagination import Page, paginate
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -23,3 +26,39 @@ def get_user_by_email(*, session: Session, email: str) -> User | None:
     statement = select(User).where(User.email == email)
     session_user = session.exec(statement).first()
     return session_user
+
+
+def get_users_page(
+    *,
+    session: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    estimate_count: bool = False,
+) -> Page[User]:
+    return paginate(
+        session=session,
+        statement=select(User),
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        estimate_count=estimate_count,
+    )
+
+
+async def create_user_async(*, session: AsyncSession, user_create: UserCreate) -> User:
+    # bcrypt is deliberately slow, keep it off the event loop
+    hashed_password = await to_thread.run_sync(pwd_context.hash, user_create.password)
+    db_obj = User.model_validate(
+        user_create, update={"hashed_password": hashed_password}
+    )
+    session.add(db_obj)
+    await session.commit()
+    await session.refresh(db_obj)
+    return db_obj
+
+
+async def get_user_by_email_async(*, session: AsyncSession, email: str) -> User | None:
+    statement = select(User).where(User.email == email)
+    result = await session.exec(statement)
+    return result.first()
@@ -1,9 +1,13 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
+import app.services.responses as responses_service
 from app.core.config import settings
+from app.models import InquiryHistory, Response, ResponseSubmit, User
 from app.models.inquiry import Inquiry
+from app.models.inquiry_history import ActionType
+from app.services.responses import PendingResponse
 
 
 @pytest.fixture(name="single_inquiry", scope="function")
@@ -34,3 +38,52 @@ def test_delete_request_to_inquiry_route_should_delete_inquiry_when_inquiry_exis
     assert response.status_code == 200
     content = response.json()
     assert content["message"] == "Inquiry deleted"
+
+
+def test_delete_request_to_inquiry_route_should_record_delete_history(
+    client: TestClient,
+    db: Session,
+    superuser_token_headers: dict[str, str],
+    single_inquiry: Inquiry,
+) -> None:
+    inquiry_id = single_inquiry.id
+    response = client.delete(
+        f"{settings.API_V1_STR}/inquiries/{inquiry_id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    user = db.exec(select(User).where(User.email == settings.FIRST_SUPERUSER)).one()
+    history = db.exec(
+        select(InquiryHistory).where(InquiryHistory.action == ActionType.DELETE)
+    ).one()
+    assert history.user_id == user.id
+    assert history.new_data["id"] == inquiry_id
+    assert history.new_data["text"] == "How's your work-life balance?"
+
+
+def test_delete_request_to_inquiry_route_should_return_409_when_inquiry_has_responses(
+    client: TestClient,
+    db: Session,
+    superuser_token_headers: dict[str, str],
+    single_inquiry: Inquiry,
+) -> None:
+    inquiry_id = single_inquiry.id
+    assert inquiry_id
+    user = db.exec(select(User).where(User.email == settings.FIRST_SUPERUSER)).one()
+    assert user.id
+    pending = PendingResponse(
+        user_id=user.id, submission=ResponseSubmit(inquiry_id=inquiry_id, rating=4)
+    )
+    assert responses_service.insert_responses(session=db, pending=[pending]) == 1
+
+    response = client.delete(
+        f"{settings.API_V1_STR}/inquiries/{inquiry_id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Inquiry has responses and cannot be deleted"
+    db.expire_all()
+    assert db.get(Inquiry, inquiry_id) is not None
+    assert db.exec(select(Response).where(Response.inquiry_id == inquiry_id)).one()
+    deletes = select(InquiryHistory).where(InquiryHistory.action == ActionType.DELETE)
+    assert db.exec(deletes).all() == []
@@ -0,0 +1,105 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models import Inquiry, ScheduleCreate, ScheduleInfo
+from app.services.schedule import create_schedule, update_scheduled_inquiries
+from app.tests.utils.queries import record_queries
+
+# Switching at midnight makes every call land after the day's switch time
+daily_schedule = ScheduleInfo(
+    startDate="2024-01-01",
+    endDate=None,
+    daysBetween=1,
+    skipWeekends=False,
+    skipHolidays=False,
+    timesOfDay=["00:00"],
+)
+
+
+@pytest.fixture(name="scheduled_inquiry", scope="function")
+def fixture_scheduled_inquiry(db: Session) -> Inquiry:
+    inquiry = Inquiry(text="What made you smile at work today?")
+    db.add(inquiry)
+    db.commit()
+    assert inquiry.id
+    create_schedule(session=db, schedule_in=ScheduleCreate(schedule=daily_schedule))
+    update_scheduled_inquiries(session=db, scheduled_inquiries=[inquiry.id])
+    return inquiry
+
+
+def test_getCurrentInquiryAPI_whenScheduled_shouldReturnInquiryWithETag(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    scheduled_inquiry: Inquiry,
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/inquiries/current?tz=America/New_York",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == scheduled_inquiry.id
+    assert response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+
+
+@pytest.mark.usefixtures("scheduled_inquiry")
+def test_getCurrentInquiryAPI_whenETagMatches_shouldReturnNotModified(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+) -> None:
+    url = f"{settings.API_V1_STR}/inquiries/current?tz=UTC"
+    etag = client.get(url, headers=superuser_token_headers).headers["etag"]
+    response = client.get(
+        url, headers={**superuser_token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.usefixtures("scheduled_inquiry")
+def test_getCurrentInquiryAPI_whenCalledAgain_shouldNotQuerySchedule(
+    client: TestClient,
+    async_engine: AsyncEngine,
+    superuser_token_headers: dict[str, str],
+) -> None:
+    url = f"{settings.API_V1_STR}/inquiries/current?tz=UTC"
+    # The route reads through the async session
+    with record_queries(async_engine) as queries:
+        client.get(url, headers=superuser_token_headers)
+    assert [query for query in queries if "schedule" in query]
+    with record_queries(async_engine) as queries:
+        response = client.get(url, headers=superuser_token_headers)
+    assert response.status_code == 200
+    assert queries == []
+
+
+@pytest.mark.usefixtures("scheduled_inquiry")
+def test_getCurrentInquiryAPI_whenScheduleChanges_shouldReturnNewInquiry(
+    client: TestClient,
+    db: Session,
+    superuser_token_headers: dict[str, str],
+) -> None:
+    url = f"{settings.API_V1_STR}/inquiries/current?tz=UTC"
+    client.get(url, headers=superuser_token_headers)
+    other_inquiry = Inquiry(text="Who helped you out this week?")
+    db.add(other_inquiry)
+    db.commit()
+    assert other_inquiry.id
+    update_scheduled_inquiries(session=db, scheduled_inquiries=[other_inquiry.id])
+    response = client.get(url, headers=superuser_token_headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == other_inquiry.id
+
+
+def test_getCurrentInquiryAPI_whenTimezoneIsUnknown_shouldReturnBadRequest(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/inquiries/current?tz=Nowhere/Special",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 400
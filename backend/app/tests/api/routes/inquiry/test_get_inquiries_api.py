@@ -3,7 +3,9 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session
 
 from app.core.config import settings
-from app.models import Inquiry
+from app.models import Inquiry, Theme
+from app.tests.utils.queries import record_queries
+from app.tests.utils.utils import random_lower_string
 
 
 @pytest.fixture(name="two_hundred_inquiries", scope="function")
@@ -15,6 +17,24 @@ def fixture_two_hundred_inquiries(db: Session) -> list[Inquiry]:
     return inquiries
 
 
+@pytest.fixture(name="themed_inquiries", scope="function")
+def fixture_themed_inquiries(db: Session) -> list[Inquiry]:
+    themes = [Theme(name=random_lower_string()) for _ in range(3)]
+    db.add_all(themes)
+    db.commit()
+    inquiries = [
+        Inquiry(text=f"Themed inquiry #{i + 1}", theme_id=themes[i % 3].id)
+        for i in range(30)
+    ]
+    db.add_all(inquiries)
+    db.commit()
+    return inquiries
+
+
+# Auth lookup plus one statement for the page, its count and its themes
+MAX_LIST_QUERIES = 2
+
+
 def test_getInquiriesAPI_whenCalledWithoutSkipAndLimit_shouldReturnInquiries(
     client: TestClient,
     superuser_token_headers: dict[str, str],
@@ -106,3 +126,58 @@ def test_getInquiriesAPI_whenCalledwithInvalidLimit_shouldReturnBadRequest(
                 content["detail"]
                 == "Invalid value for 'limit': it must be non-negative"
             )
+
+
+def test_getInquiriesAPI_whenFollowingNextCursor_shouldReturnNextPage(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    two_hundred_inquiries: list[Inquiry],
+) -> None:
+    first = client.get(
+        f"{settings.API_V1_STR}/inquiries?limit=150",
+        headers=superuser_token_headers,
+    ).json()
+    assert first["next_cursor"]
+    response = client.get(
+        f"{settings.API_V1_STR}/inquiries?limit=150&cursor={first['next_cursor']}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    second = response.json()
+    assert second["count"] == len(two_hundred_inquiries)
+    assert len(second["data"]) == 50
+    assert second["next_cursor"] is None
+    assert [inquiry["id"] for inquiry in first["data"] + second["data"]] == [
+        inquiry.id for inquiry in two_hundred_inquiries
+    ]
+
+
+def test_getInquiriesAPI_whenCalledWithInvalidCursor_shouldReturnBadRequest(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/inquiries?cursor=garbage",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid value for 'cursor'"
+
+
+def test_getInquiriesAPI_whenInquiriesHaveThemes_shouldNotLazyLoadThemes(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    themed_inquiries: list[Inquiry],
+    db: Session,
+) -> None:
+    db.expunge_all()
+    with record_queries(db) as queries:
+        response = client.get(
+            f"{settings.API_V1_STR}/inquiries",
+            headers=superuser_token_headers,
+        )
+    assert response.status_code == 200
+    content = response.json()
+    assert len(content["data"]) == len(themed_inquiries)
+    assert all(inquiry["theme"] for inquiry in content["data"])
+    assert len(queries) <= MAX_LIST_QUERIES
@@ -3,8 +3,9 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session
 
 from app.core.config import settings
-from app.models import Inquiry
-from app.tests.utils.utils import bad_integer_id
+from app.models import Inquiry, Theme
+from app.tests.utils.queries import record_queries
+from app.tests.utils.utils import bad_integer_id, random_lower_string
 
 
 @pytest.fixture(name="single_inquiry", scope="function")
@@ -56,3 +57,26 @@ def test_getInquiryAPI_whenCalledWithInvalidIdType_shouldReturnBadRequest(
             content["detail"][0]["msg"]
             == "Input should be a valid integer, unable to parse string as an integer"
         )
+
+
+def test_getInquiryAPI_whenInquiryHasTheme_shouldLoadThemeWithInquiry(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    theme_name = random_lower_string()
+    theme = Theme(name=theme_name)
+    db.add(theme)
+    db.commit()
+    inquiry = Inquiry(text="Do you have the tools you need?", theme_id=theme.id)
+    db.add(inquiry)
+    db.commit()
+    inquiry_id = inquiry.id
+    db.expunge_all()
+    with record_queries(db) as queries:
+        response = client.get(
+            f"{settings.API_V1_STR}/inquiries/{inquiry_id}",
+            headers=superuser_token_headers,
+        )
+    assert response.status_code == 200
+    assert response.json()["theme"]["name"] == theme_name
+    # Auth lookup plus one statement for the inquiry and its theme
+    assert len(queries) <= 2
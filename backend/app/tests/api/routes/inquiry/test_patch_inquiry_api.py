@@ -2,11 +2,12 @@ from datetime import datetime
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from app.core.config import settings
-from app.models import Theme
+from app.models import InquiryHistory, Theme
 from app.models.inquiry import MAX_LENGTH, MIN_LENGTH, Inquiry
+from app.models.inquiry_history import ActionType
 
 
 @pytest.fixture(name="single_inquiry", scope="function")
@@ -60,6 +61,32 @@ def test_patch_text_request_to_inquiry_route_should_update_inquiry_when_inquiry_
     assert "created_at" in content
 
 
+def test_patch_request_to_inquiry_route_should_record_update_history(
+    client: TestClient,
+    db: Session,
+    superuser_token_headers: dict[str, str],
+    single_inquiry: Inquiry,
+) -> None:
+    data = {
+        "id": single_inquiry.id,
+        "text": "How's your work-life balance lately?",
+        "theme_id": None,
+        "first_scheduled": None,
+    }
+    response = client.patch(
+        f"{settings.API_V1_STR}/inquiries/",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    history = db.exec(
+        select(InquiryHistory).where(InquiryHistory.inquiry_id == single_inquiry.id)
+    ).one()
+    assert history.action == ActionType.UPDATE
+    assert history.user_id is not None
+    assert history.new_data["text"] == "How's your work-life balance lately?"
+
+
 def test_patch_theme_id_request_to_inquiry_route_should_update_inquiry_when_inquiry_exists(
     client: TestClient,
     superuser_token_headers: dict[str, str],
@@ -0,0 +1,109 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models import Inquiry, Theme
+from app.tests.utils.queries import record_queries
+from app.tests.utils.utils import random_lower_string
+
+
+def test_post_bulk_inquiries_route_when_json_should_create_and_report_skipped(
+    client: TestClient, db: Session, superuser_token_headers: dict[str, str]
+) -> None:
+    db.add(Inquiry(text="Is this inquiry already here?"))
+    db.commit()
+    data = [
+        {"text": "What would make Mondays better?"},
+        {"text": "Is this inquiry already here?"},
+        {"text": "What would make Mondays better?"},
+        {"text": "Too short"},
+        {"text": "Which tool slows you down the most?"},
+    ]
+    response = client.post(
+        f"{settings.API_V1_STR}/inquiries/bulk",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [row["row"] for row in content["created"]] == [1, 5]
+    assert all(row["id"] for row in content["created"])
+    assert [(row["row"], row["reason"]) for row in content["skipped"]] == [
+        (2, "This inquiry already exists."),
+        (3, "Duplicate of an earlier row"),
+        (4, "text: String should have at least 10 characters"),
+    ]
+
+
+def test_post_bulk_inquiries_route_when_csv_should_create_inquiries_with_themes(
+    client: TestClient, db: Session, superuser_token_headers: dict[str, str]
+) -> None:
+    theme = Theme(name=random_lower_string())
+    db.add(theme)
+    db.commit()
+    csv_body = (
+        "text,theme_id\r\n"
+        f'"How supported do you feel, honestly?",{theme.id}\r\n'
+        "Did you learn something new this week?,\r\n"
+        "Which theme is this one filed under?,999999\r\n"
+    )
+    response = client.post(
+        f"{settings.API_V1_STR}/inquiries/bulk",
+        headers={**superuser_token_headers, "Content-Type": "text/csv"},
+        content=csv_body,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [row["text"] for row in content["created"]] == [
+        "How supported do you feel, honestly?",
+        "Did you learn something new this week?",
+    ]
+    assert content["skipped"] == [
+        {
+            "row": 3,
+            "text": "Which theme is this one filed under?",
+            "id": None,
+            "reason": "Unknown theme",
+        }
+    ]
+    inquiry = db.get(Inquiry, content["created"][0]["id"])
+    assert inquiry
+    assert inquiry.theme_id == theme.id
+
+
+def test_post_bulk_inquiries_route_should_insert_rows_in_one_statement(
+    client: TestClient, db: Session, superuser_token_headers: dict[str, str]
+) -> None:
+    data = [{"text": f"Bulk imported inquiry #{i + 1}"} for i in range(50)]
+    with record_queries(db) as queries:
+        response = client.post(
+            f"{settings.API_V1_STR}/inquiries/bulk",
+            headers=superuser_token_headers,
+            json=data,
+        )
+    assert response.status_code == 200
+    assert len(response.json()["created"]) == 50
+    inserts = [query.split()[2] for query in queries if query.startswith("INSERT")]
+    assert inserts == ["inquiry", "inquiryhistory"]
+
+
+def test_post_bulk_inquiries_route_when_body_is_not_a_list_should_return_422(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/inquiries/bulk",
+        headers=superuser_token_headers,
+        json={"text": "Just one inquiry, not a list"},
+    )
+    assert response.status_code == 422
+
+
+def test_post_bulk_inquiries_route_when_csv_has_no_text_column_should_return_422(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/inquiries/bulk",
+        headers={**superuser_token_headers, "Content-Type": "text/csv"},
+        content="question\r\nWhere is the text column?\r\n",
+    )
+    assert response.status_code == 422
@@ -94,3 +94,39 @@ def test_post_request_to_inquiry_route_should_return_422_when_text_is_too_long(
         f"String should have at most {MAX_LENGTH} characters"
         in response.content.decode("utf-8")
     )
+
+
+def test_post_request_to_inquiry_route_should_return_similar_inquiries(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/inquiries/"
+    data = {
+        "text": "How satisfied are you with your work-life balance?",
+        "theme_id": None,
+        "first_scheduled": None,
+    }
+    first = client.post(url, headers=superuser_token_headers, json=data)
+    assert first.status_code == 200
+    assert first.json()["similar"] == []
+
+    data["text"] = "How satisfied are you with your work/life balance??"
+    response = client.post(url, headers=superuser_token_headers, json=data)
+    assert response.status_code == 200
+    assert response.json()["text"] == data["text"]
+    [similar] = response.json()["similar"]
+    assert similar["id"] == first.json()["id"]
+    assert similar["similarity"] == 1.0
+
+
+def test_post_request_to_inquiry_route_should_return_no_similar_when_only_loosely_similar(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/inquiries/"
+    for text in [
+        "How satisfied are you with your work-life balance?",
+        "How satisfied are you with your team's tools?",
+    ]:
+        data = {"text": text, "theme_id": None, "first_scheduled": None}
+        response = client.post(url, headers=superuser_token_headers, json=data)
+        assert response.status_code == 200
+        assert response.json()["similar"] == []
@@ -0,0 +1,120 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models import Inquiry, Theme
+from app.tests.utils.utils import random_lower_string
+
+
+@pytest.fixture(name="theme", scope="function")
+def fixture_theme(db: Session) -> Theme:
+    theme = Theme(name=random_lower_string())
+    db.add(theme)
+    db.commit()
+    return theme
+
+
+@pytest.fixture(name="inquiries", scope="function")
+def fixture_inquiries(db: Session, theme: Theme) -> list[Inquiry]:
+    inquiries = [
+        Inquiry(text="How is your work-life balance?", theme_id=theme.id),
+        Inquiry(text="How is your work-life balance this month, honestly?"),
+        Inquiry(text="Do you feel supported by your manager?", theme_id=theme.id),
+        Inquiry(text="What does 100% effort look like to you?"),
+    ]
+    db.add_all(inquiries)
+    db.commit()
+    return inquiries
+
+
+def test_search_inquiries_route_should_return_matches_best_first(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    inquiries: list[Inquiry],
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/inquiries/search?q=WORK-LIFE balance",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 2
+    assert [inquiry["id"] for inquiry in content["data"]] == [
+        inquiries[0].id,
+        inquiries[1].id,
+    ]
+
+
+def test_search_inquiries_route_when_theme_given_should_only_return_its_inquiries(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    theme: Theme,
+    inquiries: list[Inquiry],
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/inquiries/search?q=you&theme_id={theme.id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert {inquiry["id"] for inquiry in content["data"]} == {
+        inquiries[0].id,
+        inquiries[2].id,
+    }
+    assert all(inquiry["theme"]["id"] == theme.id for inquiry in content["data"])
+
+
+def test_search_inquiries_route_when_paged_should_keep_total(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    inquiries: list[Inquiry],
+) -> None:
+    url = f"{settings.API_V1_STR}/inquiries/search?q=you&limit=2"
+    first = client.get(url, headers=superuser_token_headers).json()
+    second = client.get(f"{url}&skip=2", headers=superuser_token_headers).json()
+    past_end = client.get(f"{url}&skip=10", headers=superuser_token_headers).json()
+    assert first["count"] == second["count"] == past_end["count"] == 4
+    ids = [inquiry["id"] for inquiry in first["data"] + second["data"]]
+    assert len(ids) == 4
+    assert set(ids) == {inquiry.id for inquiry in inquiries}
+    assert past_end["data"] == []
+
+
+@pytest.mark.usefixtures("inquiries")
+def test_search_inquiries_route_should_treat_wildcards_literally(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/inquiries/search",
+        params={"q": "100%"},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    assert [inquiry["text"] for inquiry in response.json()["data"]] == [
+        "What does 100% effort look like to you?"
+    ]
+
+
+def test_search_inquiries_route_when_query_is_blank_should_return_400(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/inquiries/search?q=%20",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_similar_inquiries_route_should_return_near_duplicates(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    inquiries: list[Inquiry],
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/inquiries/similar",
+        params={"text": "How's your work life balance?"},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    assert [match["id"] for match in response.json()] == [inquiries[0].id]
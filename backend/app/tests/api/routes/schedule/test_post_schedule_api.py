@@ -10,6 +10,7 @@ from .....tests.utils.schedule_utils import (
     schedule_with_bad_date,
     schedule_with_bad_time,
     schedule_with_missing_attribute,
+    schedule_with_unknown_holiday_country,
     second_valid_schedule,
 )
 
@@ -81,6 +82,18 @@ def test_create_schedule_when_date_is_malformed_should_return_error(
     assert re.search("Schedule input is not valid", response.content.decode("utf-8"))
 
 
+def test_create_schedule_when_holiday_country_is_unknown_should_return_error(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/schedule/",
+        headers=superuser_token_headers,
+        json=schedule_with_unknown_holiday_country,
+    )
+    assert response.status_code == 422
+    assert re.search("Schedule input is not valid", response.content.decode("utf-8"))
+
+
 def test_create_schedule_when_data_is_not_a_schedule_string_should_return_error(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
@@ -0,0 +1,156 @@
+import time
+from collections.abc import Generator
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api.routes.auth as auth
+from app.api.deps import get_http_client
+from app.core.config import settings
+from app.core.http import create_http_client
+from app.main import app
+from app.tests.utils.oidc import FakeIdP
+
+
+@pytest.fixture(name="idp")
+def fixture_idp(monkeypatch: pytest.MonkeyPatch) -> Generator[FakeIdP, None, None]:
+    idp = FakeIdP()
+    monkeypatch.setattr(auth, "oidc_discovery", idp.discovery())
+    clients: list[httpx.AsyncClient] = []
+
+    def get_http_client_override() -> httpx.AsyncClient:
+        # Every request must get the same client for connections to be reused
+        if not clients:
+            clients.append(create_http_client(transport=idp.transport))
+        return clients[0]
+
+    app.dependency_overrides[get_http_client] = get_http_client_override
+    yield idp
+    del app.dependency_overrides[get_http_client]
+
+
+def _login(client: TestClient) -> tuple[str, dict[str, str]]:
+    """
+    Start a login and return its state and the nonce cookie header to send
+    back to the callback.
+    """
+    response = client.get(
+        f"{settings.API_V1_STR}/auth/login",
+        params={"return_url": "http://localhost/home"},
+        follow_redirects=False,
+    )
+    assert response.status_code == 307
+    location = urlparse(response.headers["location"])
+    cookies = SimpleCookie()
+    for header in response.headers.get_list("set-cookie"):
+        cookies.load(header)
+    nonce = cookies[auth.STATE_NONCE_COOKIE].value
+    state = parse_qs(location.query)["state"][0]
+    return state, {"Cookie": f"{auth.STATE_NONCE_COOKIE}={nonce}"}
+
+
+def _callback(
+    client: TestClient, state: str, headers: dict[str, str], code: str = "valid-code"
+) -> httpx.Response:
+    return client.get(
+        f"{settings.API_V1_STR}/auth/callback",
+        params={"code": code, "state": state},
+        headers=headers,
+        follow_redirects=False,
+    )
+
+
+def test_callback_should_exchange_code_through_shared_client(
+    client: TestClient, idp: FakeIdP
+) -> None:
+    for _ in range(2):
+        response = _callback(client, *_login(client))
+        assert response.status_code == 307
+        assert "access_token_cookie=id-token" in response.headers["set-cookie"]
+    assert [form["code"] for form in idp.token_requests] == ["valid-code"] * 2
+    assert idp.token_requests[0]["grant_type"] == "authorization_code"
+
+
+def test_callback_when_code_rejected_should_return_400(
+    client: TestClient, idp: FakeIdP
+) -> None:
+    response = _callback(client, *_login(client), code="expired-code")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid token request"
+    assert len(idp.token_requests) == 1
+
+
+def test_token_desktop_should_refresh_through_shared_client(
+    client: TestClient, idp: FakeIdP
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/token/desktop",
+        data={"refresh_token": "refresh", "grant_type": "refresh_token"},
+    )
+    assert response.status_code == 200
+    assert response.json()["access_token"] == "access-token"
+    assert idp.token_requests[0]["refresh_token"] == "refresh"
+    assert idp.token_requests[0]["client_id"] == settings.OIDC_CLIENT_ID_DESKTOP
+
+
+@pytest.mark.usefixtures("idp")
+def test_login_should_send_compact_state(client: TestClient) -> None:
+    state, _headers = _login(client)
+    assert len(state) < 100
+    assert auth.verify_state(state, state.split(".")[0])
+
+
+def test_callback_when_state_tampered_should_return_400(
+    client: TestClient, idp: FakeIdP
+) -> None:
+    state, headers = _login(client)
+    nonce, issued_at, signature = state.split(".")
+    tampered = f"{nonce}.{int(issued_at) + 60}.{signature}"
+    for bad_state in (tampered, f"{nonce}.{issued_at}", "garbage"):
+        response = _callback(client, bad_state, headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid state"
+    assert idp.token_requests == []
+
+
+def test_callback_when_nonce_cookie_missing_should_return_400(
+    client: TestClient, idp: FakeIdP
+) -> None:
+    state, _headers = _login(client)
+    _other_state, other_headers = _login(client)
+    for headers in ({}, other_headers):
+        assert _callback(client, state, headers).status_code == 400
+    assert idp.token_requests == []
+
+
+def test_callback_when_state_expired_should_return_400(
+    client: TestClient, idp: FakeIdP, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    state, headers = _login(client)
+    now = time.time() + settings.OIDC_STATE_MAX_AGE_SECONDS + 1
+    monkeypatch.setattr(time, "time", lambda: now)
+    assert _callback(client, state, headers).status_code == 400
+    assert idp.token_requests == []
+
+
+@pytest.mark.usefixtures("idp")
+def test_callback_should_clear_nonce_cookie(client: TestClient) -> None:
+    response = _callback(client, *_login(client))
+    assert response.status_code == 307
+    cookies = SimpleCookie()
+    for header in response.headers.get_list("set-cookie"):
+        cookies.load(header)
+    # An expired, empty nonce cookie, so the state cannot be used again
+    assert cookies[auth.STATE_NONCE_COOKIE].value == ""
+    assert cookies[auth.STATE_NONCE_COOKIE]["max-age"] == "0"
+
+
+@pytest.mark.anyio
+async def test_create_http_client_should_enable_http2_by_default() -> None:
+    assert settings.HTTP_CLIENT_HTTP2
+    # httpx refuses to build an HTTP/2 client unless h2 is installed
+    async with create_http_client() as http_client:
+        assert not http_client.is_closed
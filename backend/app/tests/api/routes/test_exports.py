@@ -0,0 +1,130 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+import app.services.exports as exports_service
+from app.core.config import settings
+from app.models import Inquiry, InquiryHistory, Response, Theme, User
+from app.models.inquiry_history import ActionType
+from app.tests.utils.utils import random_lower_string
+
+
+@pytest.fixture(name="responses", scope="function")
+def fixture_responses(db: Session) -> list[Response]:
+    user = db.exec(select(User).where(User.email == settings.FIRST_SUPERUSER)).one()
+    theme = Theme(name=random_lower_string())
+    db.add(theme)
+    db.commit()
+    themed = Inquiry(text="How clear were this sprint's goals?", theme_id=theme.id)
+    other = Inquiry(text="How was lunch today, honestly?")
+    db.add_all([themed, other])
+    db.commit()
+    responses = []
+    for day, inquiry in [(1, themed), (2, themed), (2, other), (3, other)]:
+        history = InquiryHistory(
+            inquiry_id=inquiry.id,
+            action=ActionType.CREATE,
+            new_data={"text": inquiry.text},
+        )
+        db.add(history)
+        db.flush()
+        assert user.id and inquiry.id and history.id
+        responses.append(
+            Response(
+                user_id=user.id,
+                inquiry_id=inquiry.id,
+                inquiry_history_id=history.id,
+                rating=day,
+                comment=f"Comment, with a comma, on day {day}",
+                responded_at=datetime(2024, 3, day, 12, tzinfo=timezone.utc),
+            )
+        )
+    db.add_all(responses)
+    db.commit()
+    return responses
+
+
+def test_export_responses_should_stream_csv_with_header(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    responses: list[Response],
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/exports/responses",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    assert "responses.csv" in r.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [int(row["id"]) for row in rows] == [response.id for response in responses]
+    assert rows[0]["comment"] == "Comment, with a comma, on day 1"
+    assert rows[0]["responded_at"].startswith("2024-03-01T12:00:00")
+
+
+def test_export_responses_when_filtered_should_stream_matching_ndjson(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    responses: list[Response],
+) -> None:
+    themed = responses[0].inquiry
+    r = client.get(
+        f"{settings.API_V1_STR}/exports/responses?format=ndjson"
+        f"&theme_id={themed.theme_id}&start=2024-03-02&end=2024-03-03",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [line["id"] for line in lines] == [responses[1].id]
+    assert lines[0]["rating"] == 2
+
+
+def test_export_inquiry_history_when_inquiry_given_should_stream_its_entries(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    responses: list[Response],
+) -> None:
+    inquiry_id = responses[-1].inquiry_id
+    r = client.get(
+        f"{settings.API_V1_STR}/exports/inquiry-history"
+        f"?format=ndjson&inquiry_id={inquiry_id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert len(lines) == 2
+    assert {line["inquiry_id"] for line in lines} == {inquiry_id}
+    assert lines[0]["action"] == "Create"
+    assert lines[0]["new_data"] == {"text": "How was lunch today, honestly?"}
+
+
+@pytest.mark.usefixtures("responses")
+def test_export_responses_should_stream_one_chunk_per_batch(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(exports_service, "EXPORT_BATCH_SIZE", 1)
+    chunks = list(
+        exports_service.stream_export(
+            bind=db.get_bind(),
+            statement=exports_service.responses_statement(),
+            export_format=exports_service.ExportFormat.NDJSON,
+        )
+    )
+    assert len(chunks) == 4
+    assert all(chunk.count("\n") == 1 for chunk in chunks)
+
+
+def test_export_responses_when_not_superuser_should_return_403(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/exports/responses",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 403
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models import Inquiry, InquiryHistory, User
+from app.models.inquiry_history import ActionType
+
+
+@pytest.fixture(name="edited_inquiry", scope="function")
+def fixture_edited_inquiry(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> int:
+    r = client.post(
+        f"{settings.API_V1_STR}/inquiries/",
+        headers=superuser_token_headers,
+        json={
+            "text": "How was your week, version 0?",
+            "theme_id": None,
+            "first_scheduled": None,
+        },
+    )
+    inquiry_id: int = r.json()["id"]
+    for version in range(1, 5):
+        client.patch(
+            f"{settings.API_V1_STR}/inquiries/",
+            headers=superuser_token_headers,
+            json={
+                "id": inquiry_id,
+                "text": f"How was your week, version {version}?",
+                "theme_id": None,
+                "first_scheduled": None,
+            },
+        )
+    return inquiry_id
+
+
+def test_get_inquiry_history_should_page_newest_first_without_data(
+    client: TestClient, superuser_token_headers: dict[str, str], edited_inquiry: int
+) -> None:
+    url = f"{settings.API_V1_STR}/history/inquiries/{edited_inquiry}?limit=2"
+    entries = []
+    cursor = None
+    for _ in range(5):
+        r = client.get(
+            url + (f"&cursor={cursor}" if cursor else ""),
+            headers=superuser_token_headers,
+        )
+        assert r.status_code == 200
+        content = r.json()
+        entries.extend(content["data"])
+        cursor = content["next_cursor"]
+        if cursor is None:
+            break
+    assert len(entries) == 5
+    assert len({entry["id"] for entry in entries}) == 5
+    assert [entry["action"] for entry in entries] == ["Update"] * 4 + ["Create"]
+    assert all(entry["new_data"] is None for entry in entries)
+
+
+def test_get_inquiry_history_when_include_data_should_return_snapshots(
+    client: TestClient, superuser_token_headers: dict[str, str], edited_inquiry: int
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/history/inquiries/{edited_inquiry}"
+        "?limit=1&include_data=true",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    [entry] = r.json()["data"]
+    assert entry["new_data"]["text"] == "How was your week, version 4?"
+
+
+def test_get_user_history_when_range_given_should_only_return_entries_in_range(
+    client: TestClient, db: Session, superuser_token_headers: dict[str, str]
+) -> None:
+    user = db.exec(select(User).where(User.email == settings.FIRST_SUPERUSER)).one()
+    inquiry = Inquiry(text="Which meeting could have been an email?")
+    db.add(inquiry)
+    db.commit()
+    db.add_all(
+        InquiryHistory(
+            inquiry_id=inquiry.id,
+            user_id=user.id,
+            action=ActionType.UPDATE,
+            created_at=datetime(2024, month, 15),
+        )
+        for month in (1, 2, 3)
+    )
+    db.commit()
+    r = client.get(
+        f"{settings.API_V1_STR}/history/users/{user.id}"
+        "?start=2024-02-01T00:00:00&end=2024-03-01T00:00:00",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    [entry] = r.json()["data"]
+    assert entry["created_at"] == "2024-02-15T00:00:00"
+    assert entry["user_id"] == user.id
+
+
+def test_get_inquiry_history_when_cursor_is_invalid_should_return_400(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/history/inquiries/1?cursor=not-a-cursor",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 400
+
+
+def test_get_user_history_when_not_superuser_should_return_403(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/history/users/1",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 403
+
+
+def test_inquiry_history_index_should_cover_time_range_scans(db: Session) -> None:
+    start = datetime(2024, 1, 1)
+    plan = db.connection().exec_driver_sql(
+        "EXPLAIN QUERY PLAN SELECT id FROM inquiryhistory "
+        "WHERE inquiry_id = ? AND created_at >= ? ORDER BY created_at DESC",
+        (1, start - timedelta(days=1)),
+    )
+    assert "ix_inquiryhistory_inquiry_id_created_at" in str(plan.all())
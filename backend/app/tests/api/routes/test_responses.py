@@ -0,0 +1,84 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models import Inquiry, InquiryHistory, Response
+from app.services.responses import response_buffer
+
+
+@pytest.fixture(name="inquiry", scope="function")
+def fixture_inquiry(db: Session) -> Inquiry:
+    inquiry = Inquiry(text="How was your week, on a scale of 1 to 5?")
+    db.add(inquiry)
+    db.commit()
+    return inquiry
+
+
+def test_post_response_should_be_saved_on_flush(
+    client: TestClient,
+    db: Session,
+    superuser_token_headers: dict[str, str],
+    inquiry: Inquiry,
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/responses/",
+        headers=superuser_token_headers,
+        json={"inquiry_id": inquiry.id, "rating": 4, "comment": "Pretty good"},
+    )
+    assert r.status_code == 202
+    assert len(response_buffer) == 1
+    assert response_buffer.flush(db) == 1
+    response = db.exec(select(Response).where(Response.inquiry_id == inquiry.id)).one()
+    assert response.rating == 4
+    assert response.responded_at is not None
+    history = db.get(InquiryHistory, response.inquiry_history_id)
+    assert history
+    assert history.inquiry_id == inquiry.id
+
+
+def test_post_response_when_retried_with_idempotency_key_should_save_once(
+    client: TestClient,
+    db: Session,
+    superuser_token_headers: dict[str, str],
+    inquiry: Inquiry,
+) -> None:
+    headers = {**superuser_token_headers, "Idempotency-Key": "retry-me"}
+    data = {"inquiry_id": inquiry.id, "rating": 2}
+    for _ in range(2):
+        r = client.post(f"{settings.API_V1_STR}/responses/", headers=headers, json=data)
+        assert r.status_code == 202
+    assert len(response_buffer) == 1
+    assert response_buffer.flush(db) == 1
+    r = client.post(f"{settings.API_V1_STR}/responses/", headers=headers, json=data)
+    assert r.status_code == 202
+    assert response_buffer.flush(db) == 0
+
+
+def test_post_response_when_buffer_is_full_should_return_503(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    inquiry: Inquiry,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(response_buffer, "max_size", 0)
+    r = client.post(
+        f"{settings.API_V1_STR}/responses/",
+        headers=superuser_token_headers,
+        json={"inquiry_id": inquiry.id, "rating": 3},
+    )
+    assert r.status_code == 503
+    assert r.headers["retry-after"]
+
+
+def test_post_response_when_rating_is_out_of_range_should_return_422(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    inquiry: Inquiry,
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/responses/",
+        headers=superuser_token_headers,
+        json={"inquiry_id": inquiry.id, "rating": 6},
+    )
+    assert r.status_code == 422
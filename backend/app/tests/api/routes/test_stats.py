@@ -0,0 +1,137 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models import Inquiry, ResponseSubmit, Theme, User
+from app.services.responses import PendingResponse, insert_responses
+from app.tests.utils.queries import record_queries
+from app.tests.utils.utils import random_lower_string
+
+
+@pytest.fixture(name="theme", scope="function")
+def fixture_theme(db: Session) -> Theme:
+    theme = Theme(name=random_lower_string())
+    db.add(theme)
+    db.commit()
+    return theme
+
+
+def _respond(db: Session, inquiry: Inquiry, *ratings: tuple[int, int]) -> None:
+    assert inquiry.id
+    user = db.exec(select(User).where(User.email == settings.FIRST_SUPERUSER)).one()
+    insert_responses(
+        session=db,
+        pending=[
+            PendingResponse(
+                user_id=user.id,
+                submission=ResponseSubmit(
+                    inquiry_id=inquiry.id,
+                    rating=rating,
+                    responded_at=datetime(2024, 3, day, 12, tzinfo=timezone.utc),
+                ),
+            )
+            for day, rating in ratings
+        ],
+    )
+
+
+def test_get_inquiry_stats_should_return_histogram_and_daily_stats(
+    client: TestClient, db: Session, superuser_token_headers: dict[str, str]
+) -> None:
+    inquiry = Inquiry(text="How focused were you this week?")
+    db.add(inquiry)
+    db.commit()
+    _respond(db, inquiry, (1, 5), (1, 4), (2, 2))
+    _respond(db, inquiry, (2, 2))
+    r = client.get(
+        f"{settings.API_V1_STR}/stats/inquiries/{inquiry.id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == 4
+    assert content["average"] == 3.25
+    assert content["histogram"] == [0, 2, 0, 1, 1]
+    assert [(d["day"], d["count"], d["average"]) for d in content["daily"]] == [
+        ("2024-03-01", 2, 4.5),
+        ("2024-03-02", 2, 2.0),
+    ]
+
+
+def test_get_inquiry_stats_when_range_given_should_only_count_days_in_range(
+    client: TestClient, db: Session, superuser_token_headers: dict[str, str]
+) -> None:
+    inquiry = Inquiry(text="How focused were you this week?")
+    db.add(inquiry)
+    db.commit()
+    _respond(db, inquiry, (1, 5), (2, 1), (3, 3))
+    r = client.get(
+        f"{settings.API_V1_STR}/stats/inquiries/{inquiry.id}"
+        "?start=2024-03-02&end=2024-03-02",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == 1
+    assert content["histogram"] == [1, 0, 0, 0, 0]
+    assert [d["day"] for d in content["daily"]] == ["2024-03-02"]
+
+
+def test_get_inquiry_stats_when_no_responses_should_return_empty_stats(
+    client: TestClient, db: Session, superuser_token_headers: dict[str, str]
+) -> None:
+    inquiry = Inquiry(text="Nobody has answered this one yet")
+    db.add(inquiry)
+    db.commit()
+    r = client.get(
+        f"{settings.API_V1_STR}/stats/inquiries/{inquiry.id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    assert r.json() == {
+        "count": 0,
+        "average": None,
+        "histogram": [0, 0, 0, 0, 0],
+        "daily": [],
+    }
+
+
+def test_get_theme_stats_should_combine_inquiries_without_reading_responses(
+    client: TestClient,
+    db: Session,
+    superuser_token_headers: dict[str, str],
+    theme: Theme,
+) -> None:
+    first = Inquiry(text="How clear were this sprint's goals?", theme_id=theme.id)
+    second = Inquiry(text="How clear was this sprint's scope?", theme_id=theme.id)
+    other = Inquiry(text="How was lunch today, honestly?")
+    db.add_all([first, second, other])
+    db.commit()
+    _respond(db, first, (1, 3))
+    _respond(db, second, (1, 5))
+    _respond(db, other, (1, 1))
+    with record_queries(db) as queries:
+        r = client.get(
+            f"{settings.API_V1_STR}/stats/themes/{theme.id}",
+            headers=superuser_token_headers,
+        )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == 2
+    assert content["average"] == 4.0
+    assert content["histogram"] == [0, 0, 1, 0, 1]
+    assert not [query for query in queries if "FROM response " in query]
+
+
+@pytest.mark.parametrize("kind", ["inquiries", "themes"])
+def test_get_stats_when_not_found_should_return_404(
+    client: TestClient, superuser_token_headers: dict[str, str], kind: str
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/stats/{kind}/999999",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 404
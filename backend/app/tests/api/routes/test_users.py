@@ -5,6 +5,7 @@ from sqlmodel import Session, select
 
 import app.services.users as users_service
 from app.core.config import settings
+from app.core.token_cache import token_cache
 from app.models import User, UserCreate
 from app.tests.utils.utils import bad_integer_id, random_email, random_lower_string
 
@@ -240,3 +241,20 @@ def test_delete_user_current_super_user_error(
     )
     assert r.status_code == 403
     assert r.json()["detail"] == "Super users are not allowed to delete themselves"
+
+
+def test_delete_user_super_user_should_invalidate_cached_tokens(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    username = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=username, password=password)
+    user = users_service.create_user(session=db, user_create=user_in)
+    token_cache.put(username, {"email": username}, user)
+    assert token_cache.get(username)
+    r = client.delete(
+        f"{settings.API_V1_STR}/users/{user.id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    assert token_cache.get(username) is None
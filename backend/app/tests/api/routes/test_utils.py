@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.services.mail import mail_dispatcher
+
+
+def test_db_pool_stats_should_report_sync_and_async_pools(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/db-pool/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    pools = r.json()["data"]
+    assert [pool["name"] for pool in pools] == ["sync", "async"]
+    for pool in pools:
+        assert pool["size"] == settings.POSTGRES_POOL_SIZE
+        assert pool["checked_out"] == 0
+
+
+def test_test_email_should_queue_email_and_return(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    with (
+        patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "survey@example.com"),
+        patch.object(mail_dispatcher, "_pending", []),
+    ):
+        r = client.post(
+            f"{settings.API_V1_STR}/utils/test-email/?email_to=someone@example.com",
+            headers=superuser_token_headers,
+        )
+        assert r.status_code == 201
+        [email] = mail_dispatcher._pending
+    assert email.email_to == "someone@example.com"
+    assert "someone@example.com" in email.html_content
+
+
+def test_test_email_when_queue_is_full_should_return_503(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    with (
+        patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "survey@example.com"),
+        patch.object(mail_dispatcher, "max_size", 0),
+    ):
+        r = client.post(
+            f"{settings.API_V1_STR}/utils/test-email/?email_to=someone@example.com",
+            headers=superuser_token_headers,
+        )
+    assert r.status_code == 503
+    assert r.headers["retry-after"]
@@ -78,3 +78,16 @@ def test_get_theme_by_id_when_theme_does_not_exist_should_return_not_found(
     assert response.status_code == 404
     content = response.json()
     assert content["detail"] == "Theme not found"
+
+
+def test_getThemesAPI_whenCalledWithInvalidSkip_shouldReturnBadRequest(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/themes?skip=-1",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 400
+    content = response.json()
+    assert content["detail"] == "Invalid value for 'skip': it must be non-negative"
@@ -0,0 +1,81 @@
+import time
+
+import jwt
+import pytest
+from fastapi import HTTPException
+from pytest_mock import MockerFixture
+from sqlmodel import Session
+
+import app.services.users as users_service
+from app.api import deps
+from app.core.config import settings
+from app.models import User, UserCreate
+from app.tests.utils.oidc import FakeIdP
+from app.tests.utils.utils import random_email, random_lower_string
+
+AUDIENCE = "test-client"
+
+
+@pytest.fixture(name="idp")
+def fixture_idp(mocker: MockerFixture) -> FakeIdP:
+    idp = FakeIdP()
+    idp.add_key("current")
+    mocker.patch.object(deps, "oidc_discovery", idp.discovery())
+    mocker.patch.object(settings, "OIDC_CLIENT_ID", AUDIENCE)
+    return idp
+
+
+@pytest.fixture(name="user", scope="module")
+def fixture_user(db: Session) -> User:
+    user_in = UserCreate(email=random_email(), password=random_lower_string())
+    return users_service.create_user(session=db, user_create=user_in)
+
+
+def _claims(email: str = "") -> dict[str, object]:
+    return {
+        "email": email,
+        "aud": AUDIENCE,
+        "exp": int(time.time()) + 60,
+        "nonce": random_lower_string(),
+    }
+
+
+@pytest.mark.anyio
+async def test_get_current_user_when_kid_matches_should_verify_with_that_key(
+    db: Session, idp: FakeIdP, user: User, mocker: MockerFixture
+) -> None:
+    decode = mocker.spy(jwt, "decode")
+    token = idp.token("current", _claims(user.email))
+    current_user = await deps.get_current_user(
+        session=db, authorization=f"Bearer {token}"
+    )
+    assert current_user.id == user.id
+    assert decode.call_count == 1
+    assert decode.call_args.kwargs["key"].key_id == "current"
+
+
+@pytest.mark.anyio
+async def test_get_current_user_when_kid_unknown_should_raise_forbidden(
+    db: Session, idp: FakeIdP
+) -> None:
+    idp.add_key("unpublished")
+    token = idp.token("unpublished", _claims())
+    idp.private_keys.pop("unpublished")
+    with pytest.raises(HTTPException) as exc_info:
+        await deps.get_current_user(session=db, authorization=f"Bearer {token}")
+    assert exc_info.value.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_get_current_user_when_signed_by_other_key_should_raise_forbidden(
+    db: Session, idp: FakeIdP
+) -> None:
+    token = jwt.encode(
+        _claims(),
+        idp.private_keys["initial"],
+        algorithm="RS256",
+        headers={"kid": "current"},
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        await deps.get_current_user(session=db, authorization=f"Bearer {token}")
+    assert exc_info.value.status_code == 403
@@ -1,35 +1,82 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
 from fastapi import HTTPException, status
 from fastapi.security.utils import get_authorization_scheme_param
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.pool import StaticPool
 
 import app.services.users as users_service
-from app.api.deps import AuthorizationDep, get_current_user, get_db
+from app.api.deps import AuthorizationDep, get_async_db, get_current_user, get_db
 from app.core.config import settings
+from app.core.current_inquiry_cache import current_inquiry_cache
 from app.core.db import init_db
 from app.main import app
-from app.models import Inquiry, Schedule, User
+from app.models import (
+    Inquiry,
+    InquiryHistory,
+    NotificationRun,
+    Response,
+    ResponseRollup,
+    Schedule,
+    ScheduleOccurrence,
+    User,
+)
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(name="db_url", scope="session")
+def db_url_fixture(tmp_path_factory: pytest.TempPathFactory) -> str:
+    # A file, not sqlite://, so the sync and async engines share one database
+    return f"{tmp_path_factory.mktemp('db') / 'test.db'}"
 
 
 @pytest.fixture(name="db", scope="session")
-def session_fixture() -> Generator[Session, None, None]:
+def session_fixture(db_url: str) -> Generator[Session, None, None]:
     engine = create_engine(
-        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        f"sqlite:///{db_url}",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
     )
     SQLModel.metadata.create_all(engine)
     with Session(engine) as session:
         yield session
 
 
+@pytest.fixture(name="async_engine", scope="session")
+def async_engine_fixture(db_url: str) -> AsyncEngine:
+    # A new connection per use, as the TestClient runs each request on its own
+    # event loop
+    return create_async_engine(f"sqlite+aiosqlite:///{db_url}", poolclass=NullPool)
+
+
+@pytest.fixture(name="async_db")
+async def async_session_fixture(
+    async_engine: AsyncEngine,
+) -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
 @pytest.fixture(name="client", scope="session")
-def client_fixture(db: Session) -> Generator[TestClient, None, None]:
+def client_fixture(
+    db: Session, async_engine: AsyncEngine
+) -> Generator[TestClient, None, None]:
     def get_db_override() -> Session:
         return db
 
+    async def get_async_db_override() -> AsyncGenerator[AsyncSession, None]:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
     def get_current_user_override(authorization: AuthorizationDep) -> User:
         _scheme, token = get_authorization_scheme_param(authorization)
         user = users_service.get_user_by_email(session=db, email=token)
@@ -40,6 +87,7 @@ def client_fixture(db: Session) -> Generator[TestClient, None, None]:
         return user
 
     app.dependency_overrides[get_db] = get_db_override
+    app.dependency_overrides[get_async_db] = get_async_db_override
     app.dependency_overrides[get_current_user] = get_current_user_override
     init_db(db)
     client = TestClient(app)
@@ -51,13 +99,22 @@ def client_fixture(db: Session) -> Generator[TestClient, None, None]:
 @pytest.fixture(scope="function", autouse=True)
 def clear_tables_after_tests(db: Session) -> Generator[None, None, None]:
     yield
-    tables_to_clear = [Inquiry, Schedule]
+    tables_to_clear = [
+        Response,
+        ResponseRollup,
+        InquiryHistory,
+        NotificationRun,
+        Inquiry,
+        Schedule,
+        ScheduleOccurrence,
+    ]
     for table in tables_to_clear:
         statement = select(table)
         results = db.exec(statement).all()
         for record in results:
             db.delete(record)
     db.commit()
+    current_inquiry_cache.invalidate()
 
 
 @pytest.fixture(scope="module")
@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlmodel import create_engine
+
+from app.core.db import InstrumentedQueuePool, get_pool_stats
+
+
+def test_instrumented_pool_should_record_checkouts() -> None:
+    engine = create_engine(
+        "sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0
+    )
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        stats = get_pool_stats("test", engine)
+        assert stats.checked_out == 1
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    stats = get_pool_stats("test", engine)
+    assert stats.size == 1
+    assert stats.checked_out == 0
+    assert stats.checked_in == 1
+    assert stats.checkouts == 2
+    assert stats.checkout_timeouts == 0
+    assert stats.checkout_wait_seconds_max <= stats.checkout_wait_seconds_total
+
+
+def test_instrumented_pool_when_exhausted_should_record_timeout() -> None:
+    engine = create_engine(
+        "sqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    stats = get_pool_stats("test", engine)
+    assert stats.checkout_timeouts == 1
+    assert stats.checkout_wait_seconds_max >= 0.01
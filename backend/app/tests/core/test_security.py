@@ -0,0 +1,84 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.tests.utils.oidc import ISSUER, FakeIdP
+
+
+@pytest.mark.anyio
+async def test_oidc_discovery_should_load_lazily_on_first_use() -> None:
+    idp = FakeIdP()
+    discovery = idp.discovery()
+    assert not discovery.loaded
+    assert idp.requests == []
+    key = await discovery.get_signing_key("initial")
+    assert key is not None
+    assert discovery.algorithms == ["RS256"]
+    well_known = await discovery.get_well_known()
+    assert well_known["token_endpoint"] == f"{ISSUER}/token"
+    assert idp.requests == ["/.well-known/openid-configuration", "/jwks"]
+
+
+@pytest.mark.anyio
+async def test_oidc_discovery_when_kid_unknown_should_refresh_and_find_rotated_key() -> (
+    None
+):
+    idp = FakeIdP()
+    discovery = idp.discovery(min_refresh_interval=0)
+    await discovery.refresh()
+    idp.add_key("rotated")
+    assert discovery.signing_keys.keys() == {"initial"}
+    key = await discovery.get_signing_key("rotated")
+    assert key is not None
+    assert key.key_id == "rotated"
+
+
+@pytest.mark.anyio
+async def test_oidc_discovery_when_kid_unknown_should_rate_limit_refreshes() -> None:
+    idp = FakeIdP()
+    discovery = idp.discovery(min_refresh_interval=60)
+    await discovery.refresh()
+    requests_after_load = len(idp.requests)
+    for _ in range(5):
+        assert await discovery.get_signing_key("missing") is None
+    assert len(idp.requests) == requests_after_load
+
+
+@pytest.mark.anyio
+async def test_oidc_discovery_when_idp_unavailable_should_warm_start_from_snapshot(
+    tmp_path: Path,
+) -> None:
+    snapshot_path = str(tmp_path / "oidc.json")
+    idp = FakeIdP()
+    await idp.discovery(snapshot_path=snapshot_path).refresh()
+    idp.available = False
+    discovery = idp.discovery(snapshot_path=snapshot_path)
+    assert discovery.load_snapshot()
+    assert await discovery.get_signing_key("initial") is not None
+    assert discovery.algorithms == ["RS256"]
+
+
+@pytest.mark.anyio
+async def test_oidc_discovery_when_idp_unavailable_should_not_find_keys() -> None:
+    idp = FakeIdP()
+    idp.available = False
+    discovery = idp.discovery()
+    assert await discovery.get_signing_key("initial") is None
+    with pytest.raises(RuntimeError):
+        await discovery.get_well_known()
+
+
+@pytest.mark.anyio
+async def test_oidc_discovery_should_not_leave_temporary_snapshot_files(
+    tmp_path: Path,
+) -> None:
+    snapshot_path = tmp_path / "oidc.json"
+    idp = FakeIdP()
+    # Workers refreshing at once each write their own temporary file
+    await asyncio.gather(
+        *(idp.discovery(snapshot_path=str(snapshot_path)).refresh() for _ in range(3))
+    )
+    assert [path.name for path in tmp_path.iterdir()] == ["oidc.json"]
+    discovery = idp.discovery(snapshot_path=str(snapshot_path))
+    assert discovery.load_snapshot()
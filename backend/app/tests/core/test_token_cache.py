@@ -0,0 +1,90 @@
+import time
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+import app.services.users as users_service
+from app.core.config import settings
+from app.core.token_cache import TokenCache, attach_user
+from app.models import User
+
+
+def _superuser(db: Session) -> User:
+    user = users_service.get_user_by_email(session=db, email=settings.FIRST_SUPERUSER)
+    assert user
+    return user
+
+
+def test_token_cache_when_token_cached_should_return_claims_and_user(
+    db: Session,
+) -> None:
+    cache = TokenCache(maxsize=10, ttl_seconds=60)
+    user = _superuser(db)
+    claims = {"email": user.email, "exp": time.time() + 60}
+    cache.put("token", claims, user)
+    entry = cache.get("token")
+    assert entry
+    assert entry.claims == claims
+    assert entry.user.id == user.id
+    assert cache.get("other-token") is None
+
+
+def test_token_cache_when_token_expired_should_return_none(db: Session) -> None:
+    cache = TokenCache(maxsize=10, ttl_seconds=60)
+    user = _superuser(db)
+    cache.put("expired", {"exp": time.time() - 1}, user)
+    assert cache.get("expired") is None
+    cache.put("expiring", {"exp": time.time() + 0.05}, user)
+    assert cache.get("expiring")
+    time.sleep(0.1)
+    assert cache.get("expiring") is None
+
+
+def test_token_cache_when_full_should_evict_least_recently_used(
+    db: Session,
+) -> None:
+    cache = TokenCache(maxsize=2, ttl_seconds=60)
+    user = _superuser(db)
+    cache.put("first", {}, user)
+    cache.put("second", {}, user)
+    assert cache.get("first")
+    cache.put("third", {}, user)
+    assert len(cache) == 2
+    assert cache.get("first")
+    assert cache.get("second") is None
+    assert cache.get("third")
+
+
+def test_token_cache_when_user_invalidated_should_drop_user_entries(
+    db: Session,
+) -> None:
+    cache = TokenCache(maxsize=10, ttl_seconds=60)
+    user = _superuser(db)
+    cache.put("first", {}, user)
+    cache.put("second", {}, user)
+    cache.invalidate_user(user.id)
+    assert cache.get("first") is None
+    assert cache.get("second") is None
+
+
+def test_attach_user_should_not_query_database(db: Session) -> None:
+    cache = TokenCache(maxsize=10, ttl_seconds=60)
+    user = _superuser(db)
+    cache.put("token", {}, user)
+    entry = cache.get("token")
+    assert entry
+    statements: list[str] = []
+
+    def _record(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        with Session(engine) as session:
+            attached = attach_user(session, entry)
+            assert attached.email == user.email
+            assert attached in session
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    assert statements == []
@@ -1,9 +1,11 @@
 import pytest
 from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session
+from sqlmodel import Session, select
 
+from app.models import InquiryHistory
 from app.models.inquiry import MAX_LENGTH, MIN_LENGTH, InquiryCreate
+from app.models.inquiry_history import ActionType
 from app.services.inquiries import create_inquiry
 
 
@@ -67,3 +69,30 @@ def test_inquiry_service_create_should_not_create_inquiry_when_inquiry_already_e
         create_inquiry(session=db, inquiry_in=inquiry_data)
 
     db.rollback()
+
+
+def test_inquiry_service_create_should_record_create_history(db: Session) -> None:
+    inquiry_data = InquiryCreate(
+        text="Audited Inquiry", theme_id=None, first_scheduled=None
+    )
+    result = create_inquiry(session=db, inquiry_in=inquiry_data, user_id=1)
+    history = db.exec(
+        select(InquiryHistory).where(InquiryHistory.inquiry_id == result.id)
+    ).one()
+    assert history.action == ActionType.CREATE
+    assert history.user_id == 1
+    assert history.new_data["id"] == result.id
+    assert history.new_data["text"] == "Audited Inquiry"
+
+
+def test_inquiry_service_create_when_insert_fails_should_not_record_history(
+    db: Session,
+) -> None:
+    inquiry_data = InquiryCreate(
+        text="Repeated Inquiry", theme_id=None, first_scheduled=None
+    )
+    create_inquiry(session=db, inquiry_in=inquiry_data)
+    with pytest.raises(IntegrityError):
+        create_inquiry(session=db, inquiry_in=inquiry_data)
+    db.rollback()
+    assert len(db.exec(select(InquiryHistory)).all()) == 1
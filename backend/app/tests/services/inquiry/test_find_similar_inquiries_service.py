@@ -0,0 +1,35 @@
+import pytest
+from sqlmodel import Session
+
+from app.models import Inquiry
+from app.services.inquiries import _similarity, _trigrams, find_similar_inquiries
+
+
+def test_trigram_similarity_should_match_pg_trgm() -> None:
+    # SELECT similarity('word', 'two words') returns 0.36363637
+    score = _similarity(_trigrams("word"), _trigrams("two words"))
+    assert score == pytest.approx(0.36363637)
+
+
+def test_find_similar_inquiries_should_return_matches_above_threshold_best_first(
+    db: Session,
+) -> None:
+    inquiries = [
+        Inquiry(text="How clear were the goals for this sprint?"),
+        Inquiry(text="How clear were the goals of this sprint?"),
+        Inquiry(text="What did you have for lunch today?"),
+    ]
+    db.add_all(inquiries)
+    db.commit()
+    similar = find_similar_inquiries(
+        session=db, text="How clear were the goals for the sprint?", threshold=0.5
+    )
+    assert [match.id for match in similar] == [inquiries[0].id, inquiries[1].id]
+    assert similar[0].similarity > similar[1].similarity >= 0.5
+
+
+def test_find_similar_inquiries_when_limit_is_negative_should_raise_value_error(
+    db: Session,
+) -> None:
+    with pytest.raises(ValueError):
+        find_similar_inquiries(session=db, text="Anything at all", limit=-1)
@@ -1,8 +1,9 @@
 import pytest
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models import Inquiry
-from app.services.inquiries import get_inquiry_by_id
+from app.models import Inquiry, InquiryPublic
+from app.services.inquiries import get_inquiry_by_id, get_inquiry_by_id_async
 from app.tests.utils.utils import bad_integer_id
 
 
@@ -29,3 +30,22 @@ def test_getInquiryService_whenCalledWithNonExistentId_shouldReturnNone(
     non_existent_id = bad_integer_id
     result = get_inquiry_by_id(session=db, inquiry_id=non_existent_id)
     assert result is None
+
+
+@pytest.mark.anyio
+async def test_getInquiryAsyncService_shouldMatchGetInquiry(
+    db: Session, async_db: AsyncSession, single_inquiry: Inquiry
+) -> None:
+    result = await get_inquiry_by_id_async(
+        session=async_db, inquiry_id=single_inquiry.id
+    )
+    expected = get_inquiry_by_id(session=db, inquiry_id=single_inquiry.id)  # type: ignore
+    assert result is not None
+    # The theme is loaded up front, so serializing needs no lazy load
+    assert InquiryPublic.model_validate(result) == InquiryPublic.model_validate(
+        expected
+    )
+    assert (
+        await get_inquiry_by_id_async(session=async_db, inquiry_id=bad_integer_id)
+        is None
+    )
@@ -1,6 +1,8 @@
+import pytest
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.services.schedule import get_schedule
+from app.services.schedule import get_schedule, get_schedule_async
 from app.tests.utils.schedule_utils import (
     create_first_schedule,
     create_second_schedule,
@@ -39,3 +41,12 @@ def test_get_schedule_service_when_two_schedules_added_exists_should_return_late
     assert result
     assert result.id == first_id
     assert result.schedule.model_dump_json() == second_schedule_string
+
+
+@pytest.mark.anyio
+async def test_get_schedule_async_service_should_match_get_schedule(
+    db: Session, async_db: AsyncSession
+) -> None:
+    assert await get_schedule_async(session=async_db) is None
+    create_first_schedule(db)
+    assert await get_schedule_async(session=async_db) == get_schedule(session=db)
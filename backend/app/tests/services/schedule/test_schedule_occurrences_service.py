@@ -0,0 +1,95 @@
+from datetime import date
+
+from sqlmodel import Session, delete, select
+
+from app.core.config import settings
+from app.models import Schedule, ScheduleCreate, ScheduleInfo, ScheduleOccurrence
+from app.services.schedule import (
+    _occurrence_changes,
+    _occurrence_writes,
+    create_schedule,
+    get_schedule,
+    update_scheduled_inquiries,
+)
+from app.services.schedule_projection import ScheduleProjection
+from app.tests.utils.queries import record_queries
+
+running_schedule = ScheduleInfo(
+    startDate="2024-01-03",
+    endDate=None,
+    daysBetween=2,
+    skipWeekends=True,
+    skipHolidays=True,
+    timesOfDay=["09:30"],
+)
+
+
+def test_update_scheduled_inquiries_service_should_match_projection(
+    db: Session,
+) -> None:
+    create_schedule(session=db, schedule_in=ScheduleCreate(schedule=running_schedule))
+    result = update_scheduled_inquiries(session=db, scheduled_inquiries=[4, 5, 6])
+    projection = ScheduleProjection(running_schedule)
+    past = projection.first_due_on_or_after(date.today())
+    expected_inquiries = [[4, 5, 6][(past + i) % 3] for i in range(3)]
+    expected_dates = [
+        f"{projection.occurrence(past + i).isoformat()}T09:30:00" for i in range(3)
+    ]
+    assert result.scheduled_inquiries_and_dates.inquiries == expected_inquiries
+    assert result.scheduled_inquiries_and_dates.dates == expected_dates
+    occurrences = db.exec(select(ScheduleOccurrence)).all()
+    assert len(occurrences) == 3 + settings.SCHEDULE_OCCURRENCE_LOOKAHEAD
+
+
+def test_update_scheduled_inquiries_service_should_only_update_changed_rows(
+    db: Session,
+) -> None:
+    create_schedule(session=db, schedule_in=ScheduleCreate(schedule=running_schedule))
+    update_scheduled_inquiries(session=db, scheduled_inquiries=[4, 5, 6])
+    with record_queries(db) as queries:
+        update_scheduled_inquiries(session=db, scheduled_inquiries=[4, 7, 6])
+    writes = [query for query in queries if "schedule_occurrence" in query]
+    writes = [query for query in writes if not query.startswith("SELECT")]
+    occurrences = db.exec(select(ScheduleOccurrence)).all()
+    # One upsert carrying only the occurrences whose inquiry changed
+    assert len(writes) == 1
+    assert "ON CONFLICT" in writes[0]
+    assert writes[0].count("(?, ?, ?, ?)") == len(
+        [o for o in occurrences if o.inquiry_id == 7]
+    )
+    assert {o.inquiry_id for o in occurrences} == {4, 7, 6}
+
+
+def test_get_schedule_service_when_occurrences_are_missing_should_refill_them(
+    db: Session,
+) -> None:
+    create_schedule(session=db, schedule_in=ScheduleCreate(schedule=running_schedule))
+    expected = update_scheduled_inquiries(session=db, scheduled_inquiries=[4, 5])
+    db.exec(delete(ScheduleOccurrence))  # type: ignore[call-overload]
+    db.commit()
+    result = get_schedule(session=db)
+    assert result
+    assert (
+        result.scheduled_inquiries_and_dates == expected.scheduled_inquiries_and_dates
+    )
+    assert db.exec(select(ScheduleOccurrence)).first()
+
+
+def test_sync_occurrences_when_another_worker_refilled_them_should_not_conflict(
+    db: Session,
+) -> None:
+    create_schedule(session=db, schedule_in=ScheduleCreate(schedule=running_schedule))
+    update_scheduled_inquiries(session=db, scheduled_inquiries=[4, 5])
+    db_schedule = db.exec(select(Schedule)).one()
+    expected = db.exec(select(ScheduleOccurrence)).all()
+    db.exec(delete(ScheduleOccurrence))  # type: ignore[call-overload]
+    db.commit()
+    # Two workers both found the table empty, and the first one has already
+    # written the occurrences when the second one writes the same sequences
+    stale, changed = _occurrence_changes(db_schedule, [])
+    for _ in range(2):
+        for statement in _occurrence_writes(db, stale, changed):
+            db.execute(statement)
+        db.commit()
+    occurrences = db.exec(select(ScheduleOccurrence)).all()
+    assert [o.model_dump() for o in occurrences] == [o.model_dump() for o in expected]
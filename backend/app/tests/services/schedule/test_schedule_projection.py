@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+
+import holidays
+import pytest
+
+from app.models import ScheduleInfo
+from app.services.schedule_projection import (
+    HolidayCalendar,
+    ScheduleProjection,
+    get_projection,
+)
+
+
+def _schedule(
+    start: str, days_between: int, skip_weekends: bool, skip_holidays: bool
+) -> ScheduleInfo:
+    return ScheduleInfo(
+        startDate=start,
+        endDate=None,
+        daysBetween=days_between,
+        skipWeekends=skip_weekends,
+        skipHolidays=skip_holidays,
+        timesOfDay=["08:00"],
+    )
+
+
+def _walk(schedule: ScheduleInfo, today: date, count: int) -> tuple[int, list[date]]:
+    # Day-by-day walk the projection replaces
+    def skip(current: date) -> date:
+        if schedule.skipWeekends:
+            while current.weekday() in [5, 6]:
+                current += timedelta(days=1)
+        if schedule.skipHolidays:
+            while current in holidays.country_holidays("US"):
+                current += timedelta(days=1)
+        return current
+
+    current = date.fromisoformat(schedule.startDate)
+    past = 0
+    while current < today:
+        current = skip(current) + timedelta(days=schedule.daysBetween)
+        past += 1
+    dates = []
+    for _ in range(count):
+        current = skip(current)
+        dates.append(current)
+        current += timedelta(days=schedule.daysBetween)
+    return past, dates
+
+
+@pytest.mark.parametrize("days_between", [1, 2, 3, 7])
+@pytest.mark.parametrize(
+    "skip_weekends,skip_holidays", [(False, False), (True, False), (True, True)]
+)
+def test_schedule_projection_when_compared_to_day_by_day_walk_should_match(
+    days_between: int, skip_weekends: bool, skip_holidays: bool
+) -> None:
+    schedule = _schedule("2023-12-20", days_between, skip_weekends, skip_holidays)
+    projection = ScheduleProjection(schedule)
+    for offset in range(-3, 60, 4):
+        today = date(2024, 1, 1) + timedelta(days=offset)
+        past, dates = _walk(schedule, today, 5)
+        assert projection.first_due_on_or_after(today) == past
+        assert [projection.occurrence(past + i) for i in range(5)] == dates
+
+
+def test_schedule_projection_when_started_years_ago_should_jump_to_today() -> None:
+    schedule = _schedule("2000-01-03", 1, False, False)
+    projection = ScheduleProjection(schedule)
+    assert (
+        projection.first_due_on_or_after(date(2024, 10, 2))
+        == (date(2024, 10, 2) - date(2000, 1, 3)).days
+    )
+    assert projection.occurrence(1) == date(2000, 1, 4)
+
+
+def test_get_projection_when_schedule_unchanged_should_return_cached_projection() -> (
+    None
+):
+    schedule = _schedule("2024-10-02", 2, True, False).model_dump_json()
+    assert get_projection(schedule) is get_projection(schedule)
+    changed = _schedule("2024-10-02", 3, True, False).model_dump_json()
+    assert get_projection(changed) is not get_projection(schedule)
+
+
+def test_holiday_calendar_when_day_is_a_holiday_should_report_it() -> None:
+    calendar = HolidayCalendar("US")
+    assert calendar.is_holiday(date(2024, 12, 25).toordinal())
+    assert not calendar.is_holiday(date(2024, 12, 24).toordinal())
+    assert calendar.is_holiday(date(2031, 1, 1).toordinal())
+
+
+def test_schedule_projection_when_country_is_configured_should_skip_its_holidays() -> (
+    None
+):
+    # 2024-07-01 is Canada Day, 2024-07-04 is Independence Day
+    us = ScheduleProjection(_schedule("2024-07-01", 3, False, True))
+    canada = ScheduleProjection(
+        _schedule("2024-07-01", 3, False, True).model_copy(
+            update={"holidayCountry": "CA"}
+        )
+    )
+    assert [us.occurrence(i) for i in range(2)] == [
+        date(2024, 7, 1),
+        date(2024, 7, 5),
+    ]
+    assert [canada.occurrence(i) for i in range(2)] == [
+        date(2024, 7, 2),
+        date(2024, 7, 5),
+    ]
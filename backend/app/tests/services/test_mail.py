@@ -0,0 +1,221 @@
+import asyncio
+import smtplib
+import threading
+from collections.abc import Sequence
+from email.message import Message
+
+import pytest
+
+from app.services.mail import MailDispatcher, OutgoingEmail
+
+
+class FakeSMTP(smtplib.SMTP):
+    """
+    Records sent messages instead of talking to a server. ``failures`` are
+    raised, in order, by the next sends. Each send first waits on ``barrier``,
+    if given.
+    """
+
+    def __init__(
+        self, failures: list[Exception], barrier: threading.Barrier | None = None
+    ) -> None:
+        super().__init__()
+        self.failures = failures
+        self.barrier = barrier
+        self.sent: list[Message] = []
+        self.closed = False
+
+    def send_message(
+        self,
+        msg: Message,
+        from_addr: str | None = None,
+        to_addrs: str | Sequence[str] | None = None,
+        mail_options: Sequence[str] = (),
+        rcpt_options: Sequence[str] = (),
+    ) -> dict[str, tuple[int, bytes]]:
+        if self.barrier is not None:
+            self.barrier.wait()
+        if self.failures:
+            raise self.failures.pop(0)
+        self.sent.append(msg)
+        return {}
+
+    def quit(self) -> tuple[int, bytes]:
+        self.closed = True
+        return (221, b"Bye")
+
+
+@pytest.fixture(name="connections")
+def fixture_connections() -> list[FakeSMTP]:
+    return []
+
+
+def _dispatcher(
+    connections: list[FakeSMTP],
+    failures: list[Exception] | None = None,
+    max_size: int = 10,
+    batch_size: int = 2,
+    flush_interval: float = 1,
+    pool_size: int = 1,
+    barrier: threading.Barrier | None = None,
+) -> MailDispatcher:
+    shared_failures = failures if failures is not None else []
+
+    def connect() -> smtplib.SMTP:
+        connections.append(FakeSMTP(shared_failures, barrier))
+        return connections[-1]
+
+    return MailDispatcher(
+        smtp_factory=connect,
+        max_size=max_size,
+        batch_size=batch_size,
+        max_retries=2,
+        retry_backoff=0,
+        flush_interval=flush_interval,
+        connections=pool_size,
+    )
+
+
+def _email(i: int = 0) -> OutgoingEmail:
+    return OutgoingEmail(
+        email_to=f"user{i}@example.com", subject="Hello", html_content="<p>Hi</p>"
+    )
+
+
+def test_mail_dispatcher_should_send_batches_over_one_connection(
+    connections: list[FakeSMTP],
+) -> None:
+    dispatcher = _dispatcher(connections)
+    for i in range(5):
+        assert dispatcher.enqueue(_email(i))
+    assert dispatcher.send_pending() == 5
+    assert len(connections) == 1
+    assert [msg["To"] for msg in connections[0].sent] == [
+        f"user{i}@example.com" for i in range(5)
+    ]
+    assert connections[0].sent[0].get_content_type() == "text/html"
+    assert len(dispatcher) == 0
+
+
+def test_mail_dispatcher_when_disconnected_should_reconnect_and_resend(
+    connections: list[FakeSMTP],
+) -> None:
+    dispatcher = _dispatcher(connections)
+    dispatcher.enqueue(_email())
+    dispatcher.send_pending()
+    connections[0].failures.append(smtplib.SMTPServerDisconnected())
+    dispatcher.enqueue(_email(1))
+    assert dispatcher.send_pending() == 1
+    assert len(connections) == 2
+    assert [msg["To"] for msg in connections[1].sent] == ["user1@example.com"]
+
+
+def test_mail_dispatcher_when_send_fails_should_retry_then_drop(
+    connections: list[FakeSMTP],
+) -> None:
+    failures: list[Exception] = [
+        smtplib.SMTPResponseException(451, b"Try again later")
+    ] * 3
+    dispatcher = _dispatcher(connections, failures)
+    dispatcher.enqueue(_email())
+    # First attempt and two retries all fail
+    assert dispatcher.send_pending() == 0
+    assert len(dispatcher) == 0
+    assert failures == []
+
+
+def test_mail_dispatcher_when_failure_is_temporary_should_send_on_retry(
+    connections: list[FakeSMTP],
+) -> None:
+    failures: list[Exception] = [smtplib.SMTPResponseException(451, b"Busy")]
+    dispatcher = _dispatcher(connections, failures)
+    dispatcher.enqueue(_email())
+    assert dispatcher.send_pending() == 1
+    assert len(connections[0].sent) == 1
+
+
+def test_mail_dispatcher_when_failure_is_permanent_should_not_retry(
+    connections: list[FakeSMTP],
+) -> None:
+    failures: list[Exception] = [
+        smtplib.SMTPResponseException(550, b"No such user"),
+        smtplib.SMTPResponseException(550, b"No such user"),
+    ]
+    dispatcher = _dispatcher(connections, failures)
+    dispatcher.enqueue(_email())
+    assert dispatcher.send_pending() == 0
+    assert len(failures) == 1
+
+
+def test_mail_dispatcher_should_wait_for_backoff_before_retrying(
+    connections: list[FakeSMTP],
+) -> None:
+    failures: list[Exception] = [smtplib.SMTPResponseException(451, b"Busy")]
+    dispatcher = _dispatcher(connections, failures)
+    dispatcher.retry_backoff = 60
+    dispatcher.enqueue(_email())
+    assert dispatcher.send_pending() == 0
+    assert len(dispatcher) == 1
+
+
+def test_mail_dispatcher_when_full_should_refuse_emails(
+    connections: list[FakeSMTP],
+) -> None:
+    dispatcher = _dispatcher(connections, max_size=1)
+    assert dispatcher.enqueue(_email())
+    assert not dispatcher.enqueue(_email(1))
+
+
+@pytest.mark.anyio
+async def test_mail_dispatcher_close_should_send_and_quit(
+    connections: list[FakeSMTP],
+) -> None:
+    dispatcher = _dispatcher(connections)
+    dispatcher.enqueue(_email())
+    await dispatcher.close()
+    assert len(connections[0].sent) == 1
+    assert connections[0].closed
+
+
+@pytest.mark.anyio
+async def test_mail_dispatcher_when_enqueued_from_thread_should_wake_run(
+    connections: list[FakeSMTP],
+) -> None:
+    dispatcher = _dispatcher(connections, flush_interval=60)
+    task = asyncio.create_task(dispatcher.run())
+    await asyncio.sleep(0)
+    # As a sync route does, from another thread while the loop is idle
+    timer = threading.Timer(0.05, dispatcher.enqueue, args=(_email(),))
+    timer.start()
+    try:
+        # The enqueue must wake the loop for the email to be sent during this
+        # sleep, long before the flush interval
+        await asyncio.sleep(0.5)
+        timer.join()
+        assert len(connections) == 1
+        assert len(connections[0].sent) == 1
+    finally:
+        task.cancel()
+
+
+@pytest.mark.anyio
+async def test_mail_dispatcher_run_should_send_over_each_pooled_connection(
+    connections: list[FakeSMTP],
+) -> None:
+    # Each send waits for one on another connection, so both emails are only
+    # sent if two connections send at once
+    barrier = threading.Barrier(2, timeout=5)
+    dispatcher = _dispatcher(connections, batch_size=1, pool_size=2, barrier=barrier)
+    task = asyncio.create_task(dispatcher.run())
+    await asyncio.sleep(0)
+    dispatcher.enqueue(_email())
+    dispatcher.enqueue(_email(1))
+    try:
+        for _ in range(50):
+            if sum(len(connection.sent) for connection in connections) == 2:
+                break
+            await asyncio.sleep(0.1)
+        assert [len(connection.sent) for connection in connections] == [1, 1]
+        assert not barrier.broken
+    finally:
+        task.cancel()
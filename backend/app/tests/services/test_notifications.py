@@ -0,0 +1,230 @@
+import asyncio
+import smtplib
+from collections.abc import Sequence
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlmodel import Session, col, select
+
+import app.services.inquiries as inquiries_service
+import app.services.schedule as schedule_service
+import app.services.users as users_service
+from app.models import InquiryCreate, NotificationRun, User, UserCreate
+from app.services.mail import MailDispatcher
+from app.services.notifications import (
+    EmailChannel,
+    Notification,
+    Recipient,
+    fan_out,
+    send_due_notifications,
+)
+from app.tests.utils.schedule_utils import create_first_schedule
+from app.tests.utils.utils import random_email, random_lower_string
+
+
+class RecordingChannel:
+    """
+    Records the recipients of each chunk and how many chunks were being
+    delivered at once.
+    """
+
+    def __init__(self, fail_first: bool = False) -> None:
+        self.fail_first = fail_first
+        self.chunks: list[list[int]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send(
+        self, _notification: Notification, recipients: Sequence[Recipient]
+    ) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if self.fail_first and not self.chunks:
+            self.chunks.append([])
+            raise RuntimeError("webhook is down")
+        self.chunks.append([recipient.id for recipient in recipients])
+
+
+def _active_user_ids(db: Session) -> list[int]:
+    statement = select(col(User.id)).where(col(User.is_active)).order_by(col(User.id))
+    return [user_id for user_id in db.exec(statement).all() if user_id is not None]
+
+
+def _schedule_inquiries(db: Session) -> list[int]:
+    create_first_schedule(db)
+    inquiries = [
+        inquiries_service.create_inquiry(
+            session=db,
+            inquiry_in=InquiryCreate(
+                text=random_lower_string(), theme_id=None, first_scheduled=None
+            ),
+        )
+        for _ in range(2)
+    ]
+    ids = [inquiry.id for inquiry in inquiries if inquiry.id is not None]
+    schedule_service.update_scheduled_inquiries(session=db, scheduled_inquiries=ids)
+    return ids
+
+
+def _notification() -> Notification:
+    return Notification(inquiry_id=1, inquiry_text="How are you?", link="http://x")
+
+
+def test_get_inquiry_held_on_should_follow_schedule(db: Session) -> None:
+    first, second = _schedule_inquiries(db)
+    # The first schedule starts on 2024-10-02 and runs daily until 2024-11-01
+    assert (
+        schedule_service.get_inquiry_held_on(session=db, day=date(2024, 10, 2)) == first
+    )
+    assert (
+        schedule_service.get_inquiry_held_on(session=db, day=date(2024, 10, 3))
+        == second
+    )
+    assert (
+        schedule_service.get_inquiry_held_on(session=db, day=date(2024, 10, 1)) is None
+    )
+    assert (
+        schedule_service.get_inquiry_held_on(session=db, day=date(2024, 11, 2)) is None
+    )
+
+
+@pytest.mark.anyio
+async def test_fan_out_should_notify_every_active_user_once(db: Session) -> None:
+    for i in range(5):
+        users_service.create_user(
+            session=db,
+            user_create=UserCreate(
+                email=random_email(), password=random_lower_string(), is_active=i != 0
+            ),
+        )
+    channel = RecordingChannel()
+    count = await fan_out(
+        notification=_notification(),
+        channels=[channel],
+        session_factory=lambda: Session(db.get_bind()),
+        chunk_size=2,
+        concurrency=2,
+    )
+    active = _active_user_ids(db)
+    delivered = [user_id for chunk in channel.chunks for user_id in chunk]
+    assert count == len(active)
+    assert sorted(delivered) == active
+    assert all(len(chunk) <= 2 for chunk in channel.chunks)
+    assert channel.max_in_flight <= 2
+
+
+@pytest.mark.anyio
+async def test_fan_out_when_chunk_fails_should_deliver_the_rest(db: Session) -> None:
+    channel = RecordingChannel(fail_first=True)
+    count = await fan_out(
+        notification=_notification(),
+        channels=[channel],
+        session_factory=lambda: Session(db.get_bind()),
+        chunk_size=1,
+        concurrency=1,
+    )
+    assert count == len(_active_user_ids(db))
+    assert len(channel.chunks) == count
+    assert channel.chunks[0] == []
+
+
+@pytest.mark.anyio
+async def test_fan_out_should_not_hold_a_transaction_while_delivering(
+    db: Session,
+) -> None:
+    sessions: list[Session] = []
+
+    def session_factory() -> Session:
+        sessions.append(Session(db.get_bind()))
+        return sessions[-1]
+
+    class CheckingChannel(RecordingChannel):
+        async def send(
+            self, notification: Notification, recipients: Sequence[Recipient]
+        ) -> None:
+            assert not any(session.in_transaction() for session in sessions)
+            await super().send(notification, recipients)
+
+    channel = CheckingChannel()
+    count = await fan_out(
+        notification=_notification(),
+        channels=[channel],
+        session_factory=session_factory,
+        chunk_size=1,
+        concurrency=2,
+    )
+    assert len(channel.chunks) == count
+    # One read per chunk, and one more that found no users left
+    assert len(sessions) == count + 1
+
+
+@pytest.mark.anyio
+async def test_email_channel_should_queue_one_email_per_recipient() -> None:
+    def connect() -> smtplib.SMTP:
+        raise AssertionError("emails should only be queued")
+
+    dispatcher = MailDispatcher(
+        smtp_factory=connect,
+        max_size=10,
+        batch_size=10,
+        max_retries=0,
+        retry_backoff=0,
+        flush_interval=0,
+        connections=1,
+    )
+    recipients = [
+        Recipient(id=1, email="a@example.com", full_name="Ada"),
+        Recipient(id=2, email="b@example.com", full_name=None),
+    ]
+    await EmailChannel(dispatcher).send(_notification(), recipients)
+    assert len(dispatcher) == 2
+    first, second = dispatcher._take()
+    assert first.email_to == "a@example.com"
+    assert "Hi Ada" in first.html_content
+    assert "How are you?" in first.html_content
+    assert "Hi b@example.com" in second.html_content
+
+
+@pytest.mark.anyio
+async def test_send_due_notifications_should_send_each_time_once(
+    db: Session,
+) -> None:
+    _first, second = _schedule_inquiries(db)
+    channel = RecordingChannel()
+    now = datetime(2024, 10, 3, 8, 5, tzinfo=timezone.utc)
+
+    def session_factory() -> Session:
+        return Session(db.get_bind())
+
+    sent = await send_due_notifications(
+        now=now, channels=[channel], session_factory=session_factory
+    )
+    assert sent == 1
+    run = db.exec(select(NotificationRun)).one()
+    assert run.inquiry_id == second
+    assert run.finished_at is not None
+    assert run.recipient_count == len(_active_user_ids(db))
+    # Another poll, or another worker, does not send it again
+    sent = await send_due_notifications(
+        now=now, channels=[channel], session_factory=session_factory
+    )
+    assert sent == 0
+
+
+@pytest.mark.anyio
+async def test_send_due_notifications_should_skip_times_not_due(db: Session) -> None:
+    _schedule_inquiries(db)
+    channel = RecordingChannel()
+    for now in (
+        datetime(2024, 10, 3, 7, 59, tzinfo=timezone.utc),
+        datetime(2024, 10, 3, 9, 0, tzinfo=timezone.utc),
+    ):
+        sent = await send_due_notifications(
+            now=now,
+            channels=[channel],
+            session_factory=lambda: Session(db.get_bind()),
+        )
+        assert sent == 0
+    assert channel.chunks == []
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import pytest
+from sqlmodel import Session, select
+
+from app.models import Inquiry
+from app.services.pagination import (
+    decode_time_cursor,
+    encode_cursor,
+    encode_time_cursor,
+    paginate,
+)
+from app.tests.utils.queries import record_queries
+
+
+@pytest.fixture(name="thirty_inquiries", scope="function")
+def fixture_thirty_inquiries(db: Session) -> list[Inquiry]:
+    inquiries = [Inquiry(text=f"Paginated inquiry #{i + 1}") for i in range(30)]
+    db.add_all(inquiries)
+    db.commit()
+    return inquiries
+
+
+def test_paginate_should_return_page_and_total_in_one_query(
+    db: Session, thirty_inquiries: list[Inquiry]
+) -> None:
+    statement = select(Inquiry)
+    with record_queries(db) as queries:
+        page = paginate(session=db, statement=statement, skip=10, limit=5)
+    assert len(queries) == 1
+    assert page.count == len(thirty_inquiries)
+    assert [item.id for item in page.items] == [i.id for i in thirty_inquiries[10:15]]
+
+
+def test_paginate_when_past_last_page_should_still_return_total(
+    db: Session, thirty_inquiries: list[Inquiry]
+) -> None:
+    page = paginate(session=db, statement=select(Inquiry), skip=100, limit=5)
+    assert page.items == []
+    assert page.count == len(thirty_inquiries)
+    assert page.next_cursor is None
+
+
+def test_paginate_when_table_is_empty_should_return_zero(db: Session) -> None:
+    with record_queries(db) as queries:
+        page = paginate(session=db, statement=select(Inquiry))
+    assert len(queries) == 1
+    assert page.items == []
+    assert page.count == 0
+
+
+def test_paginate_when_estimating_on_sqlite_should_fall_back_to_exact_count(
+    db: Session, thirty_inquiries: list[Inquiry]
+) -> None:
+    page = paginate(session=db, statement=select(Inquiry), limit=5, estimate_count=True)
+    assert page.count == len(thirty_inquiries)
+
+
+def test_paginate_when_skip_is_negative_should_raise_value_error(
+    db: Session,
+) -> None:
+    with pytest.raises(ValueError):
+        paginate(session=db, statement=select(Inquiry), skip=-1)
+
+
+def test_paginate_when_following_cursors_should_visit_every_row_once(
+    db: Session, thirty_inquiries: list[Inquiry]
+) -> None:
+    seen: list[int | None] = []
+    cursor = None
+    while True:
+        with record_queries(db) as queries:
+            page = paginate(
+                session=db, statement=select(Inquiry), limit=7, cursor=cursor
+            )
+        assert len(queries) == 1
+        assert page.count == len(thirty_inquiries)
+        seen.extend(item.id for item in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    assert seen == [inquiry.id for inquiry in thirty_inquiries]
+
+
+def test_paginate_when_cursor_is_invalid_should_raise_value_error(
+    db: Session,
+) -> None:
+    with pytest.raises(ValueError):
+        paginate(session=db, statement=select(Inquiry), cursor="not-a-cursor")
+
+
+def test_time_cursor_should_round_trip() -> None:
+    created_at = datetime(2024, 3, 1, 12, 30, 15, 250000)
+    assert decode_time_cursor(encode_time_cursor(created_at, 7)) == (created_at, 7)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(7)])
+def test_decode_time_cursor_when_cursor_is_invalid_should_raise_value_error(
+    cursor: str,
+) -> None:
+    with pytest.raises(ValueError):
+        decode_time_cursor(cursor)
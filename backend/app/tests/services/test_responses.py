@@ -0,0 +1,132 @@
+import asyncio
+from collections.abc import Sequence
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, col, select
+
+import app.services.responses as responses_service
+from app.core.config import settings
+from app.models import Inquiry, Response, ResponseSubmit, User
+from app.services.responses import PendingResponse, ResponseBuffer
+
+
+def _pending(key: str | None = None) -> PendingResponse:
+    return PendingResponse(
+        user_id=1,
+        submission=ResponseSubmit(inquiry_id=1, rating=5),
+        idempotency_key=key,
+    )
+
+
+def test_response_buffer_when_flush_fails_should_keep_responses(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(**_kwargs: object) -> int:
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(responses_service, "insert_responses", fail)
+    buffer = ResponseBuffer(max_size=10, flush_size=10, flush_interval=1)
+    buffer.submit(_pending("a"))
+    buffer.submit(_pending())
+    with pytest.raises(RuntimeError):
+        buffer.flush(db)
+    assert len(buffer) == 2
+    # The key is still known, so a retry is not queued twice
+    assert buffer.submit(_pending("a"))
+    assert len(buffer) == 2
+
+
+def test_response_buffer_when_full_should_refuse_responses() -> None:
+    buffer = ResponseBuffer(max_size=2, flush_size=10, flush_interval=1)
+    assert buffer.submit(_pending())
+    assert buffer.submit(_pending())
+    assert not buffer.submit(_pending())
+
+
+@pytest.mark.anyio
+async def test_response_buffer_run_should_flush_when_batch_is_full(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    buffer = ResponseBuffer(max_size=10, flush_size=2, flush_interval=60)
+    flushed: list[int] = []
+
+    def flush() -> int:
+        flushed.append(len(buffer._take()))
+        return flushed[-1]
+
+    monkeypatch.setattr(buffer, "_flush_in_new_session", flush)
+    task = asyncio.create_task(buffer.run())
+    buffer.submit(_pending())
+    buffer.submit(_pending())
+    for _ in range(100):
+        if flushed:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    assert flushed == [2]
+
+
+def _superuser_id(db: Session) -> int:
+    user = db.exec(select(User).where(User.email == settings.FIRST_SUPERUSER)).one()
+    assert user.id
+    return user.id
+
+
+def _inquiry_id(db: Session) -> int:
+    inquiry = Inquiry(text="Did you take a proper lunch break today?")
+    db.add(inquiry)
+    db.commit()
+    assert inquiry.id
+    return inquiry.id
+
+
+def test_response_buffer_when_one_response_is_rejected_should_write_the_rest(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user_id = _superuser_id(db)
+    inquiry_id = _inquiry_id(db)
+    insert_responses = responses_service.insert_responses
+
+    def insert_unless_poisoned(
+        *, session: Session, pending: Sequence[PendingResponse]
+    ) -> int:
+        # Stands in for e.g. a foreign key violation on the poisoned response
+        if any(response.idempotency_key == "poison" for response in pending):
+            raise IntegrityError("INSERT", {}, Exception("constraint failed"))
+        return insert_responses(session=session, pending=pending)
+
+    monkeypatch.setattr(responses_service, "insert_responses", insert_unless_poisoned)
+    buffer = ResponseBuffer(max_size=10, flush_size=10, flush_interval=1)
+    keys = ["a", "b", "poison", "c", "d"]
+    for key in keys:
+        buffer.submit(
+            PendingResponse(
+                user_id=user_id,
+                submission=ResponseSubmit(inquiry_id=inquiry_id, rating=4),
+                idempotency_key=key,
+            )
+        )
+    assert buffer.flush(db) == 4
+    assert len(buffer) == 0
+    saved = db.exec(select(col(Response.idempotency_key))).all()
+    assert sorted(key for key in saved if key) == ["a", "b", "c", "d"]
+
+
+def test_insert_responses_should_skip_unknown_users(db: Session) -> None:
+    user_id = _superuser_id(db)
+    inquiry_id = _inquiry_id(db)
+    unknown_user_id = db.exec(
+        select(col(User.id)).order_by(col(User.id).desc())
+    ).first()
+    assert unknown_user_id
+    pending = [
+        PendingResponse(
+            user_id=responder,
+            submission=ResponseSubmit(inquiry_id=inquiry_id, rating=3),
+        )
+        for responder in (user_id, unknown_user_id + 1, user_id)
+    ]
+    assert responses_service.insert_responses(session=db, pending=pending) == 2
+    user_ids = db.exec(select(col(Response.user_id))).all()
+    assert user_ids == [user_id, user_id]
@@ -0,0 +1,45 @@
+import pytest
+from jinja2 import FileSystemLoader
+
+from app.utils import render_email_template, render_email_templates
+
+
+def test_render_email_template_should_fill_in_context() -> None:
+    html = render_email_template(
+        template_name="test_email.html",
+        context={"project_name": "Survey", "email": "someone@example.com"},
+    )
+    assert "Survey" in html
+    assert "someone@example.com" in html
+
+
+def test_render_email_templates_should_render_one_email_per_context() -> None:
+    emails = list(
+        render_email_templates(
+            template_name="test_email.html",
+            contexts=[{"email": f"user{i}@example.com"} for i in range(3)],
+            common_context={"project_name": "Survey"},
+        )
+    )
+    assert len(emails) == 3
+    for i, html in enumerate(emails):
+        assert f"user{i}@example.com" in html
+        assert "Survey" in html
+
+
+def test_render_email_template_should_not_read_template_again(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    context = {"project_name": "Survey", "email": "someone@example.com"}
+    render_email_template(template_name="test_email.html", context=context)
+    reads: list[str] = []
+    get_source = FileSystemLoader.get_source
+
+    def counting_get_source(*args: object) -> object:
+        reads.append(str(args[-1]))
+        return get_source(*args)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(FileSystemLoader, "get_source", counting_get_source)
+    for _ in range(3):
+        render_email_template(template_name="test_email.html", context=context)
+    assert reads == []
@@ -0,0 +1,73 @@
+import urllib.parse
+from typing import Any
+
+import httpx
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.core.security import OIDCDiscovery
+
+ISSUER = "https://idp.example.com"
+
+
+class FakeIdP:
+    """
+    In-memory stand-in for the IdP's discovery and JWKS endpoints.
+    """
+
+    def __init__(self) -> None:
+        self.private_keys: dict[str, rsa.RSAPrivateKey] = {}
+        self.requests: list[str] = []
+        self.token_requests: list[dict[str, str]] = []
+        self.available = True
+        self.add_key("initial")
+
+    def add_key(self, kid: str) -> rsa.RSAPrivateKey:
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_keys[kid] = key
+        return key
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.path)
+        if not self.available:
+            return httpx.Response(503)
+        if request.url.path == "/.well-known/openid-configuration":
+            return httpx.Response(
+                200,
+                json={
+                    "issuer": ISSUER,
+                    "authorization_endpoint": f"{ISSUER}/authorize",
+                    "token_endpoint": f"{ISSUER}/token",
+                    "jwks_uri": f"{ISSUER}/jwks",
+                    "id_token_signing_alg_values_supported": ["RS256"],
+                },
+            )
+        if request.url.path == "/jwks":
+            keys: list[dict[str, Any]] = []
+            for kid, key in self.private_keys.items():
+                jwk = jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key(), as_dict=True)
+                keys.append({**jwk, "kid": kid, "alg": "RS256", "use": "sig"})
+            return httpx.Response(200, json={"keys": keys})
+        if request.url.path == "/token" and request.method == "POST":
+            form = dict(
+                urllib.parse.parse_qsl(request.content.decode(), keep_blank_values=True)
+            )
+            self.token_requests.append(form)
+            if form.get("code") != "valid-code" and "refresh_token" not in form:
+                return httpx.Response(400, json={"error": "invalid_grant"})
+            return httpx.Response(
+                200, json={"id_token": "id-token", "access_token": "access-token"}
+            )
+        return httpx.Response(404)
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self._handle)
+
+    def discovery(self, **kwargs: Any) -> OIDCDiscovery:
+        return OIDCDiscovery(ISSUER, transport=self.transport, **kwargs)
+
+    def token(self, kid: str, claims: dict[str, Any]) -> str:
+        return jwt.encode(
+            claims, self.private_keys[kid], algorithm="RS256", headers={"kid": kid}
+        )
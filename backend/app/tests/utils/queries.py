@@ -0,0 +1,26 @@
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+
+
+@contextmanager
+def record_queries(db: Session | AsyncEngine) -> Generator[list[str], None, None]:
+    """
+    Collects the SQL statements executed on the session's engine, or on an
+    async engine.
+    """
+    statements: list[str] = []
+
+    def _record(*args: Any) -> None:
+        statements.append(args[2])
+
+    engine = db.sync_engine if isinstance(db, AsyncEngine) else db.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
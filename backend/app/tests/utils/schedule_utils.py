@@ -33,8 +33,8 @@ class ScheduleContent(TypedDict):
     schedule: ScheduleContentDict
 
 
-first_schedule_string = '{"startDate":"2024-10-02","endDate":"2024-11-01","daysBetween":1,"skipWeekends":false,"skipHolidays":false,"timesOfDay":["08:00"]}'
-second_schedule_string = '{"startDate":"2024-12-12","endDate":"2024-12-22","daysBetween":1,"skipWeekends":true,"skipHolidays":true,"timesOfDay":["18:00"]}'
+first_schedule_string = '{"startDate":"2024-10-02","endDate":"2024-11-01","daysBetween":1,"skipWeekends":false,"skipHolidays":false,"timesOfDay":["08:00"],"holidayCountry":"US"}'
+second_schedule_string = '{"startDate":"2024-12-12","endDate":"2024-12-22","daysBetween":1,"skipWeekends":true,"skipHolidays":true,"timesOfDay":["18:00"],"holidayCountry":"US"}'
 
 
 first_valid_schedule: ScheduleObject = {
@@ -81,6 +81,18 @@ schedule_with_bad_time = {
     }
 }
 
+schedule_with_unknown_holiday_country = {
+    "schedule": {
+        "startDate": "2024-12-12",
+        "endDate": "2024-12-22",
+        "daysBetween": 1,
+        "skipWeekends": "true",
+        "skipHolidays": "true",
+        "timesOfDay": ["18:00"],
+        "holidayCountry": "Atlantis",
+    }
+}
+
 schedule_with_bad_date = {
     "schedule": {
         "startDate": "December 10 2024",
@@ -1,12 +1,21 @@
-import logging
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import emails  # type: ignore
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
 from app.core.config import settings
+from app.services.mail import OutgoingEmail, mail_dispatcher
+
+# Templates are compiled once per process and kept, and their bytecode is
+# shared through the cache directory. auto_reload is off so rendering never
+# checks the files again; restart to pick up rebuilt templates.
+email_templates = Environment(
+    loader=FileSystemLoader(Path(__file__).parent / "email-templates" / "build"),
+    bytecode_cache=FileSystemBytecodeCache(settings.EMAIL_TEMPLATES_BYTECODE_CACHE_DIR),
+    auto_reload=False,
+)
 
 
 @dataclass
@@ -16,11 +25,25 @@ class EmailData:
 
 
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
-    template_str = (
-        Path(__file__).parent / "email-templates" / "build" / template_name
-    ).read_text()
-    html_content = Template(template_str).render(context)
-    return html_content
+    return email_templates.get_template(template_name).render(context)
+
+
+def render_email_templates(
+    *,
+    template_name: str,
+    contexts: Iterable[dict[str, Any]],
+    common_context: dict[str, Any] | None = None,
+) -> Iterator[str]:
+    """
+    Render one email per context, each merged over ``common_context``.
+
+    The template is looked up once for the whole batch, and emails are
+    rendered as they are consumed, so large batches can be streamed.
+    """
+    template = email_templates.get_template(template_name)
+    common_context = common_context or {}
+    for context in contexts:
+        yield template.render({**common_context, **context})
 
 
 def send_email(
@@ -28,24 +51,15 @@ def send_email(
     email_to: str,
     subject: str = "",
     html_content: str = "",
-) -> None:
+) -> bool:
+    """
+    Queue an email for the background dispatcher. Returns False if the
+    queue is full.
+    """
     assert settings.emails_enabled, "no provided configuration for email variables"
-    message = emails.Message(
-        subject=subject,
-        html=html_content,
-        mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
+    return mail_dispatcher.enqueue(
+        OutgoingEmail(email_to=email_to, subject=subject, html_content=html_content)
     )
-    smtp_options = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
-    if settings.SMTP_TLS:
-        smtp_options["tls"] = True
-    elif settings.SMTP_SSL:
-        smtp_options["ssl"] = True
-    if settings.SMTP_USER:
-        smtp_options["user"] = settings.SMTP_USER
-    if settings.SMTP_PASSWORD:
-        smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, smtp=smtp_options)
-    logging.info(f"send email result: {response}")
 
 
 def generate_test_email(email_to: str) -> EmailData: